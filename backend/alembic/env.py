@@ -0,0 +1,75 @@
+"""
+Alembic 迁移环境
+
+新数据库执行 `alembic upgrade head` 得到完整结构；各版本的表结构在迁移中固定，
+不从模型生成。未纳入迁移管理的数据库仍可由 create_tables()（应用启动 / CLI）按模型建表，
+迁移中的每一步都会跳过已经存在的表。
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app import services  # noqa: F401  注册建表后的附加结构
+from app.core.config import settings
+from app.core.database import is_sqlite_url
+from app.models.base import Base
+import app.models  # noqa: F401  注册全部模型
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
+target_metadata = Base.metadata
+
+# SQLite 不支持大部分 ALTER TABLE，使用 batch 模式（复制表）
+render_as_batch = is_sqlite_url(settings.database_url)
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """FTS5 全文索引表由 search 服务维护，不参与 autogenerate 比较"""
+    if type_ == "table":
+        return not (name or "").startswith("post_fts")
+    return True
+
+
+def run_migrations_offline() -> None:
+    """生成 SQL 脚本而不连接数据库（alembic upgrade --sql）"""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=render_as_batch,
+        include_name=include_name,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """连接数据库执行迁移"""
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=render_as_batch,
+            include_name=include_name,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
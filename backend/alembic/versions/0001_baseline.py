@@ -0,0 +1,173 @@
+"""baseline: core tables
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+引入迁移之前，数据表一直由 create_tables() 按模型直接创建（应用启动时自动执行）。
+本版本按当时的模型结构创建核心表（backend_user、category、tag、post、post_tag）：
+- 新数据库执行 `alembic upgrade head` 即得到完整结构，不依赖应用启动时建表
+- 已有数据库中已经存在的表跳过，不做任何变更
+
+表结构在此固定，之后模型的变化由新的迁移版本完成。
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 按外键依赖顺序排列
+BASELINE_TABLES = ("backend_user", "category", "tag", "post", "post_tag")
+
+
+def _timestamps():
+    """id / created_at / updated_at（所有模型共用的基类列）"""
+    return (
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def _create_backend_user() -> None:
+    op.create_table(
+        "backend_user",
+        sa.Column("username", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("password_hash", sa.String(length=255), nullable=False),
+        sa.Column("display_name", sa.String(length=100), nullable=False),
+        sa.Column("bio", sa.Text(), nullable=True),
+        sa.Column("avatar_url", sa.String(length=500), nullable=True),
+        sa.Column("website_url", sa.String(length=500), nullable=True),
+        sa.Column("github_username", sa.String(length=100), nullable=True),
+        sa.Column("twitter_username", sa.String(length=100), nullable=True),
+        sa.Column("linkedin_url", sa.String(length=500), nullable=True),
+        sa.Column("location", sa.String(length=100), nullable=True),
+        sa.Column("job_title", sa.String(length=100), nullable=True),
+        sa.Column("company", sa.String(length=100), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_admin", sa.Boolean(), nullable=False),
+        sa.Column("is_author", sa.Boolean(), nullable=False),
+        sa.Column("last_login", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("post_count", sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_backend_user_id", "backend_user", ["id"])
+    op.create_index("ix_backend_user_username", "backend_user", ["username"], unique=True)
+    op.create_index("ix_backend_user_email", "backend_user", ["email"], unique=True)
+    op.create_index("ix_backend_user_is_active", "backend_user", ["is_active"])
+
+
+def _create_category() -> None:
+    op.create_table(
+        "category",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("slug", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("parent_id", sa.Integer(), nullable=True),
+        sa.Column("sort_order", sa.Integer(), nullable=False),
+        sa.Column("color", sa.String(length=7), nullable=True),
+        sa.Column("icon", sa.String(length=50), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["parent_id"], ["category.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_category_id", "category", ["id"])
+    op.create_index("ix_category_name", "category", ["name"])
+    op.create_index("ix_category_slug", "category", ["slug"], unique=True)
+    op.create_index("ix_category_parent_id", "category", ["parent_id"])
+    op.create_index("ix_category_is_active", "category", ["is_active"])
+
+
+def _create_tag() -> None:
+    op.create_table(
+        "tag",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("slug", sa.String(length=50), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("color", sa.String(length=7), nullable=True),
+        sa.Column("tag_type", sa.String(length=20), nullable=True),
+        sa.Column("usage_count", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_featured", sa.Boolean(), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_tag_id", "tag", ["id"])
+    op.create_index("ix_tag_name", "tag", ["name"], unique=True)
+    op.create_index("ix_tag_slug", "tag", ["slug"], unique=True)
+    op.create_index("ix_tag_usage_count", "tag", ["usage_count"])
+    op.create_index("ix_tag_is_active", "tag", ["is_active"])
+
+
+def _create_post() -> None:
+    op.create_table(
+        "post",
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("slug", sa.String(length=255), nullable=False),
+        sa.Column("content_json", sa.JSON(), nullable=True),
+        sa.Column("content_markdown", sa.Text(), nullable=True),
+        sa.Column("excerpt", sa.Text(), nullable=True),
+        sa.Column("meta_description", sa.String(length=160), nullable=True),
+        sa.Column("featured_image", sa.String(length=500), nullable=True),
+        sa.Column("is_published", sa.Boolean(), nullable=False),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("view_count", sa.Integer(), nullable=False),
+        sa.Column("reading_time_minutes", sa.Integer(), nullable=True),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["author_id"], ["backend_user.id"]),
+        sa.ForeignKeyConstraint(["category_id"], ["category.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_post_id", "post", ["id"])
+    op.create_index("ix_post_title", "post", ["title"])
+    op.create_index("ix_post_slug", "post", ["slug"], unique=True)
+    op.create_index("ix_post_is_published", "post", ["is_published"])
+    op.create_index("ix_post_author_id", "post", ["author_id"])
+    op.create_index("ix_post_category_id", "post", ["category_id"])
+
+
+def _create_post_tag() -> None:
+    op.create_table(
+        "post_tag",
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["post_id"], ["post.id"]),
+        sa.ForeignKeyConstraint(["tag_id"], ["tag.id"]),
+        sa.PrimaryKeyConstraint("post_id", "tag_id"),
+    )
+
+
+_CREATE = {
+    "backend_user": _create_backend_user,
+    "category": _create_category,
+    "tag": _create_tag,
+    "post": _create_post,
+    "post_tag": _create_post_tag,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for name in BASELINE_TABLES:
+        if name not in existing:
+            _CREATE[name]()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(BASELINE_TABLES):
+        op.drop_table(name)
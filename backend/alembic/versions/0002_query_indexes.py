@@ -0,0 +1,77 @@
+"""composite and partial indexes for listing queries
+
+Revision ID: 0002_query_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 10:30:00.000000
+
+- 已发布文章的列表 / 分类归档 / 作者页：(…, published_at, id) 部分索引（WHERE is_published）
+- 标签归档与标签文章数：post_tag (tag_id, post_id)
+- 标签云：tag (is_active, usage_count)，取代两个单列索引
+
+create_tables() 对新建的表会直接按模型建好这些索引，因此每一步都先检查是否已存在。
+执行后可用 `python -m app.cli check-query-plans` 确认常用查询均走索引。
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_query_indexes"
+down_revision: Union[str, Sequence[str], None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_published = sa.column("is_published", sa.Boolean) == sa.true()
+
+# name -> (table, columns, partial)
+NEW_INDEXES = {
+    "ix_post_published_listing": ("post", ["published_at", "id"], True),
+    "ix_post_category_published": ("post", ["category_id", "published_at", "id"], True),
+    "ix_post_author_published": ("post", ["author_id", "published_at", "id"], True),
+    "ix_post_tag_tag_id_post_id": ("post_tag", ["tag_id", "post_id"], False),
+    "ix_tag_active_usage": ("tag", ["is_active", "usage_count"], False),
+}
+
+# 被上面的复合/部分索引取代的单列索引
+OLD_INDEXES = {
+    "ix_post_is_published": ("post", ["is_published"]),
+    "ix_tag_is_active": ("tag", ["is_active"]),
+    "ix_tag_usage_count": ("tag", ["usage_count"]),
+}
+
+
+def _index_names(inspector, table: str) -> set:
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for name, (table, columns, partial) in NEW_INDEXES.items():
+        if table not in tables or name in _index_names(inspector, table):
+            continue
+        where = {"sqlite_where": _published, "postgresql_where": _published} if partial else {}
+        op.create_index(name, table, columns, **where)
+
+    for name, (table, _) in OLD_INDEXES.items():
+        if table in tables and name in _index_names(inspector, table):
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for name, (table, columns) in OLD_INDEXES.items():
+        if table in tables and name not in _index_names(inspector, table):
+            op.create_index(name, table, columns)
+
+    for name, (table, _, _) in NEW_INDEXES.items():
+        if table in tables and name in _index_names(inspector, table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,161 @@
+"""category closure, derived content and full-text index
+
+Revision ID: 0003_derived_tables
+Revises: 0002_query_indexes
+Create Date: 2026-10-19 10:00:00.000000
+
+引入迁移之前由 create_tables() 随启动创建、迁移中一直缺失的结构：
+- category_closure：分类层级索引，新建时按 parent_id 回填
+- post_derived_content：文章派生内容（HTML、目录、统计）；已有文章执行
+  `python -m app.cli render-posts` 补齐
+- post_fts：FTS5 全文索引表与同步触发器（仅 SQLite 且支持 trigram 分词器时），
+  新建时立即全量构建索引
+
+每一步都先检查是否已存在，由 create_tables() 建好这些结构的数据库不受影响。
+表结构、回填语句与 FTS5 定义在此固定，不随应用代码变化。
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_derived_tables"
+down_revision: Union[str, Sequence[str], None] = "0002_query_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 回填时的最大层级深度（与本版本的 MAX_CATEGORY_DEPTH 一致）
+MAX_CATEGORY_DEPTH = 10
+
+BACKFILL_CLOSURE = f"""
+    WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM category
+        UNION ALL
+        SELECT tree.ancestor_id, category.id, tree.depth + 1
+        FROM tree JOIN category ON category.parent_id = tree.descendant_id
+        WHERE tree.depth < {MAX_CATEGORY_DEPTH}
+    )
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, descendant_id, depth FROM tree
+"""
+
+FTS5_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS post_fts USING fts5(
+        title, excerpt, content_markdown,
+        content='post', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_fts_after_insert AFTER INSERT ON post BEGIN
+        INSERT INTO post_fts(rowid, title, excerpt, content_markdown)
+        VALUES (new.id, new.title, new.excerpt, new.content_markdown);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_fts_after_delete AFTER DELETE ON post BEGIN
+        INSERT INTO post_fts(post_fts, rowid, title, excerpt, content_markdown)
+        VALUES ('delete', old.id, old.title, old.excerpt, old.content_markdown);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_fts_after_update
+    AFTER UPDATE OF title, excerpt, content_markdown ON post BEGIN
+        INSERT INTO post_fts(post_fts, rowid, title, excerpt, content_markdown)
+        VALUES ('delete', old.id, old.title, old.excerpt, old.content_markdown);
+        INSERT INTO post_fts(rowid, title, excerpt, content_markdown)
+        VALUES (new.id, new.title, new.excerpt, new.content_markdown);
+    END
+    """,
+)
+
+FTS5_OBJECTS = (
+    ("TRIGGER", "post_fts_after_insert"),
+    ("TRIGGER", "post_fts_after_delete"),
+    ("TRIGGER", "post_fts_after_update"),
+    ("TABLE", "post_fts"),
+)
+
+
+def _fts5_available(bind) -> bool:
+    if bind.dialect.name != "sqlite":
+        return False
+    try:
+        bind.exec_driver_sql(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x, tokenize='trigram')"
+        )
+        bind.exec_driver_sql("DROP TABLE temp.fts5_probe")
+    except Exception:
+        return False
+    return True
+
+
+def _create_category_closure() -> None:
+    op.create_table(
+        "category_closure",
+        sa.Column("ancestor_id", sa.Integer(), nullable=False),
+        sa.Column("descendant_id", sa.Integer(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["category.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["category.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index("ix_category_closure_descendant_id", "category_closure", ["descendant_id"])
+    op.execute(BACKFILL_CLOSURE)
+
+
+def _create_post_derived_content() -> None:
+    op.create_table(
+        "post_derived_content",
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("content_html", sa.Text(), nullable=True),
+        sa.Column("toc", sa.JSON(), nullable=True),
+        sa.Column("content_stats", sa.JSON(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["post_id"], ["post.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_post_derived_content_id", "post_derived_content", ["id"])
+    op.create_index("ix_post_derived_content_post_id", "post_derived_content", ["post_id"], unique=True)
+
+
+def _install_fts5(bind) -> None:
+    if not _fts5_available(bind):
+        return
+    existed = bind.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'post_fts'"
+    ).first() is not None
+    for statement in FTS5_SCHEMA:
+        bind.exec_driver_sql(statement)
+    if not existed:
+        bind.exec_driver_sql("INSERT INTO post_fts(post_fts) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    tables = set(sa.inspect(bind).get_table_names())
+
+    if "category_closure" not in tables:
+        _create_category_closure()
+    if "post_derived_content" not in tables:
+        _create_post_derived_content()
+    _install_fts5(bind)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for kind, name in FTS5_OBJECTS:
+            bind.exec_driver_sql(f"DROP {kind} IF EXISTS {name}")
+
+    op.drop_table("post_derived_content")
+    op.drop_table("category_closure")
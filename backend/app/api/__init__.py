@@ -0,0 +1,4 @@
+# API module initialization
+from .router import api_router
+
+__all__ = ["api_router"]
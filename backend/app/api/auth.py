@@ -0,0 +1,52 @@
+"""
+认证依赖
+
+Authorization: Bearer <JWT> 在本地校验签名与有效期，再通过 Principal 缓存解析用户：
+    principal: Principal = Depends(get_current_principal)
+    principal: Principal = Depends(require_admin)
+带 Authorization 的请求不会进入响应缓存（见 caching.py）。
+"""
+from typing import Optional
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from ..core.security import InvalidToken, Principal, decode_access_token
+from ..services.principals import get_principal
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+async def get_current_principal(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> Principal:
+    """解析当前请求的已认证用户（未认证或用户已停用时返回 401）"""
+    if credentials is None:
+        raise _unauthorized("未登录")
+    try:
+        user_id = decode_access_token(credentials.credentials)
+    except InvalidToken:
+        raise _unauthorized("登录已失效，请重新登录")
+
+    principal = await get_principal(user_id)
+    if principal is None or not principal.is_active:
+        raise _unauthorized("登录已失效，请重新登录")
+    return principal
+
+
+async def require_author(principal: Principal = Depends(get_current_principal)) -> Principal:
+    """要求作者或管理员权限"""
+    if not (principal.is_author or principal.is_admin):
+        raise HTTPException(status_code=403, detail="需要作者权限")
+    return principal
+
+
+async def require_admin(principal: Principal = Depends(get_current_principal)) -> Principal:
+    """要求管理员权限"""
+    if not principal.is_admin:
+        raise HTTPException(status_code=403, detail="需要管理员权限")
+    return principal
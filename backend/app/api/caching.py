@@ -0,0 +1,282 @@
+"""
+公开只读接口的 HTTP 响应缓存
+
+路由通过 cached("posts") 依赖（或在函数体内调用 cache_response(request, ...)）
+声明响应可缓存及其失效标签；未声明的响应（例如实时浏览量）不会被缓存。
+
+ResponseCacheMiddleware 只处理匿名 GET（不带 Authorization），并且只缓存 200 响应：
+- 命中且新鲜：直接返回缓存（X-Cache: HIT），If-None-Match / If-Modified-Since 命中时返回 304
+- 命中但已过期、仍在 stale-while-revalidate 窗口内：先返回旧响应（X-Cache: STALE），
+  同时在后台重新执行一次请求刷新缓存（同一键同时只刷新一次）
+- 未命中：正常执行并边转发边收集响应（X-Cache: MISS），结束后写入缓存
+执行请求前记录存储的失效代数，期间发生过失效（例如并发提交）时响应照常返回但不写入缓存
+可缓存的响应如果没有自带 Cache-Control，会加上
+    Cache-Control: public, max-age=<ttl>, stale-while-revalidate=<stale_ttl>
+
+写入缓存时同时保存 gzip / br 压缩版本，之后的命中按 Accept-Encoding 直接返回，
+热门文章只压缩一次；外层的 CompressionMiddleware 看到 Content-Encoding 后不再处理。
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Set
+
+from fastapi import Depends, Request
+
+from ..core.compression import (
+    AVAILABLE_ENCODINGS,
+    add_vary,
+    choose_encoding,
+    compress,
+    encoded_headers,
+    get_header,
+    is_compressible,
+)
+from ..core.response_cache import CachedResponse, get_response_cache
+from .conditional import Validator, is_not_modified, validator_headers
+
+logger = logging.getLogger(__name__)
+
+# 路由声明的失效标签存放在 scope["state"] 中
+_TAGS_KEY = "response_cache_tags"
+
+
+def cache_response(request: Request, *tags: str) -> None:
+    """声明本次响应可缓存，并附加失效标签"""
+    request.scope.setdefault("state", {}).setdefault(_TAGS_KEY, set()).update(tags)
+
+
+def cached(*tags: str):
+    """路由依赖：声明响应可缓存（固定标签）"""
+    def dependency(request: Request) -> None:
+        cache_response(request, *tags)
+    return Depends(dependency)
+
+
+def _cache_key(scope) -> str:
+    query = scope.get("query_string", b"").decode("latin-1")
+    return f"{scope['path']}?{query}" if query else scope["path"]
+
+
+def _declared_tags(scope) -> Set[str]:
+    return set(scope.get("state", {}).get(_TAGS_KEY, ()))
+
+
+def _is_storable(status: int, headers) -> bool:
+    if status != 200:
+        return False
+    for name, value in headers:
+        name = name.lower()
+        if name == b"set-cookie":
+            return False
+        if name == b"cache-control" and (b"no-store" in value or b"private" in value):
+            return False
+    return True
+
+
+async def _empty_receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+class ResponseCacheMiddleware:
+    """
+    匿名 GET 响应缓存中间件（纯 ASGI 实现）
+
+    Args:
+        app: 下游 ASGI 应用
+        ttl: 新鲜期（秒）
+        stale_ttl: 过期后仍可先返回旧响应的时长（秒）
+        compress_minimum_size: 预压缩的最小响应体大小；None 表示不预压缩
+    """
+
+    def __init__(
+        self,
+        app,
+        ttl: int = 60,
+        stale_ttl: int = 300,
+        compress_minimum_size: Optional[int] = None,
+    ) -> None:
+        self.app = app
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.compress_minimum_size = compress_minimum_size
+        self._cache_control = (
+            f"public, max-age={ttl}, stale-while-revalidate={stale_ttl}".encode("latin-1")
+        )
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or get_header(scope["headers"], b"authorization") is not None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = _cache_key(scope)
+        entry = get_response_cache().get(key)
+        if entry is not None:
+            now = time.time()
+            if now < entry.fresh_until:
+                await self._send_cached(scope, send, entry, b"HIT", now)
+                return
+            self._refresh_in_background(key, scope)
+            await self._send_cached(scope, send, entry, b"STALE", now)
+            return
+
+        await self._fetch(key, scope, receive, send)
+
+    def _finish_headers(self, headers: List, state: bytes) -> List:
+        if not any(name.lower() == b"cache-control" for name, _ in headers):
+            headers.append((b"cache-control", self._cache_control))
+        headers.append((b"x-cache", state))
+        return headers
+
+    async def _send_cached(
+        self, scope, send, entry: CachedResponse, state: bytes, now: Optional[float] = None
+    ) -> None:
+        """发送缓存条目：按 Accept-Encoding 选择预压缩版本，并处理条件请求"""
+        accept_encoding = get_header(scope["headers"], b"accept-encoding")
+        encoding = choose_encoding(accept_encoding.decode("latin-1") if accept_encoding else None)
+        body = entry.variant(encoding)
+        if body is not None:
+            headers = encoded_headers(list(entry.headers), encoding, len(body))
+        else:
+            body = entry.body
+            headers = list(entry.headers)
+            if entry.encoded or is_compressible(entry.header(b"content-type")):
+                add_vary(headers)
+        headers = self._finish_headers(headers, state)
+        if now is not None:
+            headers.append((b"age", str(int(now - entry.stored_at)).encode("latin-1")))
+
+        etag = get_header(headers, b"etag")
+        if etag is not None:
+            last_modified: Optional[datetime] = None
+            raw_last_modified = entry.header(b"last-modified")
+            if raw_last_modified is not None:
+                last_modified = parsedate_to_datetime(raw_last_modified.decode("latin-1"))
+            validator = Validator(etag.decode("latin-1"), last_modified)
+            if is_not_modified(Request(scope), validator):
+                not_modified_headers = [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in validator_headers(validator).items()
+                ]
+                if get_header(headers, b"vary") is not None:
+                    add_vary(not_modified_headers)
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": self._finish_headers(not_modified_headers, state),
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        await send({"type": "http.response.start", "status": entry.status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _precompress(self, headers, body: bytes):
+        """为可压缩的响应生成各编码的压缩版本（只保留确实变小的）"""
+        if (
+            self.compress_minimum_size is None
+            or len(body) < self.compress_minimum_size
+            or get_header(headers, b"content-encoding") is not None
+            or not is_compressible(get_header(headers, b"content-type"))
+        ):
+            return ()
+        variants = []
+        for encoding in AVAILABLE_ENCODINGS:
+            compressed = compress(body, encoding)
+            if len(compressed) < len(body):
+                variants.append((encoding, compressed))
+        return tuple(variants)
+
+    def _store(
+        self, key: str, scope, status: int, headers, body: bytes, generation: int
+    ) -> Optional[CachedResponse]:
+        tags = _declared_tags(scope)
+        if not tags or not _is_storable(status, headers):
+            return None
+        now = time.time()
+        entry = CachedResponse(
+            status=status,
+            headers=tuple(headers),
+            body=body,
+            tags=frozenset(tags),
+            stored_at=now,
+            fresh_until=now + self.ttl,
+            stale_until=now + self.ttl + self.stale_ttl,
+            encoded=self._precompress(headers, body),
+        )
+        get_response_cache().set(key, entry, generation)
+        return entry
+
+    async def _fetch(self, key: str, scope, receive, send) -> None:
+        """执行请求；可缓存的响应收集完整后写入缓存，再按缓存条目发送"""
+        scope.setdefault("state", {})
+        start = {}
+        chunks: List[bytes] = []
+        storable = False
+        generation = get_response_cache().generation
+
+        async def send_wrapper(message) -> None:
+            nonlocal storable
+            if message["type"] == "http.response.start":
+                start.update(message)
+                storable = bool(_declared_tags(scope)) and _is_storable(
+                    message["status"], message.get("headers", [])
+                )
+                if not storable:
+                    await send(message)
+                return
+            if not storable or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                entry = self._store(
+                    key, scope, start["status"], list(start.get("headers", [])), b"".join(chunks), generation
+                )
+                await self._send_cached(scope, send, entry, b"MISS")
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _refresh_in_background(self, key: str, scope) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        refresh_scope = {**scope, "state": {}}
+        # 刷新结果不依赖客户端的条件请求头
+        refresh_scope["headers"] = [
+            (name, value) for name, value in scope["headers"]
+            if name not in (b"if-none-match", b"if-modified-since")
+        ]
+        task = asyncio.get_running_loop().create_task(self._refresh(key, refresh_scope))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, scope) -> None:
+        start = {}
+        chunks: List[bytes] = []
+
+        async def collect(message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        generation = get_response_cache().generation
+        try:
+            await self.app(scope, _empty_receive, collect)
+            if start:
+                self._store(key, scope, start["status"], start.get("headers", []), b"".join(chunks), generation)
+        except Exception:
+            # 刷新失败时保留旧条目，直到 stale_until 后自然失效
+            logger.exception("响应缓存后台刷新失败: %s", key)
+        finally:
+            self._refreshing.discard(key)
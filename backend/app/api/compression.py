@@ -0,0 +1,91 @@
+"""
+响应压缩中间件
+
+对未被响应缓存处理的响应按需压缩（缓存命中时直接使用预压缩的版本，见 caching.py）：
+- 已带 Content-Encoding 的响应原样透传
+- 单块响应小于最小阈值时不压缩；分块（流式）响应逐块压缩
+- 可压缩类型的响应一律带上 Vary: Accept-Encoding（包括未压缩的情况）
+"""
+from ..core.compression import (
+    StreamCompressor,
+    add_vary,
+    choose_encoding,
+    compress,
+    encoded_headers,
+    get_header,
+    is_compressible,
+)
+
+
+class CompressionMiddleware:
+    """
+    gzip / brotli 压缩中间件（纯 ASGI 实现）
+
+    Args:
+        app: 下游 ASGI 应用
+        minimum_size: 小于该字节数的响应不压缩
+    """
+
+    def __init__(self, app, minimum_size: int = 500) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = get_header(scope["headers"], b"accept-encoding")
+        encoding = choose_encoding(accept_encoding.decode("latin-1") if accept_encoding else None)
+        start = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                compressible = (
+                    is_compressible(get_header(headers, b"content-type"))
+                    and get_header(headers, b"content-encoding") is None
+                    and message["status"] not in (204, 304)
+                )
+                if compressible:
+                    add_vary(headers)
+                message = {**message, "headers": headers}
+                if not compressible or encoding is None:
+                    passthrough = True
+                    await send(message)
+                    return
+                # 等第一个响应体分块到达后再决定是否压缩
+                start = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = start["headers"]
+                if not more_body:
+                    if len(body) < self.minimum_size:
+                        passthrough = True
+                        await send(start)
+                        await send(message)
+                        return
+                    body = compress(body, encoding)
+                    await send({**start, "headers": encoded_headers(headers, encoding, len(body))})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                compressor = StreamCompressor(encoding)
+                await send({**start, "headers": encoded_headers(headers, encoding, None)})
+
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,109 @@
+"""
+条件请求（ETag / Last-Modified / 304）
+
+资源的校验值（validator）由一条只读索引列的轻量查询得到（id、updated_at、内容哈希等），
+在加载和序列化完整数据之前先与请求头比较：
+- If-None-Match 命中 ETag，或（未带 If-None-Match 时）If-Modified-Since 不早于 Last-Modified，
+  直接返回 304，不再查询正文、不再序列化
+- 否则正常返回，并在响应头中带上 ETag 与 Last-Modified
+
+ETag 为强校验值：对校验部件做 SHA-256 摘要。
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, NamedTuple, Optional
+
+from fastapi import Request, Response
+
+
+class Validator(NamedTuple):
+    """资源校验值"""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite 返回的 updated_at 不带时区（CURRENT_TIMESTAMP 为 UTC）
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _part(value: Any) -> str:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    return repr(value)
+
+
+def make_validator(*parts: Any, last_modified: Iterable[Optional[datetime]] = ()) -> Validator:
+    """
+    由校验部件生成 Validator
+
+    Args:
+        parts: 决定响应内容的部件，例如 ("post", id, updated_at, content_hash)
+        last_modified: 候选修改时间，取其中最新的一个作为 Last-Modified
+
+    Returns:
+        Validator
+    """
+    digest = hashlib.sha256("\x1f".join(_part(part) for part in parts).encode("utf-8"))
+    timestamps = [_as_utc(value) for value in last_modified if value is not None]
+    return Validator(f'"{digest.hexdigest()[:32]}"', max(timestamps) if timestamps else None)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match 使用弱比较：忽略 W/ 前缀（压缩后的响应使用弱 ETag）
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, validator: Validator) -> bool:
+    """请求方缓存的版本是否仍然有效"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # 带 If-None-Match 时忽略 If-Modified-Since（RFC 9110 13.2.2）
+        return _etag_matches(if_none_match, validator.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or validator.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return validator.last_modified <= since
+
+
+def validator_headers(validator: Validator) -> dict:
+    """校验值对应的响应头"""
+    headers = {"ETag": validator.etag}
+    if validator.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(validator.last_modified, usegmt=True)
+    return headers
+
+
+def not_modified(validator: Validator) -> Response:
+    """304 响应（不带响应体）"""
+    return Response(status_code=304, headers=validator_headers(validator))
+
+
+def set_validator_headers(response: Response, validator: Validator) -> None:
+    """在正常响应上设置 ETag / Last-Modified"""
+    response.headers.update(validator_headers(validator))
@@ -0,0 +1 @@
+# API endpoints initialization
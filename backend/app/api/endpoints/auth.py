@@ -0,0 +1,72 @@
+"""
+登录认证 API
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, Field
+
+from ...core.config import settings
+from ...core.security import Principal, create_access_token
+from ...services.credentials import CredentialsBusy, credential_service, login_throttle
+from ..auth import get_current_principal
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+class LoginRequest(BaseModel):
+    """登录请求"""
+
+    username: str = Field(..., min_length=1, max_length=50)
+    password: str = Field(..., min_length=1, max_length=256)
+
+
+def _throttle_key(request: Request, username: str) -> str:
+    client = request.client.host if request.client else "unknown"
+    return f"{client}:{username.lower()}"
+
+
+@router.post("/login")
+async def login(payload: LoginRequest, request: Request):
+    """
+    用户名密码登录，返回 JWT 访问令牌
+
+    - 同一客户端对同一用户名连续失败过多时返回 429（带 Retry-After）
+    - 密码校验线程池已满时返回 429，而不是排队等待
+    """
+    key = _throttle_key(request, payload.username)
+    retry_after = login_throttle.retry_after(key)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail="登录失败次数过多，请稍后再试",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    try:
+        user = await credential_service.authenticate(payload.username, payload.password)
+    except CredentialsBusy:
+        raise HTTPException(
+            status_code=429,
+            detail="登录请求过多，请稍后再试",
+            headers={"Retry-After": "1"},
+        )
+
+    if user is None:
+        login_throttle.record_failure(key)
+        raise HTTPException(
+            status_code=401,
+            detail="用户名或密码错误",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    login_throttle.reset(key)
+    return {
+        "access_token": create_access_token(str(user.id)),
+        "token_type": "bearer",
+        "expires_in": settings.access_token_expire_minutes * 60,
+    }
+
+
+@router.get("/me")
+async def get_me(principal: Principal = Depends(get_current_principal)):
+    """当前登录用户的身份与权限"""
+    return principal._asdict()
@@ -0,0 +1,68 @@
+"""
+作者相关 API
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.database import get_async_db
+from ...models.user import BackendUser
+from ...services.cache_invalidation import POSTS_TAG
+from ...services.post_queries import posts_by_author_query
+from ..caching import cache_response, cached
+from ..conditional import is_not_modified, make_validator, not_modified, set_validator_headers
+from ..pagination import PageParams, paginate_posts
+
+router = APIRouter(prefix="/authors", tags=["authors"])
+
+
+async def _find_author(db: AsyncSession, username: str):
+    """按用户名查找启用的作者（id, updated_at）"""
+    row = (await db.execute(
+        select(BackendUser.id, BackendUser.updated_at)
+        .where(BackendUser.username == username)
+        .where(BackendUser.is_active == True)
+    )).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="作者不存在")
+    return row
+
+
+@router.get("/{username}")
+async def get_author(
+    username: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """获取作者公开资料（支持条件请求，未修改时返回 304）"""
+    found = await _find_author(db, username)
+    validator = make_validator("author", found.id, found.updated_at, last_modified=(found.updated_at,))
+    if is_not_modified(request, validator):
+        return not_modified(validator)
+
+    author = await db.get(BackendUser, found.id)
+    cache_response(request, f"author:{author.id}")
+    set_validator_headers(response, validator)
+    return {
+        "id": author.id,
+        "username": author.username,
+        "display_name": author.display_name,
+        "bio": author.bio,
+        "avatar_url": author.avatar_url,
+        "location": author.location,
+        "byline": author.author_byline,
+        "social": author.full_social_profile,
+        "post_count": author.post_count,
+    }
+
+
+@router.get("/{username}/posts", dependencies=[cached(POSTS_TAG)])
+async def list_author_posts(
+    username: str,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """作者的已发布文章（游标分页）"""
+    found = await _find_author(db, username)
+    return await paginate_posts(db, posts_by_author_query(found.id), page)
@@ -0,0 +1,37 @@
+"""
+全站导出 API（仅管理员）
+"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from ...core.security import Principal
+from ...services.post_export import ARCHIVE_MEDIA_TYPES, export_filename, iter_export_archive
+from ..auth import require_admin
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.get("")
+def export_posts(
+    format: Literal["markdown", "jsonl"] = Query("markdown", description="markdown 或 jsonl"),
+    archive: Literal["zip", "tar.gz"] = Query("zip", description="zip 或 tar.gz"),
+    include_drafts: bool = Query(True, description="是否包含草稿"),
+    principal: Principal = Depends(require_admin),
+):
+    """
+    下载全站文章归档
+
+    归档边查询边生成，以分块传输发送；服务端内存占用与文章数量无关。
+    markdown 格式可以直接用 import-posts 重新导入。
+    """
+    filename = export_filename(format, archive)
+    return StreamingResponse(
+        iter_export_archive(export_format=format, archive=archive, include_drafts=include_drafts),
+        media_type=ARCHIVE_MEDIA_TYPES[archive],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
@@ -0,0 +1,90 @@
+"""
+RSS / Atom 订阅源与站点地图
+
+挂载在根路径（不在 /api 下），返回预先生成的文档：
+- ETag / Last-Modified 命中时返回 304
+- 按 Accept-Encoding 直接发送预压缩版本（外层压缩中间件看到 Content-Encoding 后不再处理）
+- Cache-Control 的 max-age 与文档在进程内的最长存活时间一致（FEED_CACHE_MAX_AGE）
+"""
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from ...core.compression import choose_encoding
+from ...core.config import settings
+from ...services.feeds import FeedDocument, get_feed, get_sitemap
+from ..conditional import Validator, is_not_modified, validator_headers
+
+router = APIRouter(tags=["feeds"])
+
+
+def _document_response(request: Request, document: Optional[FeedDocument]) -> Response:
+    if document is None:
+        raise HTTPException(status_code=404, detail="订阅源不存在")
+
+    headers = {
+        "Cache-Control": f"public, max-age={settings.feed_cache_max_age}",
+        "Vary": "Accept-Encoding",
+    }
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    body = document.variant(encoding)
+    # 压缩版本使用弱 ETag（与 CompressionMiddleware 一致）
+    etag = document.etag if body is None else f"W/{document.etag}"
+    validator = Validator(etag, document.last_modified)
+    headers.update(validator_headers(validator))
+    if is_not_modified(request, validator):
+        return Response(status_code=304, headers=headers)
+
+    if body is None:
+        body = document.body
+    else:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=document.media_type, headers=headers)
+
+
+@router.get("/feed.xml")
+async def site_rss(request: Request):
+    """全站 RSS 2.0"""
+    return _document_response(request, await get_feed("rss"))
+
+
+@router.get("/atom.xml")
+async def site_atom(request: Request):
+    """全站 Atom 1.0"""
+    return _document_response(request, await get_feed("atom"))
+
+
+@router.get("/categories/{slug}/feed.xml")
+async def category_rss(slug: str, request: Request):
+    """分类 RSS（含子分类）"""
+    return _document_response(request, await get_feed("rss", "category", slug))
+
+
+@router.get("/categories/{slug}/atom.xml")
+async def category_atom(slug: str, request: Request):
+    """分类 Atom（含子分类）"""
+    return _document_response(request, await get_feed("atom", "category", slug))
+
+
+@router.get("/tags/{slug}/feed.xml")
+async def tag_rss(slug: str, request: Request):
+    """标签 RSS"""
+    return _document_response(request, await get_feed("rss", "tag", slug))
+
+
+@router.get("/tags/{slug}/atom.xml")
+async def tag_atom(slug: str, request: Request):
+    """标签 Atom"""
+    return _document_response(request, await get_feed("atom", "tag", slug))
+
+
+@router.get("/sitemap.xml")
+async def sitemap(request: Request):
+    """站点地图（超过 SITEMAP_MAX_URLS 时为 sitemap 索引）"""
+    return _document_response(request, await get_sitemap())
+
+
+@router.get("/sitemaps/{page}.xml")
+async def sitemap_page(page: int, request: Request):
+    """sitemap 分片"""
+    return _document_response(request, await get_sitemap(page))
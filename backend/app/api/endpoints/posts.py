@@ -0,0 +1,235 @@
+"""
+文章相关 API
+"""
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import String, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.database import get_async_db
+from ...core.responses import FastJSONResponse
+from ...services.cache_invalidation import POSTS_TAG
+from ..caching import cache_response, cached
+from ..conditional import (
+    Validator,
+    is_not_modified,
+    make_validator,
+    not_modified,
+    set_validator_headers,
+    validator_headers,
+)
+from ..pagination import PageParams, paginate_posts
+from ...models.post import Post, post_tag_association
+from ...models.post_derived import PostDerivedContent
+from ...models.tag import Tag
+from ...models.user import BackendUser
+from ...services.category_tree import category_tree_cache
+from ...services.content import render_source
+from ...services.post_queries import published_posts_query
+from ...services.view_counter import view_counter
+
+router = APIRouter(prefix="/posts", tags=["posts"])
+
+
+@router.get("", dependencies=[cached(POSTS_TAG)])
+async def list_posts(page: PageParams = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """已发布文章列表（按发布时间倒序，游标分页）"""
+    return await paginate_posts(db, published_posts_query(), page)
+
+
+@router.post("/{post_id}/views")
+async def record_post_view(post_id: int, db: AsyncSession = Depends(get_async_db)):
+    """记录一次文章浏览，返回实时浏览量"""
+    stored = await db.scalar(
+        select(Post.view_count)
+        .where(Post.id == post_id)
+        .where(Post.is_published == True)
+    )
+    if stored is None:
+        raise HTTPException(status_code=404, detail="文章不存在")
+
+    view_counter.hit(post_id)
+    return {"post_id": post_id, "view_count": stored + view_counter.pending(post_id)}
+
+
+@router.get("/{post_id}/views")
+async def get_post_views(post_id: int, db: AsyncSession = Depends(get_async_db)):
+    """获取文章实时浏览量（已入库 + 待写入）"""
+    view_count = await view_counter.get_live_count(db, post_id)
+    if view_count is None:
+        raise HTTPException(status_code=404, detail="文章不存在")
+    return {"post_id": post_id, "view_count": view_count}
+
+
+async def _post_validator(db: AsyncSession, slug: str) -> Optional[Tuple[int, Validator]]:
+    """
+    文章详情的校验值：文章、作者、标签的 updated_at，标签ID集合，派生内容哈希，以及缓存中的分类节点
+
+    只走 slug 唯一索引与各表主键；浏览量写回不更新 updated_at，因此不影响 ETag，
+    实时浏览量请使用 /{post_id}/views。
+    增删标签只修改关联表、不更新 Post.updated_at，因此标签ID集合单独参与校验。
+    """
+    tag_ids = (
+        select(func.aggregate_strings(cast(post_tag_association.c.tag_id, String), ","))
+        .where(post_tag_association.c.post_id == Post.id)
+        .scalar_subquery()
+    )
+    tags_updated_at = (
+        select(func.max(Tag.updated_at))
+        .join(post_tag_association, post_tag_association.c.tag_id == Tag.id)
+        .where(post_tag_association.c.post_id == Post.id)
+        .scalar_subquery()
+    )
+    row = (await db.execute(
+        select(
+            Post.id,
+            Post.updated_at,
+            Post.category_id,
+            BackendUser.updated_at.label("author_updated_at"),
+            PostDerivedContent.content_hash,
+            tags_updated_at.label("tags_updated_at"),
+            tag_ids.label("tag_ids"),
+        )
+        .join(BackendUser, BackendUser.id == Post.author_id)
+        .outerjoin(PostDerivedContent, PostDerivedContent.post_id == Post.id)
+        .where(Post.slug == slug)
+        .where(Post.is_published == True)
+    )).one_or_none()
+    if row is None:
+        return None
+
+    category = None
+    if row.category_id is not None:
+        category = (await category_tree_cache.get_async()).get(row.category_id)
+    # 聚合顺序不确定，排序后再参与摘要
+    tag_ids = sorted(int(tag_id) for tag_id in row.tag_ids.split(",")) if row.tag_ids else []
+    return row.id, make_validator(
+        "post", row.id, row.updated_at, row.content_hash,
+        row.author_updated_at, row.tags_updated_at, tag_ids, category,
+        last_modified=(row.updated_at, row.author_updated_at, row.tags_updated_at),
+    )
+
+
+@router.get("/{slug}")
+async def get_post(slug: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    获取已发布文章详情
+
+    正文返回发布时预渲染的 HTML，不读取 content_json / content_markdown；
+    只有派生内容缺失时（例如批量导入后尚未补齐）才临时渲染。
+    支持 If-None-Match / If-Modified-Since，未修改时返回 304。
+    """
+    found = await _post_validator(db, slug)
+    if found is None:
+        raise HTTPException(status_code=404, detail="文章不存在")
+    post_id, validator = found
+    if is_not_modified(request, validator):
+        return not_modified(validator)
+
+    row = (await db.execute(
+        select(
+            Post.id,
+            Post.title,
+            Post.slug,
+            Post.excerpt,
+            Post.meta_description,
+            Post.featured_image,
+            Post.published_at,
+            Post.updated_at,
+            Post.reading_time_minutes,
+            Post.view_count,
+            Post.category_id,
+            Post.author_id,
+            BackendUser.display_name.label("author_name"),
+            PostDerivedContent.content_html,
+            PostDerivedContent.toc,
+        )
+        .join(BackendUser, BackendUser.id == Post.author_id)
+        .outerjoin(PostDerivedContent, PostDerivedContent.post_id == Post.id)
+        .where(Post.id == post_id)
+    )).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="文章不存在")
+
+    content_html = row.content_html
+    if content_html is None:
+        source = (await db.execute(
+            select(Post.content_json, Post.content_markdown).where(Post.id == row.id)
+        )).one()
+        content_html = render_source(source.content_json, source.content_markdown)
+
+    tags = (await db.execute(
+        select(Tag.id, Tag.name, Tag.slug, Tag.color)
+        .join(post_tag_association, post_tag_association.c.tag_id == Tag.id)
+        .where(post_tag_association.c.post_id == row.id)
+        .order_by(Tag.name)
+    )).all()
+
+    category = None
+    if row.category_id is not None:
+        node = (await category_tree_cache.get_async()).get(row.category_id)
+        category = node.to_dict() if node is not None else None
+
+    cache_response(
+        request,
+        f"post:{row.id}",
+        f"author:{row.author_id}",
+        *(f"tag:{tag.id}" for tag in tags),
+        *((f"category:{row.category_id}",) if row.category_id is not None else ()),
+    )
+    return FastJSONResponse({
+        "id": row.id,
+        "title": row.title,
+        "slug": row.slug,
+        "excerpt": row.excerpt,
+        "meta_description": row.meta_description,
+        "featured_image": row.featured_image,
+        "published_at": row.published_at,
+        "updated_at": row.updated_at,
+        "reading_time_minutes": row.reading_time_minutes,
+        "view_count": row.view_count + view_counter.pending(row.id),
+        "author": row.author_name,
+        "category": category,
+        "tags": [{"name": tag.name, "slug": tag.slug, "color": tag.color} for tag in tags],
+        "toc": row.toc or [],
+        "content_html": content_html,
+    }, headers=validator_headers(validator))
+
+
+@router.get("/{slug}/toc")
+async def get_post_toc(
+    slug: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """获取文章目录与内容统计（只读取派生内容表，不加载正文列）"""
+    validator_row = (await db.execute(
+        select(Post.id, PostDerivedContent.content_hash, PostDerivedContent.updated_at)
+        .outerjoin(PostDerivedContent, PostDerivedContent.post_id == Post.id)
+        .where(Post.slug == slug)
+        .where(Post.is_published == True)
+    )).one_or_none()
+    if validator_row is None:
+        raise HTTPException(status_code=404, detail="文章不存在")
+    validator = make_validator(
+        "post-toc", validator_row.id, validator_row.content_hash, validator_row.updated_at,
+        last_modified=(validator_row.updated_at,),
+    )
+    if is_not_modified(request, validator):
+        return not_modified(validator)
+
+    row = (await db.execute(
+        select(Post.id, PostDerivedContent.toc, PostDerivedContent.content_stats)
+        .outerjoin(PostDerivedContent, PostDerivedContent.post_id == Post.id)
+        .where(Post.id == validator_row.id)
+    )).one()
+    cache_response(request, f"post:{row.id}")
+    set_validator_headers(response, validator)
+    return {
+        "post_id": row.id,
+        "slug": slug,
+        "toc": row.toc or [],
+        "stats": row.content_stats or {},
+    }
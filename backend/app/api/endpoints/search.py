@@ -0,0 +1,37 @@
+"""
+文章搜索 API
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.database import get_async_db
+from ...core.responses import FastJSONResponse
+from ...services.cache_invalidation import POSTS_TAG
+from ...services.search import SearchFilters, get_search_backend
+from ..caching import cached
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/search", dependencies=[cached(POSTS_TAG)])
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200, description="搜索关键词，空格分隔"),
+    category_id: Optional[int] = Query(None, description="分类ID（包含子分类）"),
+    tag: Optional[str] = Query(None, description="标签 slug"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """全文搜索已发布文章，结果按相关度排序，片段中的命中词以 <mark> 标出"""
+    backend = get_search_backend()
+    filters = SearchFilters(category_id=category_id, tag_slug=tag)
+    hits = await db.run_sync(
+        lambda session: backend.search(session, q, filters, limit=limit, offset=offset)
+    )
+    return FastJSONResponse({
+        "query": q,
+        "backend": backend.name,
+        "results": [hit.to_dict() for hit in hits],
+    })
@@ -0,0 +1,112 @@
+"""
+分类与标签 API
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.database import get_async_db
+from ...models.tag import Tag
+from ...services.category_tree import category_tree_cache
+from ...services.post_queries import posts_by_category_query, posts_by_tag_query
+from ...services.cache_invalidation import CATEGORIES_TAG, POSTS_TAG
+from ..caching import cache_response, cached
+from ..conditional import is_not_modified, make_validator, not_modified, set_validator_headers
+from ..pagination import PageParams, paginate_posts
+
+router = APIRouter(tags=["taxonomy"])
+
+
+# 分类节点包含子树文章数，文章变化时也需要失效
+@router.get("/categories", dependencies=[cached(CATEGORIES_TAG, POSTS_TAG)])
+async def list_categories(request: Request, response: Response):
+    """获取分类树（来自进程内缓存，不产生数据库查询）"""
+    tree = await category_tree_cache.get_async()
+    # 分类树快照本身就是校验值（节点包含子树文章数）
+    validator = make_validator("categories", tree.roots, tuple(tree.nodes.values()))
+    if is_not_modified(request, validator):
+        return not_modified(validator)
+
+    set_validator_headers(response, validator)
+    return {"categories": tree.as_nested()}
+
+
+@router.get("/categories/{slug}", dependencies=[cached(CATEGORIES_TAG, POSTS_TAG)])
+async def get_category(slug: str, request: Request, response: Response):
+    """获取单个分类及其子分类"""
+    tree = await category_tree_cache.get_async()
+    node = tree.get_by_slug(slug)
+    if node is None:
+        raise HTTPException(status_code=404, detail="分类不存在")
+
+    children = tuple(tree.nodes[child_id] for child_id in node.children)
+    validator = make_validator("category", node, children)
+    if is_not_modified(request, validator):
+        return not_modified(validator)
+
+    data = node.to_dict()
+    data["children"] = [child.to_dict() for child in children]
+    set_validator_headers(response, validator)
+    return data
+
+
+@router.get("/categories/{slug}/posts", dependencies=[cached(POSTS_TAG)])
+async def list_category_posts(
+    slug: str,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """分类归档（含子分类文章，游标分页）"""
+    node = (await category_tree_cache.get_async()).get_by_slug(slug)
+    if node is None:
+        raise HTTPException(status_code=404, detail="分类不存在")
+    return await paginate_posts(db, posts_by_category_query(node.id), page)
+
+
+@router.get("/tags/{slug}")
+async def get_tag(
+    slug: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """获取标签详情（支持条件请求，未修改时返回 304）"""
+    found = (await db.execute(
+        select(Tag.id, Tag.updated_at).where(Tag.slug == slug).where(Tag.is_active == True)
+    )).one_or_none()
+    if found is None:
+        raise HTTPException(status_code=404, detail="标签不存在")
+    validator = make_validator("tag", found.id, found.updated_at, last_modified=(found.updated_at,))
+    if is_not_modified(request, validator):
+        return not_modified(validator)
+
+    tag = await db.get(Tag, found.id)
+    # usage_count 随文章发布变化
+    cache_response(request, f"tag:{tag.id}", POSTS_TAG)
+    set_validator_headers(response, validator)
+    return {
+        "id": tag.id,
+        "name": tag.name,
+        "slug": tag.slug,
+        "description": tag.description,
+        "color": tag.color,
+        "tag_type": tag.tag_type,
+        "usage_count": tag.usage_count,
+        "is_featured": tag.is_featured,
+        "popularity_level": tag.popularity_level,
+    }
+
+
+@router.get("/tags/{slug}/posts", dependencies=[cached(POSTS_TAG)])
+async def list_tag_posts(
+    slug: str,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """标签归档（游标分页）"""
+    tag_id = await db.scalar(
+        select(Tag.id).where(Tag.slug == slug).where(Tag.is_active == True)
+    )
+    if tag_id is None:
+        raise HTTPException(status_code=404, detail="标签不存在")
+    return await paginate_posts(db, posts_by_tag_query(tag_id), page)
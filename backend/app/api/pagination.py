@@ -0,0 +1,38 @@
+"""
+列表接口的游标分页参数与执行
+"""
+from typing import Optional
+
+from fastapi import HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.pagination import InvalidCursor
+from ..core.responses import FastJSONResponse
+from ..services.post_queries import PostSummary, paginate_post_summaries
+
+
+class PageParams:
+    """游标分页查询参数（用作依赖）"""
+
+    def __init__(
+        self,
+        limit: int = Query(20, ge=1, le=100, description="每页数量"),
+        after: Optional[str] = Query(None, description="下一页游标（next_cursor）"),
+        before: Optional[str] = Query(None, description="上一页游标（prev_cursor）"),
+    ) -> None:
+        self.limit = limit
+        self.after = after
+        self.before = before
+
+
+async def paginate_posts(db: AsyncSession, statement, page: PageParams) -> FastJSONResponse:
+    """执行文章列表查询并返回分页响应（直接序列化，跳过 jsonable_encoder）"""
+    try:
+        result = await db.run_sync(
+            lambda session: paginate_post_summaries(
+                session, statement, limit=page.limit, after=page.after, before=page.before
+            )
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+    return FastJSONResponse(result.to_dict(PostSummary.to_dict))
@@ -0,0 +1,15 @@
+"""
+API 路由汇总
+所有业务路由统一挂载在 /api 前缀下
+"""
+from fastapi import APIRouter
+
+from .endpoints import auth, authors, export, posts, search, taxonomy
+
+api_router = APIRouter(prefix="/api")
+api_router.include_router(posts.router)
+api_router.include_router(taxonomy.router)
+api_router.include_router(authors.router)
+api_router.include_router(search.router)
+api_router.include_router(auth.router)
+api_router.include_router(export.router)
@@ -0,0 +1,190 @@
+"""
+后端维护命令
+通过 `python -m app.cli <command>` 运行（scripts/dev.py 中有对应的快捷命令）
+"""
+import argparse
+import sys
+
+
+def rebuild_category_tree(args: argparse.Namespace) -> None:
+    """根据 parent_id 重建分类层级索引（closure 表）"""
+    from .core.database import SessionLocal, create_tables
+    from .models.category import Category
+
+    create_tables()
+    with SessionLocal() as db:
+        rows = Category.rebuild_closure(db)
+        db.commit()
+    print(f"✅ 分类层级索引重建完成，共 {rows} 条记录")
+
+
+def reconcile_counters(args: argparse.Namespace) -> None:
+    """重新计算标签使用次数与作者文章数"""
+    from .core.database import SessionLocal
+    from .services.counters import reconcile_counters as reconcile
+
+    with SessionLocal() as db:
+        fixed = reconcile(db)
+        db.commit()
+    print(f"✅ 计数校准完成: 标签 {fixed['tag']} 条, 作者 {fixed['backend_user']} 条")
+
+
+def rebuild_search_index(args: argparse.Namespace) -> None:
+    """全量重建文章搜索索引"""
+    from .core.database import SessionLocal, create_tables
+    from .services.search import get_search_backend
+
+    create_tables()
+    backend = get_search_backend()
+    with SessionLocal() as db:
+        count = backend.rebuild(db)
+        db.commit()
+    print(f"✅ 搜索索引重建完成（{backend.name}），共 {count} 篇文章")
+
+
+def render_posts(args: argparse.Namespace) -> None:
+    """为派生内容缺失或过期的文章重新生成 HTML 与目录"""
+    from .core.database import SessionLocal, create_tables
+    from .services.content import render_stale_posts
+
+    create_tables()
+    with SessionLocal() as db:
+        count = render_stale_posts(db)
+        db.commit()
+    print(f"✅ 文章派生内容生成完成，共更新 {count} 篇")
+
+
+def check_query_plans(args: argparse.Namespace) -> int:
+    """检查常用查询的执行计划，出现整表扫描或额外排序时返回非零退出码"""
+    from .core.config import settings
+    from .core.database import create_tables, engine, is_sqlite_url
+    from .services.query_plans import check_query_plans as check
+
+    if not is_sqlite_url(settings.database_url):
+        print("⚠️  执行计划检查仅支持 SQLite，已跳过")
+        return 0
+
+    create_tables()
+    with engine.connect() as connection:
+        reports = check(connection)
+
+    failed = [report for report in reports if report.problems]
+    for report in reports:
+        print(f"{'❌' if report.problems else '✅'} {report.name}")
+        for line in report.plan:
+            print(f"     {line}")
+    if failed:
+        print(f"❌ {len(failed)} 个查询未用上合适的索引，请检查索引（是否已执行 alembic upgrade head）")
+        return 1
+    print(f"✅ {len(reports)} 个查询均使用索引")
+    return 0
+
+
+def import_posts(args: argparse.Namespace) -> int:
+    """从目录批量导入 Markdown 文章（front matter 解析为文章、分类与标签）"""
+    from .core.database import SessionLocal, create_tables
+    from .services.post_import import import_posts as run_import
+
+    create_tables()
+
+    def progress(imported: int, seconds: float) -> None:
+        print(f"   已导入 {imported} 篇，{seconds:.1f}s")
+
+    print(f"📥 导入 {args.directory} ...")
+    with SessionLocal() as db:
+        try:
+            report = run_import(
+                db,
+                args.directory,
+                author=args.author,
+                workers=args.workers,
+                batch_size=args.batch_size,
+                on_batch=progress,
+            )
+        except ValueError as exc:
+            print(f"❌ {exc}")
+            return 1
+
+    for path in report.skipped:
+        print(f"⏭️  slug 已存在，跳过: {path}")
+    for path, error in report.failed:
+        print(f"❌ 解析失败: {path}: {error}")
+    print(
+        f"✅ 导入完成: {report.imported}/{report.files} 篇，"
+        f"新建分类 {report.categories_created} 个、标签 {report.tags_created} 个，"
+        f"耗时 {report.seconds:.2f}s（{report.posts_per_second:.0f} 篇/秒）"
+    )
+    return 1 if report.failed else 0
+
+
+def export_posts(args: argparse.Namespace) -> int:
+    """把全部文章流式导出为 zip / tar.gz 归档"""
+    from .services.post_export import iter_export_archive
+
+    print(f"📦 导出到 {args.output} ...")
+    written = 0
+    try:
+        with open(args.output, "wb") as output:
+            for chunk in iter_export_archive(
+                export_format=args.format,
+                archive=args.archive,
+                include_drafts=not args.published_only,
+                batch_size=args.batch_size,
+            ):
+                output.write(chunk)
+                written += len(chunk)
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        return 1
+    print(f"✅ 导出完成: {written / 1024 / 1024:.1f} MB")
+    return 0
+
+
+def main(argv=None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="Torpedo Blog 后端维护命令")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser(
+        "rebuild-category-tree", help="重建分类层级索引"
+    ).set_defaults(handler=rebuild_category_tree)
+
+    subparsers.add_parser(
+        "reconcile-counters", help="重新计算反范式计数"
+    ).set_defaults(handler=reconcile_counters)
+
+    subparsers.add_parser(
+        "rebuild-search-index", help="重建文章搜索索引"
+    ).set_defaults(handler=rebuild_search_index)
+
+    subparsers.add_parser(
+        "render-posts", help="重新生成文章 HTML 与目录"
+    ).set_defaults(handler=render_posts)
+
+    subparsers.add_parser(
+        "check-query-plans", help="检查常用查询是否走索引"
+    ).set_defaults(handler=check_query_plans)
+
+    import_parser = subparsers.add_parser("import-posts", help="批量导入 Markdown 文章")
+    import_parser.add_argument("directory", help="Markdown 文件目录（递归查找 .md）")
+    import_parser.add_argument("--author", help="默认作者用户名（默认为主管理员）")
+    import_parser.add_argument(
+        "--workers", type=int, default=None, help="解析进程数（默认 CPU 数，1 表示不使用进程池）"
+    )
+    import_parser.add_argument("--batch-size", type=int, default=1000, help="每个事务写入的文章数")
+    import_parser.set_defaults(handler=import_posts)
+
+    export_parser = subparsers.add_parser("export-posts", help="导出全部文章为归档")
+    export_parser.add_argument("output", help="输出文件路径")
+    export_parser.add_argument("--format", choices=["markdown", "jsonl"], default="markdown")
+    export_parser.add_argument("--archive", choices=["zip", "tar.gz"], default="zip")
+    export_parser.add_argument("--published-only", action="store_true", help="只导出已发布文章")
+    export_parser.add_argument("--batch-size", type=int, default=200, help="每次读取的文章数")
+    export_parser.set_defaults(handler=export_posts)
+
+    args = parser.parse_args(argv)
+    return args.handler(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+响应压缩（gzip / brotli）
+
+- brotli 为可选依赖（pip install "torpedo-blog-backend[brotli]"），未安装时只使用 gzip
+- 按 Accept-Encoding 的 q 值选择编码，q 相同时优先 brotli
+- 只压缩文本类内容，且小于 COMPRESSION_MINIMUM_SIZE 的响应不压缩
+- 压缩后的 ETag 改为弱校验值（不同编码的字节不同，强 ETag 不能共用），
+  条件请求使用弱比较，因此仍然可以命中
+"""
+import gzip
+import zlib
+from typing import List, Optional, Tuple
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # 可选依赖
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+# 服务端偏好顺序
+AVAILABLE_ENCODINGS: Tuple[str, ...] = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+_COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+})
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    根据 Accept-Encoding 选择压缩编码
+
+    Args:
+        accept_encoding: 请求头的值
+
+    Returns:
+        编码名称；客户端不接受任何可用编码时返回 None
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in AVAILABLE_ENCODINGS:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: Optional[bytes]) -> bool:
+    """内容类型是否值得压缩"""
+    if not content_type:
+        return False
+    media_type = content_type.decode("latin-1").split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type in _COMPRESSIBLE_TYPES
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """一次性压缩完整响应体"""
+    if encoding == BROTLI:
+        return brotli.compress(body, quality=settings.compression_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+class StreamCompressor:
+    """流式压缩（用于分块发送的响应）"""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._compressor = brotli.Compressor(quality=settings.compression_brotli_quality)
+        else:
+            # wbits=31：带 gzip 头
+            self._compressor = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """压缩一个分块（可能返回空字节串）"""
+        if self.encoding == BROTLI:
+            return self._compressor.process(chunk)
+        return self._compressor.compress(chunk)
+
+    def finish(self) -> bytes:
+        """结束压缩流"""
+        return self._compressor.finish() if self.encoding == BROTLI else self._compressor.flush()
+
+
+def get_header(headers: Headers, name: bytes) -> Optional[bytes]:
+    """读取 ASGI 原始响应头（name 为小写）"""
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def add_vary(headers: Headers) -> Headers:
+    """确保响应头包含 Vary: Accept-Encoding"""
+    for index, (key, value) in enumerate(headers):
+        if key.lower() == b"vary":
+            if b"accept-encoding" not in value.lower() and value.strip() != b"*":
+                headers[index] = (key, value + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
+
+
+def encoded_headers(headers: Headers, encoding: str, length: Optional[int]) -> Headers:
+    """
+    生成压缩后响应的头部
+
+    Args:
+        headers: 原始（未压缩）响应头
+        encoding: 压缩编码
+        length: 压缩后长度；流式响应传 None（去掉 Content-Length）
+    """
+    result: Headers = []
+    for key, value in headers:
+        name = key.lower()
+        if name == b"content-length":
+            continue
+        if name == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        result.append((key, value))
+    result.append((b"content-encoding", encoding.encode("latin-1")))
+    if length is not None:
+        result.append((b"content-length", str(length).encode("latin-1")))
+    return add_vary(result)
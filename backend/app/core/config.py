@@ -2,7 +2,7 @@
 应用配置管理
 使用 Pydantic Settings 从环境变量加载配置
 """
-from typing import List
+from typing import Dict, List
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -28,6 +28,52 @@ class Settings(BaseSettings):
     
     # 数据库配置
     database_url: str = Field(default="sqlite:///./blog.db", alias="DATABASE_URL")
+    # 启动时为未纳入 Alembic 管理的数据库自动建表（已有 alembic_version 时始终跳过）
+    auto_create_tables: bool = Field(default=True, alias="AUTO_CREATE_TABLES")
+    
+    # 连接池配置（非 SQLite 数据库生效）
+    db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")
+    db_pool_timeout: int = Field(default=30, alias="DB_POOL_TIMEOUT")
+    
+    # SQLite 连接调优（每个新连接建立时通过 PRAGMA 应用）
+    sqlite_journal_mode: str = Field(default="WAL", alias="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str = Field(default="NORMAL", alias="SQLITE_SYNCHRONOUS")
+    sqlite_busy_timeout_ms: int = Field(default=5000, alias="SQLITE_BUSY_TIMEOUT_MS")
+    sqlite_cache_size_kib: int = Field(default=20000, alias="SQLITE_CACHE_SIZE_KIB")
+    sqlite_mmap_size: int = Field(default=268435456, alias="SQLITE_MMAP_SIZE")
+    sqlite_read_pool_size: int = Field(default=5, alias="SQLITE_READ_POOL_SIZE")
+    
+    # 浏览量计数（写缓冲）
+    view_counter_shards: int = Field(default=16, alias="VIEW_COUNTER_SHARDS")
+    view_counter_flush_interval: float = Field(
+        default=10.0, alias="VIEW_COUNTER_FLUSH_INTERVAL"
+    )
+    view_counter_flush_threshold: int = Field(
+        default=1000, alias="VIEW_COUNTER_FLUSH_THRESHOLD"
+    )
+    
+    # 搜索配置（auto: 支持 FTS5 时使用 fts5，否则使用进程内倒排索引）
+    search_backend: str = Field(default="auto", alias="SEARCH_BACKEND")
+    search_snapshot_path: str = Field(
+        default="./search_index.bin", alias="SEARCH_SNAPSHOT_PATH"
+    )
+    
+    # HTTP 响应缓存（匿名 GET，进程内 LRU）
+    response_cache_enabled: bool = Field(default=True, alias="RESPONSE_CACHE_ENABLED")
+    response_cache_ttl: int = Field(default=60, alias="RESPONSE_CACHE_TTL")
+    response_cache_stale_ttl: int = Field(default=300, alias="RESPONSE_CACHE_STALE_TTL")
+    response_cache_max_entries: int = Field(default=1000, alias="RESPONSE_CACHE_MAX_ENTRIES")
+    response_cache_max_bytes: int = Field(
+        default=33554432, alias="RESPONSE_CACHE_MAX_BYTES"
+    )
+    
+    # 响应压缩（brotli 需要安装可选依赖 brotli）
+    compression_enabled: bool = Field(default=True, alias="COMPRESSION_ENABLED")
+    compression_minimum_size: int = Field(default=500, alias="COMPRESSION_MINIMUM_SIZE")
+    compression_gzip_level: int = Field(default=6, alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(default=5, alias="COMPRESSION_BROTLI_QUALITY")
     
     # 安全配置
     secret_key: str = Field(alias="SECRET_KEY")
@@ -35,6 +81,30 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = Field(
         default=30, alias="ACCESS_TOKEN_EXPIRE_MINUTES"
     )
+    # bcrypt 成本因子；修改后旧哈希在下次登录成功时重新哈希
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31, alias="BCRYPT_ROUNDS")
+    # 哈希线程数与排队上限，超出时登录返回 429
+    credential_workers: int = Field(default=2, alias="CREDENTIAL_WORKERS")
+    credential_max_pending: int = Field(default=8, alias="CREDENTIAL_MAX_PENDING")
+    
+    # 已认证用户信息缓存（按用户ID，用户更新时立即失效）
+    principal_cache_ttl: int = Field(default=60, alias="PRINCIPAL_CACHE_TTL")
+    principal_cache_max_entries: int = Field(default=1024, alias="PRINCIPAL_CACHE_MAX_ENTRIES")
+    
+    # 登录失败限制（按客户端 IP + 用户名）
+    login_max_failures: int = Field(default=5, alias="LOGIN_MAX_FAILURES")
+    login_failure_window: int = Field(default=300, alias="LOGIN_FAILURE_WINDOW")
+    
+    # 站点信息（订阅源与站点地图中的链接指向前端页面）
+    site_url: str = Field(default="http://localhost:5173", alias="SITE_URL")
+    site_title: str = Field(default="Torpedo Blog", alias="SITE_TITLE")
+    site_description: str = Field(default="Torpedo 的个人博客", alias="SITE_DESCRIPTION")
+    site_language: str = Field(default="zh-CN", alias="SITE_LANGUAGE")
+    
+    # RSS / Atom 订阅源与 sitemap（预生成并缓存，相关文章变化时按需重新生成）
+    feed_max_items: int = Field(default=20, ge=1, alias="FEED_MAX_ITEMS")
+    feed_cache_max_age: int = Field(default=3600, alias="FEED_CACHE_MAX_AGE")
+    sitemap_max_urls: int = Field(default=50000, ge=10, le=50000, alias="SITEMAP_MAX_URLS")
     
     # CORS配置 - 使用字符串存储，运行时解析
     allowed_origins_str: str = Field(
@@ -50,6 +120,46 @@ class Settings(BaseSettings):
         default="Torpedo Chen", alias="ADMIN_DISPLAY_NAME"
     )
     
+    @field_validator("sqlite_journal_mode")
+    @classmethod
+    def validate_journal_mode(cls, value: str) -> str:
+        """校验 SQLite journal_mode"""
+        value = value.upper()
+        if value not in {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}:
+            raise ValueError(f"无效的 SQLITE_JOURNAL_MODE: {value}")
+        return value
+    
+    @field_validator("sqlite_synchronous")
+    @classmethod
+    def validate_synchronous(cls, value: str) -> str:
+        """校验 SQLite synchronous 级别"""
+        value = value.upper()
+        if value not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+            raise ValueError(f"无效的 SQLITE_SYNCHRONOUS: {value}")
+        return value
+    
+    @field_validator("search_backend")
+    @classmethod
+    def validate_search_backend(cls, value: str) -> str:
+        """校验搜索后端名称"""
+        value = value.lower()
+        if value not in {"auto", "fts5", "inverted", "like"}:
+            raise ValueError(f"无效的 SEARCH_BACKEND: {value}")
+        return value
+    
+    @property
+    def sqlite_pragmas(self) -> Dict[str, str]:
+        """每个 SQLite 连接需要执行的 PRAGMA（按顺序）"""
+        return {
+            "journal_mode": self.sqlite_journal_mode,
+            "synchronous": self.sqlite_synchronous,
+            "busy_timeout": str(self.sqlite_busy_timeout_ms),
+            # 负数表示以 KiB 为单位
+            "cache_size": str(-self.sqlite_cache_size_kib),
+            "mmap_size": str(self.sqlite_mmap_size),
+            "temp_store": "MEMORY",
+        }
+    
     @property
     def allowed_origins(self) -> List[str]:
         """解析 CORS 允许的源列表"""
@@ -1,22 +1,183 @@
 """
 数据库连接和会话管理
+
+SQLite 下采用“读连接池 + 单写连接”的模式：
+- engine / async_engine: 只读查询使用的连接池
+- write_engine / async_write_engine: 只有一个连接，写事务使用 BEGIN IMMEDIATE，
+  在进程内排队而不是在文件锁上互相争抢（避免 "database is locked"）
+其他数据库（PostgreSQL 等）读写共用同一个带连接池配置的引擎。
 """
-from sqlalchemy import create_engine
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
 from .config import settings
 
-# 创建数据库引擎
-engine = create_engine(
-    settings.database_url,
+# 同步驱动 -> 异步驱动 映射
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    将同步数据库URL转换为对应的异步驱动URL
+    例如 sqlite:///./blog.db -> sqlite+aiosqlite:///./blog.db
+    已显式指定驱动的URL（如 postgresql+asyncpg://）保持不变
+    """
+    url = make_url(database_url)
+    if "+" in url.drivername:
+        backend, driver = url.drivername.split("+", 1)
+        if driver in ("aiosqlite", "asyncpg"):
+            return url.render_as_string(hide_password=False)
+    else:
+        backend = url.drivername
+
+    async_driver = ASYNC_DRIVERS.get(backend)
+    if async_driver is None:
+        raise ValueError(f"不支持的异步数据库类型: {url.drivername}")
+    return url.set(drivername=async_driver).render_as_string(hide_password=False)
+
+
+def is_sqlite_url(database_url: str) -> bool:
+    """是否为 SQLite 数据库URL"""
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def is_memory_sqlite_url(database_url: str) -> bool:
+    """是否为内存 SQLite 数据库（内存库只能使用单连接池，不能拆分读写）"""
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def get_engine_options(database_url: str, writer: bool = False) -> Dict[str, Any]:
+    """
+    根据数据库类型与用途（读/写）生成 create_engine 参数
+    
+    Args:
+        database_url: 数据库URL
+        writer: 是否为写引擎（SQLite 下写引擎只保留一个连接）
+    """
+    options: Dict[str, Any] = {"echo": settings.debug}  # 在调试模式下打印SQL语句
+
+    if not is_sqlite_url(database_url):
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_recycle=settings.db_pool_recycle,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=True,
+        )
+        return options
+
     # SQLite特定配置
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-    echo=settings.debug,  # 在调试模式下打印SQL语句
+    options["connect_args"] = {"check_same_thread": False}
+    if is_memory_sqlite_url(database_url):
+        return options
+
+    if writer:
+        # 单写连接：写事务在连接池上排队
+        options.update(pool_size=1, max_overflow=0)
+    else:
+        options.update(pool_size=settings.sqlite_read_pool_size, max_overflow=0)
+    options["pool_timeout"] = settings.db_pool_timeout
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """连接建立时应用 SQLite PRAGMA 配置"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in settings.sqlite_pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _disable_driver_transaction(dbapi_connection, connection_record) -> None:
+    """关闭 pysqlite 驱动自带的事务管理，由 begin 事件显式开启事务"""
+    dbapi_connection.isolation_level = None
+
+
+def _begin_immediate(connection) -> None:
+    """写事务一开始就获取写锁，避免读事务升级为写事务时的死锁"""
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def configure_sqlite_engine(sync_engine: Engine, writer: bool = False) -> None:
+    """为 SQLite 引擎注册连接事件（PRAGMA 与写事务模式）"""
+    event.listen(sync_engine, "connect", apply_sqlite_pragmas)
+    if writer:
+        event.listen(sync_engine, "connect", _disable_driver_transaction)
+        event.listen(sync_engine, "begin", _begin_immediate)
+
+
+_use_split_engines = (
+    is_sqlite_url(settings.database_url)
+    and not is_memory_sqlite_url(settings.database_url)
+)
+
+# 创建数据库引擎（读）
+engine = create_engine(settings.database_url, **get_engine_options(settings.database_url))
+
+# 创建数据库引擎（写）
+if _use_split_engines:
+    write_engine = create_engine(
+        settings.database_url,
+        **get_engine_options(settings.database_url, writer=True),
+    )
+else:
+    write_engine = engine
+
+# 创建异步数据库引擎（供 async def 路由使用，避免阻塞事件循环）
+_async_database_url = get_async_database_url(settings.database_url)
+async_engine = create_async_engine(
+    _async_database_url, **get_engine_options(settings.database_url)
+)
+
+if _use_split_engines:
+    async_write_engine = create_async_engine(
+        _async_database_url,
+        **get_engine_options(settings.database_url, writer=True),
+    )
+else:
+    async_write_engine = async_engine
+
+if is_sqlite_url(settings.database_url):
+    configure_sqlite_engine(engine, writer=not _use_split_engines)
+    configure_sqlite_engine(async_engine.sync_engine, writer=not _use_split_engines)
+    if _use_split_engines:
+        configure_sqlite_engine(write_engine, writer=True)
+        configure_sqlite_engine(async_write_engine.sync_engine, writer=True)
+
+# 创建会话工厂（读写，脚本与管理操作使用）
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+
+# 只读会话工厂
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# 创建异步会话工厂
+# expire_on_commit=False: 提交后仍可访问已加载的属性，避免异步上下文中的隐式懒加载
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
 )
 
-# 创建会话工厂
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 异步写会话工厂
+AsyncWriteSessionLocal = async_sessionmaker(
+    bind=async_write_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -31,16 +192,108 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    获取只读数据库会话
+    用作FastAPI的依赖注入
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    获取异步数据库会话（只读查询）
+    用作 async def 路由的依赖注入
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_write_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    获取异步写数据库会话
+    用作需要写入的 async def 路由的依赖注入
+    """
+    async with AsyncWriteSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     """创建所有数据表"""
     # 导入所有模型，确保它们都被注册到Base.metadata中
-    from ..models import Post, Category, Tag, BackendUser
+    from ..models import Post, Category, Tag, BackendUser, PostDerivedContent
     from ..models.base import Base
-    
-    Base.metadata.create_all(bind=engine)
+    from .. import services  # noqa: F401  注册建表后的附加结构（全文索引等）
+
+    Base.metadata.create_all(bind=write_engine)
+
+
+# Alembic 迁移脚本目录（backend/alembic）
+ALEMBIC_SCRIPT_LOCATION = Path(__file__).resolve().parents[2] / "alembic"
+
+
+def schema_revision() -> Optional[str]:
+    """数据库当前的 Alembic 版本号（未纳入 Alembic 管理时返回 None）"""
+    with write_engine.connect() as connection:
+        if not inspect(connection).has_table("alembic_version"):
+            return None
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def schema_is_current() -> bool:
+    """数据库是否已迁移到最新版本（alembic_version 为迁移脚本的 head）"""
+    revision = schema_revision()
+    if revision is None:
+        return False
+    from alembic.script import ScriptDirectory  # 延迟导入，只有纳入 Alembic 管理的数据库才需要
+
+    return revision in ScriptDirectory(str(ALEMBIC_SCRIPT_LOCATION)).get_heads()
+
+
+def init_schema() -> bool:
+    """
+    应用启动时准备数据表
+
+    已迁移到最新版本的数据库由迁移负责结构，不再在每个 worker 启动时执行 create_all；
+    未纳入 Alembic 管理或版本落后时，按 AUTO_CREATE_TABLES 补建缺失的表
+    （create_all 只创建不存在的表，已有表上的新列与索引仍需 alembic upgrade head）。
+
+    Returns:
+        是否执行了建表
+    """
+    if not settings.auto_create_tables or schema_is_current():
+        return False
+    create_tables()
+    return True
+
+
+async def warm_up_engines() -> None:
+    """预先建立各引擎的第一个连接（应用 PRAGMA、尽早暴露连接错误）"""
+    sync_engines = [engine, write_engine] if _use_split_engines else [engine]
+    async_engines = [async_engine, async_write_engine] if _use_split_engines else [async_engine]
+    for sync_engine in sync_engines:
+        with sync_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    for pool_engine in async_engines:
+        async with pool_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
 
 
 def drop_tables():
     """删除所有数据表（开发时使用）"""
     from ..models.base import Base
-    Base.metadata.drop_all(bind=engine) 
\ No newline at end of file
+    from .. import services  # noqa: F401
+    Base.metadata.drop_all(bind=write_engine)
+
+
+async def dispose_engines() -> None:
+    """释放同步与异步引擎的连接池（应用关闭时调用）"""
+    await async_engine.dispose()
+    engine.dispose()
+    if _use_split_engines:
+        await async_write_engine.dispose()
+        write_engine.dispose()
@@ -0,0 +1,157 @@
+"""
+游标（keyset）分页
+
+按一组排序键倒序分页（例如 (published_at, id)），翻页条件写成行值比较：
+    WHERE (published_at, id) < (:last_published_at, :last_id)
+配合同列顺序的复合索引，任意页都只是一次索引定位 + 顺序读取 limit 行，
+不像 OFFSET 那样需要先扫描并丢弃前面所有的行。
+
+游标是排序键值的 base64url 编码，对客户端不透明；排序键必须非空且组合唯一（末位用主键）。
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import literal, tuple_
+
+
+class InvalidCursor(ValueError):
+    """游标无法解析"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {"dt"}:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """把排序键值编码为不透明游标"""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, size: int) -> Tuple[Any, ...]:
+    """
+    解析游标
+
+    Args:
+        cursor: encode_cursor 生成的字符串
+        size: 排序键个数
+
+    Raises:
+        InvalidCursor: 游标格式错误
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != size:
+            raise InvalidCursor("游标格式错误")
+        return tuple(_decode_value(value) for value in values)
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+        if isinstance(exc, InvalidCursor):
+            raise
+        raise InvalidCursor("游标格式错误") from exc
+
+
+def _coerce_value(key, value: Any) -> Any:
+    """
+    检查游标值与排序列的 Python 类型一致（例如 published_at 为 datetime，id 为 int）
+
+    Raises:
+        InvalidCursor: 类型不符
+    """
+    try:
+        python_type = key.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    # bool 是 int 的子类，不能作为整数键
+    if not isinstance(value, python_type) or (isinstance(value, bool) and python_type is not bool):
+        raise InvalidCursor("游标格式错误")
+    return value
+
+
+class KeysetPage(NamedTuple):
+    """一页结果"""
+
+    items: List[Any]
+    next_cursor: Optional[str]  # 下一页（更旧）
+    prev_cursor: Optional[str]  # 上一页（更新）
+
+    def to_dict(self, serialize: Callable[[Any], Any] = lambda item: item) -> dict:
+        """转换为 API 响应结构"""
+        return {
+            "items": [serialize(item) for item in self.items],
+            "next_cursor": self.next_cursor,
+            "prev_cursor": self.prev_cursor,
+        }
+
+
+def paginate_keyset(
+    session,
+    statement,
+    keys: Sequence,
+    key_of: Callable[[Any], Sequence[Any]],
+    limit: int = 20,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> KeysetPage:
+    """
+    对 select 语句做倒序游标分页
+
+    Args:
+        session: 同步数据库会话
+        statement: 未排序、未分页的 select（返回 ORM 实体）
+        keys: 排序列，例如 (Post.published_at, Post.id)，按倒序排列
+        key_of: 从结果对象中取出排序键值的函数
+        limit: 每页数量
+        after: 取该游标之后（更旧）的一页
+        before: 取该游标之前（更新）的一页；同时给出时以 after 为准
+
+    Returns:
+        KeysetPage
+
+    Raises:
+        InvalidCursor: 游标格式错误或值与排序列类型不符
+    """
+    backward = after is None and before is not None
+    cursor = after if after is not None else before
+
+    if cursor is not None:
+        values = [_coerce_value(key, value) for key, value in zip(keys, decode_cursor(cursor, len(keys)))]
+        bound = tuple_(*(literal(value, type_=key.type) for key, value in zip(keys, values)))
+        statement = statement.where(
+            tuple_(*keys) > bound if backward else tuple_(*keys) < bound
+        )
+
+    ordering = [key.asc() if backward else key.desc() for key in keys]
+    items = list(session.scalars(statement.order_by(*ordering).limit(limit + 1)))
+
+    has_more = len(items) > limit
+    items = items[:limit]
+    if backward:
+        items.reverse()
+
+    if not items:
+        return KeysetPage(items, None, None)
+
+    first_cursor = encode_cursor(key_of(items[0]))
+    last_cursor = encode_cursor(key_of(items[-1]))
+    if backward:
+        # 从后往前翻：更新方向是否还有数据由多取的一行判断，更旧方向必然存在
+        return KeysetPage(items, last_cursor, first_cursor if has_more else None)
+    return KeysetPage(
+        items,
+        last_cursor if has_more else None,
+        first_cursor if cursor is not None else None,
+    )
@@ -0,0 +1,202 @@
+"""
+HTTP 响应缓存存储
+
+缓存条目按请求（路径 + 查询串）存放完整响应（以及预先压缩好的 gzip / br 版本），
+并带有一组失效标签（如 post:12、posts）：
+- 数据写入时按标签批量删除相关条目（见 app/services/cache_invalidation.py）
+- 过期时间分两段：fresh_until 之前直接返回；stale_until 之前返回旧响应并在后台刷新
+- 存储维护一个失效代数（每次失效递增）：调用方在渲染前读取，写入时带上，
+  渲染期间发生过失效的响应可能基于旧数据，不再写入
+
+ResponseCacheBackend 是存储接口。默认的 MemoryResponseCache 为进程内 LRU，
+按条目数与总字节数限制容量；多进程部署需要共享缓存时，实现该接口（例如基于 Redis）
+并通过 set_response_cache() 替换。接口为同步调用，实现应保证单次操作足够快。
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Set, Tuple
+
+from .config import settings
+
+
+class CachedResponse(NamedTuple):
+    """一条缓存的响应"""
+
+    status: int
+    headers: Tuple[Tuple[bytes, bytes], ...]  # ASGI 原始响应头
+    body: bytes
+    tags: FrozenSet[str]
+    stored_at: float
+    fresh_until: float
+    stale_until: float
+    encoded: Tuple[Tuple[str, bytes], ...] = ()  # (编码, 压缩后的响应体)
+
+    @property
+    def size(self) -> int:
+        """占用字节数（估算）"""
+        return (
+            len(self.body)
+            + sum(len(body) for _, body in self.encoded)
+            + sum(len(name) + len(value) for name, value in self.headers)
+        )
+
+    def variant(self, encoding: Optional[str]) -> Optional[bytes]:
+        """获取预压缩的响应体"""
+        for name, body in self.encoded:
+            if name == encoding:
+                return body
+        return None
+
+    def header(self, name: bytes) -> Optional[bytes]:
+        """读取响应头（name 为小写）"""
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+
+class ResponseCacheBackend(ABC):
+    """响应缓存存储接口"""
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """读取条目（stale_until 之后的条目视为不存在）"""
+
+    @property
+    @abstractmethod
+    def generation(self) -> int:
+        """失效代数（每次失效或清空时递增）"""
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse, generation: Optional[int] = None) -> None:
+        """写入条目；generation 与当前不一致（渲染期间发生过失效）时忽略"""
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        删除带有任一标签的条目
+
+        Returns:
+            删除的条目数
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清空缓存"""
+
+
+class MemoryResponseCache(ResponseCacheBackend):
+    """
+    进程内 LRU 响应缓存
+
+    Args:
+        max_entries: 最多条目数
+        max_bytes: 响应体与响应头的总字节上限
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._generation = 0
+        # 失效可能来自线程池中的同步会话
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.stale_until <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse, generation: Optional[int] = None) -> None:
+        if entry.size > self._max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            for tag in entry.tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while self._entries and (
+                len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            self._generation += 1
+            keys = set()
+            for tag in tags:
+                keys.update(self._by_tag.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+
+_backend: Optional[ResponseCacheBackend] = None
+
+
+def get_response_cache() -> ResponseCacheBackend:
+    """获取当前的响应缓存存储（默认为进程内 LRU）"""
+    global _backend
+    if _backend is None:
+        _backend = MemoryResponseCache(
+            max_entries=settings.response_cache_max_entries,
+            max_bytes=settings.response_cache_max_bytes,
+        )
+    return _backend
+
+
+def set_response_cache(backend: ResponseCacheBackend) -> None:
+    """替换响应缓存存储（例如接入共享缓存）"""
+    global _backend
+    _backend = backend
+
+
+def invalidate_cache_tags(tags: Iterable[str]) -> int:
+    """按标签使缓存失效"""
+    tags = list(tags)
+    if not tags or _backend is None:
+        return 0
+    return _backend.invalidate_tags(tags)
@@ -0,0 +1,72 @@
+"""
+快速 JSON 响应
+
+FastAPI 默认先用 jsonable_encoder 把返回值逐层转换成基础类型，再交给标准库 json 序列化；
+对大的文章内容（content_json 文档树、长 HTML）两步都是明显的 CPU 开销。
+
+FastJSONResponse 使用 orjson（可选依赖，未安装时退回标准库 json）直接序列化：
+- datetime / date / UUID 等由 orjson 原生处理（与 jsonable_encoder 相同的 ISO 8601 格式），
+  模型的 created_at / updated_at 不需要预先转换
+- 其它类型（Pydantic 模型、集合、元组、Decimal、Enum 等）在 _default 中按 jsonable_encoder 的规则转换
+作为应用的默认响应类；路由直接返回 FastJSONResponse 时还可以跳过 jsonable_encoder。
+"""
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """orjson / json 无法直接处理的类型"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, bytes):
+        return value.decode()
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_dumps(content: Any) -> bytes:
+    """序列化为 JSON 字节串（UTF-8，不转义非 ASCII 字符）"""
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """基于 orjson 的 JSON 响应（未安装 orjson 时使用标准库 json）"""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
@@ -0,0 +1,109 @@
+"""
+密码哈希与访问令牌
+
+- 访问令牌为 HS256 等对称算法签名的 JWT，校验只做本地计算，不查询数据库；
+  令牌对应的用户信息（Principal）由 app.services.principals 缓存
+- 密码使用 bcrypt 哈希，成本因子由 BCRYPT_ROUNDS 配置；调高后旧哈希在下次登录成功时透明重新哈希
+  （password_needs_update）
+- 这里的函数都是同步 CPU 密集操作（默认成本下单次约 100~300ms），
+  在 async 路由中请通过 app.services.credentials 的线程池调用，不要直接阻塞事件循环
+"""
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, NamedTuple, Optional
+
+import bcrypt
+
+from .config import settings
+
+# bcrypt 只使用密码的前 72 字节
+BCRYPT_MAX_BYTES = 72
+
+_BCRYPT_HASH = re.compile(r"^\$2[aby]\$(\d{2})\$[./A-Za-z0-9]{53}$")
+
+
+class InvalidToken(Exception):
+    """访问令牌无效或已过期"""
+
+
+class Principal(NamedTuple):
+    """
+    已认证用户的权限信息
+
+    只包含鉴权需要的字段，权限判断不需要加载 BackendUser 对象。
+    """
+
+    id: int
+    username: str
+    is_admin: bool
+    is_author: bool
+    is_active: bool
+
+    def can_edit_post(self, author_id: Optional[int]) -> bool:
+        """管理员可编辑所有文章，作者只能编辑自己的文章"""
+        if self.is_admin:
+            return True
+        return self.is_author and author_id == self.id
+
+    def can_delete_post(self, author_id: Optional[int] = None) -> bool:
+        """只有管理员可以删除文章"""
+        return self.is_admin
+
+
+def _encode(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """生成 bcrypt 哈希（rounds 默认取 BCRYPT_ROUNDS）"""
+    salt = bcrypt.gensalt(rounds=rounds or settings.bcrypt_rounds)
+    return bcrypt.hashpw(_encode(password), salt).decode("ascii")
+
+
+def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    """校验密码（哈希缺失或格式无效时返回 False）"""
+    if not password_hash or not _BCRYPT_HASH.match(password_hash):
+        return False
+    return bcrypt.checkpw(_encode(password), password_hash.encode("ascii"))
+
+
+def password_needs_update(password_hash: Optional[str]) -> bool:
+    """哈希的成本因子与当前配置不同（或不是 bcrypt 哈希）时需要重新哈希"""
+    match = _BCRYPT_HASH.match(password_hash or "")
+    return match is None or int(match.group(1)) != settings.bcrypt_rounds
+
+
+def create_access_token(subject: str, expires_delta: Optional[timedelta] = None, **claims: Any) -> str:
+    """
+    签发 JWT 访问令牌
+
+    Args:
+        subject: sub 声明（用户ID）
+        expires_delta: 有效期，默认 ACCESS_TOKEN_EXPIRE_MINUTES
+        claims: 额外声明
+    """
+    from jose import jwt  # 延迟导入（依赖 cryptography，导入较慢）
+
+    now = datetime.now(timezone.utc)
+    expires_at = now + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
+    payload: Dict[str, Any] = {**claims, "sub": subject, "iat": now, "exp": expires_at}
+    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+
+
+def decode_access_token(token: str) -> int:
+    """
+    校验 JWT 访问令牌（签名与有效期）
+
+    Returns:
+        令牌中的用户ID（sub）
+
+    Raises:
+        InvalidToken: 签名错误、已过期或缺少 sub
+    """
+    from jose import JWTError, jwt
+
+    try:
+        claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        return int(claims["sub"])
+    except (JWTError, KeyError, TypeError, ValueError) as exc:
+        raise InvalidToken(str(exc)) from exc
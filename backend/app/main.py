@@ -1,13 +1,65 @@
 """
 Torpedo Blog Backend - FastAPI应用入口
+
+启动开销保持在最小：uvicorn、jose、traceback 等只在需要时导入，
+数据库结构由 Alembic 管理时不在启动时执行 create_all。
 """
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-import uvicorn
 
+from .api import api_router
+from .api.caching import ResponseCacheMiddleware
+from .api.compression import CompressionMiddleware
+from .api.endpoints import feeds
 from .core.config import settings
-from .core.database import create_tables
+from .core.database import dispose_engines, init_schema, warm_up_engines
+from .core.responses import FastJSONResponse
+from .services.credentials import credential_service
+from .services.search import save_search_index, warm_up_search_index
+from .services.view_counter import view_counter
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期
+
+    启动：准备数据表（仅未纳入 Alembic 管理时）、预热连接池、搜索索引与占位密码哈希、启动浏览量刷写任务
+    关闭：写回浏览量、保存搜索索引快照、关闭密码哈希线程池、释放连接池
+    """
+    logger.info("%s 正在启动（环境: %s）", settings.app_name, settings.environment)
+
+    if await asyncio.to_thread(init_schema):
+        logger.info("数据库表创建完成")
+    await warm_up_engines()
+    backend = await asyncio.to_thread(warm_up_search_index)
+    logger.info("搜索后端: %s", backend.name)
+    await credential_service.warm_up()
+
+    # 启动浏览量后台刷写任务
+    view_counter.start()
+    try:
+        yield
+    finally:
+        # 写回缓冲中的浏览量
+        await view_counter.stop()
+
+        # 保存进程内搜索索引快照
+        save_search_index()
+
+        # 关闭密码哈希线程池
+        credential_service.shutdown()
+
+        # 释放同步/异步连接池
+        await dispose_engines()
+
 
 # 创建FastAPI应用实例
 app = FastAPI(
@@ -17,8 +69,28 @@ app = FastAPI(
     debug=settings.debug,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
+# 中间件按注册顺序由内到外：响应缓存 -> 压缩 -> CORS
+# 缓存位于 CORS 内层，缓存的响应不包含按 Origin 生成的 CORS 头
+
+# 匿名 GET 响应缓存（同时保存预压缩版本）
+if settings.response_cache_enabled:
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        ttl=settings.response_cache_ttl,
+        stale_ttl=settings.response_cache_stale_ttl,
+        compress_minimum_size=(
+            settings.compression_minimum_size if settings.compression_enabled else None
+        ),
+    )
+
+# gzip / brotli 压缩
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
 # 配置CORS
 app.add_middleware(
     CORSMiddleware,
@@ -28,17 +100,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-
-@app.on_event("startup")
-async def startup_event():
-    """应用启动时执行"""
-    print(f"🚀 {settings.app_name} 正在启动...")
-    print(f"📊 环境: {settings.environment}")
-    print(f"🗄️  数据库: {settings.database_url}")
-    
-    # 创建数据库表
-    create_tables()
-    print("✅ 数据库表创建完成")
+# 注册业务路由
+app.include_router(api_router)
+# 订阅源与站点地图挂载在根路径
+app.include_router(feeds.router)
 
 
 @app.get("/")
@@ -72,7 +137,8 @@ async def http_exception_handler(request, exc):
             "error": True,
             "message": exc.detail,
             "status_code": exc.status_code,
-        }
+        },
+        headers=exc.headers,  # 保留 Retry-After / WWW-Authenticate 等响应头
     )
 
 
@@ -97,6 +163,8 @@ async def general_exception_handler(request, exc):
 
 if __name__ == "__main__":
     # 直接运行时的开发服务器
+    import uvicorn
+
     uvicorn.run(
         "app.main:app",
         host=settings.host,
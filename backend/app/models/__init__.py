@@ -3,5 +3,6 @@ from .post import Post
 from .category import Category  
 from .tag import Tag
 from .user import BackendUser
+from .post_derived import PostDerivedContent
 
-__all__ = ["Post", "Category", "Tag", "BackendUser"] 
\ No newline at end of file
+__all__ = ["Post", "Category", "Tag", "BackendUser", "PostDerivedContent"] 
\ No newline at end of file
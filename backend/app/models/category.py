@@ -3,10 +3,30 @@ Category model for blog classification.
 Designed for personal blog with practical 2-3 level hierarchy.
 """
 
-from typing import List, Optional
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import (
+    Column, String, Text, Integer, ForeignKey, Boolean, Table,
+    delete, event, exists, func, insert, inspect, literal, select,
+)
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import aliased, object_session, relationship
 from .base import Base
+from .post import Post
+
+
+# Closure table for the category hierarchy.
+# One row per (ancestor, descendant) pair including the (self, self) row at depth 0,
+# so level, breadcrumb, subtree and subtree post counts are each a single query.
+category_closure = Table(
+    'category_closure',
+    Base.metadata,
+    Column('ancestor_id', ForeignKey('category.id', ondelete='CASCADE'), primary_key=True),
+    Column('descendant_id', ForeignKey('category.id', ondelete='CASCADE'), primary_key=True, index=True),
+    Column('depth', Integer, nullable=False),
+)
+
+# Reasonable max depth (also guards the recursive rebuild against cycles)
+MAX_CATEGORY_DEPTH = 10
 
 
 class Category(Base):
@@ -108,10 +128,28 @@ class Category(Base):
         """Check if this is a root category (no parent)."""
         return self.parent_id is None
     
-    @property
+    @hybrid_property
     def is_leaf(self) -> bool:
-        """Check if this is a leaf category (no children)."""
-        return len(self.children) == 0
+        """
+        Check if this is a leaf category (no children).
+        
+        Uses an EXISTS query unless the children collection is already loaded.
+        """
+        session = self._indexed_session()
+        if session is None or 'children' in inspect(self).dict:
+            return len(self.children) == 0
+        return session.scalar(select(Category.is_leaf).where(Category.id == self.id))
+    
+    @is_leaf.expression
+    def is_leaf(cls):
+        child = aliased(Category)
+        return ~exists().where(child.parent_id == cls.id)
+    
+    def _indexed_session(self):
+        """Return the owning session if this category can use the closure table."""
+        if self.id is None:
+            return None
+        return object_session(self)
     
     def get_level(self) -> int:
         """
@@ -123,13 +161,22 @@ class Category(Base):
         if self.is_root:
             return 0
         
+        session = self._indexed_session()
+        if session is not None:
+            level = session.scalar(
+                select(func.max(category_closure.c.depth))
+                .where(category_closure.c.descendant_id == self.id)
+            )
+            if level is not None:
+                return level
+        
         level = 0
         current = self
         while current.parent_id is not None:
             level += 1
             current = current.parent
             # Safety check to prevent infinite loops
-            if level > 10:  # Reasonable max depth
+            if level > MAX_CATEGORY_DEPTH:
                 break
         
         return level
@@ -142,6 +189,17 @@ class Category(Base):
             List of category names from root to current
             e.g., ['技术文章', '前端开发', 'React']
         """
+        session = self._indexed_session()
+        if session is not None:
+            breadcrumb = list(session.scalars(
+                select(Category.name)
+                .join(category_closure, category_closure.c.ancestor_id == Category.id)
+                .where(category_closure.c.descendant_id == self.id)
+                .order_by(category_closure.c.depth.desc())
+            ))
+            if breadcrumb:
+                return breadcrumb
+        
         breadcrumb = []
         current = self
         
@@ -149,37 +207,61 @@ class Category(Base):
             breadcrumb.insert(0, current.name)
             current = current.parent
             # Safety check
-            if len(breadcrumb) > 10:
+            if len(breadcrumb) > MAX_CATEGORY_DEPTH:
                 break
         
         return breadcrumb
     
     def get_all_children(self) -> List['Category']:
         """
-        Get all descendant categories (recursive).
+        Get all active descendant categories (ordered by level, then sort order).
         
-        For personal blog, this is typically just direct children
-        since we rarely go beyond 2-3 levels.
+        Descendants below an inactive category are hidden together with it.
         """
-        all_children = []
-        
-        def collect_children(category):
-            for child in category.children:
-                if child.is_active:
-                    all_children.append(child)
-                    collect_children(child)  # Recursive for deeper levels
+        session = self._indexed_session()
+        if session is None:
+            all_children = []
+            
+            def collect_children(category):
+                for child in category.children:
+                    if child.is_active:
+                        all_children.append(child)
+                        collect_children(child)  # Recursive for deeper levels
+            
+            collect_children(self)
+            return all_children
         
-        collect_children(self)
-        return all_children
+        # Any inactive category between self (exclusive) and the descendant (inclusive)
+        path = category_closure.alias('path')
+        blocked = aliased(Category)
+        inactive_on_path = (
+            exists()
+            .where(path.c.descendant_id == Category.id)
+            .where(path.c.depth < category_closure.c.depth)
+            .where(path.c.ancestor_id == blocked.id)
+            .where(blocked.is_active == False)
+        )
+        return list(session.scalars(
+            select(Category)
+            .join(category_closure, category_closure.c.descendant_id == Category.id)
+            .where(category_closure.c.ancestor_id == self.id)
+            .where(category_closure.c.depth > 0)
+            .where(~inactive_on_path)
+            .order_by(category_closure.c.depth, Category.sort_order, Category.id)
+        ))
     
-    @property
+    @hybrid_property
     def post_count(self) -> int:
         """
-        Get total number of posts in this category and its children.
+        Get total number of published posts in this category and its children.
         
-        Note: This should be computed via database query in production
-        for better performance.
+        Computed with a single query over the closure table when persisted.
+        In queries, Category.post_count is a correlated COUNT subquery.
         """
+        session = self._indexed_session()
+        if session is not None:
+            return session.scalar(select(Category.post_count).where(Category.id == self.id))
+        
         # Direct posts in this category
         direct_count = len([p for p in self.posts if p.is_published])
         
@@ -188,6 +270,49 @@ class Category(Base):
         
         return direct_count + child_count
     
+    @post_count.expression
+    def post_count(cls):
+        return (
+            select(func.count(Post.id))
+            .select_from(category_closure)
+            .join(Post, Post.category_id == category_closure.c.descendant_id)
+            .where(category_closure.c.ancestor_id == cls.id)
+            .where(Post.is_published == True)
+            .scalar_subquery()
+        )
+    
+    @hybrid_property
+    def has_blocking_content(self) -> bool:
+        """
+        Check whether the category directly holds published posts or active children.
+        
+        In queries, Category.has_blocking_content is an EXISTS expression.
+        """
+        session = self._indexed_session()
+        if session is None or ('posts' in inspect(self).dict and 'children' in inspect(self).dict):
+            return (
+                any(post.is_published for post in self.posts)
+                or any(child.is_active for child in self.children)
+            )
+        return session.scalar(
+            select(Category.has_blocking_content).where(Category.id == self.id)
+        )
+    
+    @has_blocking_content.expression
+    def has_blocking_content(cls):
+        child = aliased(Category)
+        has_posts = (
+            exists()
+            .where(Post.category_id == cls.id)
+            .where(Post.is_published == True)
+        )
+        has_active_children = (
+            exists()
+            .where(child.parent_id == cls.id)
+            .where(child.is_active == True)
+        )
+        return has_posts | has_active_children
+    
     def can_delete(self) -> bool:
         """
         Check if this category can be safely deleted.
@@ -195,12 +320,156 @@ class Category(Base):
         Returns:
             False if category has posts or active children
         """
-        # Has published posts
-        if any(post.is_published for post in self.posts):
-            return False
+        return not self.has_blocking_content
+    
+    @classmethod
+    def get_post_counts(cls, session, category_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Get subtree published post counts for many categories in one query.
         
-        # Has active children
-        if any(child.is_active for child in self.children):
-            return False
+        Args:
+            session: Database session
+            category_ids: Category IDs to count
+            
+        Returns:
+            Mapping of category ID to published post count (including descendants)
+        """
+        category_ids = list(category_ids)
+        if not category_ids:
+            return {}
         
-        return True 
\ No newline at end of file
+        counts = dict(session.execute(
+            select(category_closure.c.ancestor_id, func.count(Post.id))
+            .join(Post, Post.category_id == category_closure.c.descendant_id)
+            .where(category_closure.c.ancestor_id.in_(category_ids))
+            .where(Post.is_published == True)
+            .group_by(category_closure.c.ancestor_id)
+        ).all())
+        return {category_id: counts.get(category_id, 0) for category_id in category_ids} 
+    
+    @classmethod
+    def rebuild_closure(cls, session) -> int:
+        """
+        Rebuild the whole closure table from parent_id links.
+        
+        Use after importing data or upgrading an existing database.
+        
+        Args:
+            session: Database session (caller commits)
+            
+        Returns:
+            Number of closure rows written
+        """
+        tree = select(
+            cls.id.label('ancestor_id'),
+            cls.id.label('descendant_id'),
+            literal(0).label('depth'),
+        ).cte('tree', recursive=True)
+        child = aliased(cls)
+        tree = tree.union_all(
+            select(tree.c.ancestor_id, child.id, tree.c.depth + 1)
+            .join(child, child.parent_id == tree.c.descendant_id)
+            .where(tree.c.depth < MAX_CATEGORY_DEPTH)
+        )
+        
+        session.execute(delete(category_closure))
+        session.execute(
+            insert(category_closure).from_select(
+                ['ancestor_id', 'descendant_id', 'depth'],
+                select(tree.c.ancestor_id, tree.c.descendant_id, tree.c.depth),
+            )
+        )
+        return session.scalar(select(func.count()).select_from(category_closure))
+
+
+# --- Closure table maintenance ---
+
+@event.listens_for(Category, 'after_insert')
+def _insert_closure_rows(mapper, connection, target):
+    """Link a new category to itself and to every ancestor of its parent."""
+    connection.execute(
+        insert(category_closure).values(
+            ancestor_id=target.id, descendant_id=target.id, depth=0
+        )
+    )
+    if target.parent_id is not None:
+        connection.execute(
+            insert(category_closure).from_select(
+                ['ancestor_id', 'descendant_id', 'depth'],
+                select(
+                    category_closure.c.ancestor_id,
+                    literal(target.id),
+                    category_closure.c.depth + 1,
+                ).where(category_closure.c.descendant_id == target.parent_id),
+            )
+        )
+
+
+@event.listens_for(Category, 'before_update')
+def _check_category_move(mapper, connection, target):
+    """Reject moves that would make a category its own ancestor."""
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+    if target.parent_id is None:
+        return
+    would_cycle = connection.scalar(
+        select(
+            exists()
+            .where(category_closure.c.ancestor_id == target.id)
+            .where(category_closure.c.descendant_id == target.parent_id)
+        )
+    )
+    if would_cycle:
+        raise ValueError(
+            f"Category {target.id} cannot be moved under its own descendant"
+        )
+
+
+@event.listens_for(Category, 'after_update')
+def _move_closure_rows(mapper, connection, target):
+    """Re-link a moved subtree to the ancestors of its new parent."""
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+    
+    subtree = (
+        select(category_closure.c.descendant_id)
+        .where(category_closure.c.ancestor_id == target.id)
+        .scalar_subquery()
+    )
+    # Detach: drop links from old ancestors into the subtree
+    connection.execute(
+        delete(category_closure)
+        .where(category_closure.c.descendant_id.in_(subtree))
+        .where(category_closure.c.ancestor_id.not_in(subtree))
+    )
+    
+    if target.parent_id is None:
+        return
+    
+    # Attach: every ancestor of the new parent x every node of the subtree
+    above = category_closure.alias('above')
+    below = category_closure.alias('below')
+    connection.execute(
+        insert(category_closure).from_select(
+            ['ancestor_id', 'descendant_id', 'depth'],
+            select(
+                above.c.ancestor_id,
+                below.c.descendant_id,
+                above.c.depth + below.c.depth + 1,
+            )
+            .select_from(above)
+            .join(below, below.c.ancestor_id == target.id)
+            .where(above.c.descendant_id == target.parent_id),
+        )
+    )
+
+
+@event.listens_for(Category, 'after_delete')
+def _delete_closure_rows(mapper, connection, target):
+    """Remove every link to or from a deleted category."""
+    connection.execute(
+        delete(category_closure).where(
+            (category_closure.c.descendant_id == target.id)
+            | (category_closure.c.ancestor_id == target.id)
+        )
+    )
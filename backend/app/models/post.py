@@ -2,19 +2,25 @@
 Post model for blog articles.
 """
 
-from datetime import datetime
+import math
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
-from sqlalchemy import Column, String, Text, Boolean, ForeignKey, Table, JSON, Integer, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Boolean, ForeignKey, Table, JSON, Integer, DateTime, Index
+from sqlalchemy.orm import deferred, relationship, validates
 from .base import Base
 
+# Deferred column group holding the (large) article bodies
+CONTENT_GROUP = "content"
+
 
 # Many-to-many association table for Post and Tag
 post_tag_association = Table(
     'post_tag', 
     Base.metadata,
     Column('post_id', ForeignKey('post.id'), primary_key=True),
-    Column('tag_id', ForeignKey('tag.id'), primary_key=True)
+    Column('tag_id', ForeignKey('tag.id'), primary_key=True),
+    # The primary key serves post -> tags; tag archives and counts go tag -> posts
+    Index('ix_post_tag_tag_id_post_id', 'tag_id', 'post_id'),
 )
 
 
@@ -28,6 +34,7 @@ class Post(Base):
     - Publication status (draft/published)
     - Category and tag relationships
     - Reading time estimation
+    - Heavy body columns deferred (group ``CONTENT_GROUP``)
     """
     
     # Basic content fields
@@ -47,16 +54,24 @@ class Post(Base):
     )
     
     # Rich content storage
-    content_json = Column(
-        JSON,
-        nullable=True,
-        doc="TipTap ProseMirror JSON format for rich editing"
-    )
-    
-    content_markdown = Column(
-        Text,
-        nullable=True,
-        doc="Markdown representation for export and backup"
+    # Deferred as one group: list/feed queries never load article bodies;
+    # use undefer_group(CONTENT_GROUP) when the full content is needed.
+    content_json = deferred(
+        Column(
+            JSON,
+            nullable=True,
+            doc="TipTap ProseMirror JSON format for rich editing"
+        ),
+        group=CONTENT_GROUP,
+    )
+    
+    content_markdown = deferred(
+        Column(
+            Text,
+            nullable=True,
+            doc="Markdown representation for export and backup"
+        ),
+        group=CONTENT_GROUP,
     )
     
     excerpt = Column(
@@ -83,7 +98,6 @@ class Post(Base):
         Boolean,
         default=False,
         nullable=False,
-        index=True,
         doc="Whether the post is published or draft"
     )
     
@@ -141,6 +155,42 @@ class Post(Base):
         doc="Many-to-many tag relationships"
     )
     
+    derived = relationship(
+        "PostDerivedContent",
+        uselist=False,
+        back_populates="post",
+        cascade="all, delete-orphan",
+        doc="Pre-computed artifacts (rendered HTML, ...) derived from content_json"
+    )
+    
+    # Partial indexes over published posts only, one per listing access path.
+    # Each matches a query's WHERE prefix plus the keyset order (published_at, id)
+    # so a page is an index range read with no sort; drafts are not indexed.
+    __table_args__ = (
+        Index(
+            "ix_post_published_listing", "published_at", "id",
+            sqlite_where=is_published == True,
+            postgresql_where=is_published == True,
+        ),
+        Index(
+            "ix_post_category_published", "category_id", "published_at", "id",
+            sqlite_where=is_published == True,
+            postgresql_where=is_published == True,
+        ),
+        Index(
+            "ix_post_author_published", "author_id", "published_at", "id",
+            sqlite_where=is_published == True,
+            postgresql_where=is_published == True,
+        ),
+    )
+    
+    @validates("is_published")
+    def _stamp_published_at(self, key: str, value: bool) -> bool:
+        """Set published_at on first publish so listings can always order by it."""
+        if value and self.published_at is None:
+            self.published_at = datetime.now(timezone.utc)
+        return value
+    
     def __repr__(self) -> str:
         """String representation of the post."""
         status = "Published" if self.is_published else "Draft"
@@ -155,49 +205,44 @@ class Post(Base):
         """
         Calculate estimated reading time based on content.
         
+        CJK characters and Latin words are counted separately (see
+        app.services.content.analyzer). The value is also persisted to
+        ``reading_time_minutes`` whenever the post is saved.
+        
         Args:
-            words_per_minute: Average reading speed (default: 200 WPM)
+            words_per_minute: Average reading speed for Latin text (default: 200 WPM)
             
         Returns:
             Estimated reading time in minutes
         """
+        from ..services.content.analyzer import CJK_CHARS_PER_MINUTE, analyze_markdown
+        
         if not self.content_markdown:
             return 0
         
-        # Simple word count estimation
-        word_count = len(self.content_markdown.split())
-        reading_time = max(1, word_count // words_per_minute)
-        
-        return reading_time
+        analysis = analyze_markdown(self.content_markdown, excerpt_length=0)
+        minutes = (
+            analysis.latin_words / words_per_minute
+            + analysis.cjk_characters / CJK_CHARS_PER_MINUTE
+        )
+        return max(1, math.ceil(minutes))
     
     def generate_excerpt(self, max_length: int = 160) -> str:
         """
         Generate excerpt from content if not manually set.
         
+        Scanning stops collecting text as soon as ``max_length`` is reached.
+        Auto-generated excerpts are persisted to ``excerpt`` on save.
+        
         Args:
             max_length: Maximum excerpt length
             
         Returns:
             Generated excerpt string
         """
+        from ..services.content.analyzer import analyze_markdown
+        
         if self.excerpt:
             return self.excerpt
         
-        if not self.content_markdown:
-            return ""
-        
-        # Remove markdown formatting for plain text excerpt
-        import re
-        plain_text = re.sub(r'[#*_`\[\]()]', '', self.content_markdown)
-        plain_text = ' '.join(plain_text.split())  # Normalize whitespace
-        
-        if len(plain_text) <= max_length:
-            return plain_text
-        
-        # Truncate at word boundary
-        truncated = plain_text[:max_length]
-        last_space = truncated.rfind(' ')
-        if last_space > max_length * 0.8:  # If we can find a reasonable word boundary
-            truncated = truncated[:last_space]
-        
-        return truncated + "..." 
\ No newline at end of file
+        return analyze_markdown(self.content_markdown, excerpt_length=max_length).excerpt
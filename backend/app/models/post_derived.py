@@ -0,0 +1,59 @@
+"""
+Derived (pre-computed) content for blog posts.
+"""
+
+from sqlalchemy import JSON, Column, ForeignKey, String, Text
+from sqlalchemy.orm import relationship
+from .base import Base
+
+
+class PostDerivedContent(Base):
+    """
+    Artifacts derived from Post.content_json, computed on save.
+
+    Kept in a separate one-to-one table so that article reads can fetch the
+    pre-rendered output, TOC and stats without loading the source
+    JSON/Markdown columns, and list queries on ``post`` never pay for it.
+    """
+
+    post_id = Column(
+        ForeignKey('post.id', ondelete='CASCADE'),
+        unique=True,
+        nullable=False,
+        index=True,
+        doc="Owning post"
+    )
+
+    content_hash = Column(
+        String(64),
+        nullable=True,
+        doc="Hash of the content_json (and renderer version) the artifacts were built from"
+    )
+
+    content_html = Column(
+        Text,
+        nullable=True,
+        doc="Sanitized HTML rendered from content_json (published posts only)"
+    )
+
+    toc = Column(
+        JSON,
+        nullable=True,
+        doc="Table of contents: [{level, text, anchor}, ...] matching heading ids in content_html"
+    )
+
+    content_stats = Column(
+        JSON,
+        nullable=True,
+        doc="Structural statistics of the content (characters, headings, images, ...)"
+    )
+
+    post = relationship(
+        "Post",
+        back_populates="derived",
+        doc="Owning post relationship"
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the derived content."""
+        return f"<PostDerivedContent(post_id={self.post_id}, hash='{(self.content_hash or '')[:8]}')>"
@@ -3,10 +3,12 @@ Tag model for flexible content labeling.
 Complements Category with cross-cutting content organization.
 """
 
-from typing import List, Optional
-from sqlalchemy import Column, String, Text, Integer, Boolean, func
-from sqlalchemy.orm import relationship
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import Column, String, Text, Integer, Boolean, Index, exists, func, inspect, select
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import object_session, relationship
 from .base import Base
+from .post import Post, post_tag_association
 
 
 class Tag(Base):
@@ -63,7 +65,6 @@ class Tag(Base):
         Integer,
         default=0,
         nullable=False,
-        index=True,
         doc="Number of times this tag has been used (denormalized for performance)"
     )
     
@@ -72,7 +73,6 @@ class Tag(Base):
         Boolean,
         default=True,
         nullable=False,
-        index=True,
         doc="Whether tag is active and visible"
     )
     
@@ -91,19 +91,61 @@ class Tag(Base):
         doc="Posts tagged with this tag"
     )
     
+    __table_args__ = (
+        # Tag clouds filter on is_active and order by usage_count
+        # (popular / trending / featured); replaces the two single-column indexes
+        Index("ix_tag_active_usage", "is_active", "usage_count"),
+    )
+    
     def __repr__(self) -> str:
         """String representation."""
         return f"<Tag(id={self.id}, name='{self.name}', usage={self.usage_count})>"
     
-    @property
+    @hybrid_property
     def post_count(self) -> int:
         """
         Get number of published posts with this tag.
         
-        Note: In production, this should be computed via database query
-        for better performance, or kept in sync via the usage_count field.
+        Uses a COUNT query unless the posts collection is already loaded.
+        In queries, Tag.post_count is a correlated COUNT subquery, e.g.
+        select(Tag, Tag.post_count).
         """
-        return len([post for post in self.posts if post.is_published])
+        session = object_session(self)
+        if session is None or self.id is None or 'posts' in inspect(self).dict:
+            return len([post for post in self.posts if post.is_published])
+        return session.scalar(select(type(self).post_count).where(type(self).id == self.id))
+    
+    @post_count.expression
+    def post_count(cls):
+        return (
+            select(func.count(Post.id))
+            .select_from(post_tag_association)
+            .join(Post, Post.id == post_tag_association.c.post_id)
+            .where(post_tag_association.c.tag_id == cls.id)
+            .where(Post.is_published == True)
+            .scalar_subquery()
+        )
+    
+    @hybrid_property
+    def has_published_posts(self) -> bool:
+        """
+        Check whether any published post uses this tag.
+        
+        In queries, Tag.has_published_posts is an EXISTS subquery.
+        """
+        session = object_session(self)
+        if session is None or self.id is None or 'posts' in inspect(self).dict:
+            return any(post.is_published for post in self.posts)
+        return session.scalar(select(type(self).has_published_posts).where(type(self).id == self.id))
+    
+    @has_published_posts.expression
+    def has_published_posts(cls):
+        return (
+            exists()
+            .where(post_tag_association.c.tag_id == cls.id)
+            .where(Post.id == post_tag_association.c.post_id)
+            .where(Post.is_published == True)
+        )
     
     @property
     def is_trending(self) -> bool:
@@ -134,7 +176,8 @@ class Tag(Base):
         """
         Increment usage count when tag is added to a post.
         
-        This method should be called when a post is published with this tag.
+        Note: usage_count is maintained automatically on flush by
+        app.services.counters; only call this for objects outside a session.
         """
         self.usage_count += 1
     
@@ -142,7 +185,8 @@ class Tag(Base):
         """
         Decrement usage count when tag is removed from a post.
         
-        This method should be called when a post is unpublished or tag is removed.
+        Note: usage_count is maintained automatically on flush by
+        app.services.counters; only call this for objects outside a session.
         """
         if self.usage_count > 0:
             self.usage_count -= 1
@@ -201,6 +245,91 @@ class Tag(Base):
             .order_by(cls.usage_count.desc())\
             .all()
     
+    @classmethod
+    async def get_popular_tags_async(cls, session, limit: int = 10) -> List['Tag']:
+        """
+        Async variant of get_popular_tags for use with AsyncSession.
+        
+        Args:
+            session: Async database session
+            limit: Number of tags to return
+            
+        Returns:
+            List of popular tags ordered by usage count
+        """
+        result = await session.execute(
+            select(cls)
+            .where(cls.is_active == True)
+            .order_by(cls.usage_count.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    @classmethod
+    async def get_trending_tags_async(cls, session, limit: int = 5) -> List['Tag']:
+        """
+        Async variant of get_trending_tags for use with AsyncSession.
+        
+        Args:
+            session: Async database session
+            limit: Number of tags to return
+            
+        Returns:
+            List of trending tags
+        """
+        result = await session.execute(
+            select(cls)
+            .where(cls.is_active == True)
+            .where(cls.usage_count >= 3)
+            .order_by(cls.usage_count.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    @classmethod
+    async def get_featured_tags_async(cls, session) -> List['Tag']:
+        """
+        Async variant of get_featured_tags for use with AsyncSession.
+        
+        Args:
+            session: Async database session
+            
+        Returns:
+            List of featured tags
+        """
+        result = await session.execute(
+            select(cls)
+            .where(cls.is_active == True)
+            .where(cls.is_featured == True)
+            .order_by(cls.usage_count.desc())
+        )
+        return list(result.scalars().all())
+    
+    @classmethod
+    def get_post_counts(cls, session, tag_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Get published post counts for many tags in one query.
+        
+        Args:
+            session: Database session
+            tag_ids: Tag IDs to count
+            
+        Returns:
+            Mapping of tag ID to published post count (0 for unused tags)
+        """
+        tag_ids = list(tag_ids)
+        if not tag_ids:
+            return {}
+        
+        counts = dict(session.execute(
+            select(post_tag_association.c.tag_id, func.count(Post.id))
+            .join(Post, Post.id == post_tag_association.c.post_id)
+            .where(post_tag_association.c.tag_id.in_(tag_ids))
+            .where(Post.is_published == True)
+            .group_by(post_tag_association.c.tag_id)
+        ).all())
+        return {tag_id: counts.get(tag_id, 0) for tag_id in tag_ids}
+    
     def can_delete(self) -> bool:
         """
         Check if this tag can be safely deleted.
@@ -208,4 +337,4 @@ class Tag(Base):
         Returns:
             False if tag is used by any published posts
         """
-        return not any(post.is_published for post in self.posts) 
\ No newline at end of file
+        return not self.has_published_posts 
\ No newline at end of file
@@ -4,14 +4,13 @@ Designed for personal blog with potential for guest authors.
 """
 
 from datetime import datetime
-from typing import Optional
-from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer
-from sqlalchemy.orm import relationship
-from passlib.context import CryptContext
+from typing import Dict, Iterable, Optional
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer, func, inspect, select
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import object_session, relationship
+from ..core import security
 from .base import Base
-
-# Password hashing configuration using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .post import Post
 
 
 class BackendUser(Base):
@@ -201,24 +200,80 @@ class BackendUser(Base):
             
         return ", ".join(byline_parts)
     
-    @property
+    @hybrid_property
     def published_post_count(self) -> int:
         """
         Get count of published posts by this author.
         
-        Note: This should use the denormalized post_count field in production
-        for better performance.
+        Uses a COUNT query unless the posts collection is already loaded;
+        prefer the denormalized post_count field for display.
+        In queries, BackendUser.published_post_count is a correlated COUNT subquery.
         """
-        return len([post for post in self.posts if post.is_published])
+        session = object_session(self)
+        if session is None or self.id is None or 'posts' in inspect(self).dict:
+            return len([post for post in self.posts if post.is_published])
+        return session.scalar(
+            select(BackendUser.published_post_count).where(BackendUser.id == self.id)
+        )
+    
+    @published_post_count.expression
+    def published_post_count(cls):
+        return (
+            select(func.count(Post.id))
+            .where(Post.author_id == cls.id)
+            .where(Post.is_published == True)
+            .scalar_subquery()
+        )
+    
+    @classmethod
+    def get_published_post_counts(cls, session, user_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Get published post counts for many authors in one query.
+        
+        Args:
+            session: Database session
+            user_ids: Author IDs to count
+            
+        Returns:
+            Mapping of user ID to published post count
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        
+        counts = dict(session.execute(
+            select(Post.author_id, func.count(Post.id))
+            .where(Post.author_id.in_(user_ids))
+            .where(Post.is_published == True)
+            .group_by(Post.author_id)
+        ).all())
+        return {user_id: counts.get(user_id, 0) for user_id in user_ids}
     
     def update_post_count(self) -> None:
         """
         Update the denormalized post count.
         
-        This should be called when posts are published/unpublished.
+        post_count is maintained automatically on flush by app.services.counters;
+        this recomputes it for a single author with one COUNT query.
         """
         self.post_count = self.published_post_count
     
+    @property
+    def principal(self) -> security.Principal:
+        """
+        Authorization view of this user (see app.services.principals).
+        
+        Returns:
+            Principal with the id, username and permission flags
+        """
+        return security.Principal(
+            id=self.id,
+            username=self.username,
+            is_admin=bool(self.is_admin),
+            is_author=bool(self.is_author),
+            is_active=bool(self.is_active),
+        )
+    
     def can_edit_post(self, post) -> bool:
         """
         Check if user can edit a specific post.
@@ -229,15 +284,8 @@ class BackendUser(Base):
         Returns:
             True if user can edit the post
         """
-        # Admin can edit all posts
-        if self.is_admin:
-            return True
-        
-        # Authors can edit their own posts
-        if self.is_author and post.author_id == self.id:
-            return True
-        
-        return False
+        # Admin can edit all posts; authors can edit their own posts
+        return self.principal.can_edit_post(post.author_id)
     
     def can_delete_post(self, post) -> bool:
         """
@@ -250,7 +298,7 @@ class BackendUser(Base):
             True if user can delete the post
         """
         # Only admin can delete posts (safety measure)
-        return self.is_admin
+        return self.principal.can_delete_post(post.author_id)
     
     @classmethod
     def get_primary_author(cls, session) -> Optional['BackendUser']:
@@ -268,6 +316,25 @@ class BackendUser(Base):
             .filter(cls.is_active == True)\
             .first()
     
+    @classmethod
+    async def get_primary_author_async(cls, session) -> Optional['BackendUser']:
+        """
+        Async variant of get_primary_author for use with AsyncSession.
+        
+        Args:
+            session: Async database session
+            
+        Returns:
+            Primary author or None if not found
+        """
+        result = await session.execute(
+            select(cls)
+            .where(cls.is_admin == True)
+            .where(cls.is_active == True)
+            .limit(1)
+        )
+        return result.scalars().first()
+    
     def verify_password(self, password: str) -> bool:
         """
         Verify password against stored hash using bcrypt.
@@ -282,10 +349,12 @@ class BackendUser(Base):
             - Uses bcrypt for secure password comparison
             - Constant-time comparison to prevent timing attacks
             - Returns False if password_hash is not set
+            - Blocks for the full bcrypt cost; async routes should use
+              app.services.credentials instead
         """
         if not self.password_hash:
             return False
-        return pwd_context.verify(password, self.password_hash)
+        return security.verify_password(password, self.password_hash)
 
     def set_password(self, password: str) -> None:
         """
@@ -301,7 +370,9 @@ class BackendUser(Base):
             - Minimum password length: 8 characters
             - Uses bcrypt with automatic salt generation
             - Password is hashed before storage (never stored in plain text)
+            - Blocks for the full bcrypt cost; async routes should use
+              app.services.credentials instead
         """
         if len(password) < 8:
             raise ValueError("Password must be at least 8 characters long")
-        self.password_hash = pwd_context.hash(password) 
\ No newline at end of file
+        self.password_hash = security.hash_password(password) 
\ No newline at end of file
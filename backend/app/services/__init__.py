@@ -0,0 +1,3 @@
+# Services module initialization
+# 导入即注册会话事件监听（缓存失效等），保证任何写入路径都会触发
+from . import cache_invalidation, category_tree, content, counters, feeds, principals, search  # noqa: F401
@@ -0,0 +1,69 @@
+"""
+响应缓存失效
+
+会话 flush 时按写入的对象收集缓存标签，事务提交后统一失效（回滚则丢弃）：
+- Post：post:<id>、author:<author_id>（更换作者时新旧作者都失效）、posts（列表/归档/搜索/标签与作者计数）
+- Tag：tag:<id>、posts（列表中的标签名）
+- Category：category:<id>、categories、posts
+- BackendUser：author:<id>、posts
+
+绕过 ORM 的写入（浏览量写回、计数校准等）不会触发，依赖缓存 TTL 过期。
+"""
+
+from typing import Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..core.response_cache import invalidate_cache_tags
+from ..models.category import Category
+from ..models.post import Post
+from ..models.tag import Tag
+from ..models.user import BackendUser
+from .counters import old_value
+
+# 所有文章列表类响应共用的标签
+POSTS_TAG = "posts"
+CATEGORIES_TAG = "categories"
+
+
+def cache_tags_for(obj) -> Set[str]:
+    """对象变化时需要失效的缓存标签"""
+    if isinstance(obj, Post):
+        tags = {POSTS_TAG, f"post:{obj.id}"}
+        # 原作者的计数由 Core UPDATE 修改，不会出现在 session.dirty 中
+        for author_id in (obj.author_id, old_value(inspect(obj), "author_id")):
+            if author_id is not None:
+                tags.add(f"author:{author_id}")
+        return tags
+    if isinstance(obj, Tag):
+        return {POSTS_TAG, f"tag:{obj.id}"}
+    if isinstance(obj, Category):
+        return {POSTS_TAG, CATEGORIES_TAG, f"category:{obj.id}"}
+    if isinstance(obj, BackendUser):
+        return {POSTS_TAG, f"author:{obj.id}"}
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_cache_tags(session, flush_context):
+    """记录本事务写入涉及的缓存标签"""
+    tags = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        tags |= cache_tags_for(obj)
+    if tags:
+        session.info.setdefault("response_cache_tags", set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cache_tags(session):
+    """事务提交后使相关缓存失效"""
+    tags = session.info.pop("response_cache_tags", None)
+    if tags:
+        invalidate_cache_tags(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_cache_tags(session):
+    """事务回滚时丢弃标签"""
+    session.info.pop("response_cache_tags", None)
@@ -0,0 +1,244 @@
+"""
+分类树进程内缓存
+
+分类树很小却几乎在每个页面都要读取，因此整棵（启用的）分类森林以不可变快照的形式
+缓存在进程内，查询节点、子树、面包屑、文章数都只是字典访问，不产生 SQL。
+
+- 快照用两条查询构建：全部分类 + 按分类聚合的已发布文章数
+- 任何 Category / Post 写入在事务提交后使快照失效，下次读取时懒重建
+- 其它工作进程的写入无法通知到本进程，因此快照另有最长存活时间兜底
+"""
+
+import asyncio
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from ..core.database import ReadSessionLocal
+from ..models.category import Category
+from ..models.post import Post
+
+
+class CategoryNode(NamedTuple):
+    """分类树中的一个节点（不可变）"""
+
+    id: int
+    name: str
+    slug: str
+    parent_id: Optional[int]
+    sort_order: int
+    color: Optional[str]
+    icon: Optional[str]
+    depth: int
+    children: Tuple[int, ...]
+    breadcrumb: Tuple[str, ...]
+    direct_post_count: int
+    post_count: int  # 子树（含所有后代分类）中已发布文章数
+
+    def to_dict(self) -> dict:
+        """转换为可序列化的字典"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "slug": self.slug,
+            "parent_id": self.parent_id,
+            "color": self.color,
+            "icon": self.icon,
+            "depth": self.depth,
+            "breadcrumb": list(self.breadcrumb),
+            "post_count": self.post_count,
+        }
+
+
+class CategoryTree:
+    """分类森林快照，只包含启用的分类（被停用分类的后代一并隐藏）"""
+
+    def __init__(self, nodes: Dict[int, CategoryNode], roots: Tuple[int, ...]) -> None:
+        self.nodes: Mapping[int, CategoryNode] = MappingProxyType(nodes)
+        self.roots = roots
+        self.by_slug: Mapping[str, int] = MappingProxyType(
+            {node.slug: node.id for node in nodes.values()}
+        )
+        self.built_at = time.monotonic()
+
+    def get(self, category_id: int) -> Optional[CategoryNode]:
+        """按ID获取节点"""
+        return self.nodes.get(category_id)
+
+    def get_by_slug(self, slug: str) -> Optional[CategoryNode]:
+        """按 slug 获取节点"""
+        category_id = self.by_slug.get(slug)
+        return None if category_id is None else self.nodes[category_id]
+
+    def descendant_ids(self, category_id: int) -> List[int]:
+        """获取所有后代分类ID（不含自身，按层级遍历顺序）"""
+        node = self.nodes.get(category_id)
+        if node is None:
+            return []
+        result: List[int] = []
+        queue = list(node.children)
+        while queue:
+            child_id = queue.pop(0)
+            result.append(child_id)
+            queue.extend(self.nodes[child_id].children)
+        return result
+
+    def as_nested(self) -> List[dict]:
+        """转换为嵌套结构（供 API 返回）"""
+        def build(category_id: int) -> dict:
+            node = self.nodes[category_id]
+            data = node.to_dict()
+            data["children"] = [build(child_id) for child_id in node.children]
+            return data
+
+        return [build(root_id) for root_id in self.roots]
+
+
+def build_category_tree(session) -> CategoryTree:
+    """从数据库构建分类树快照（两条查询）"""
+    rows = session.execute(
+        select(
+            Category.id, Category.name, Category.slug, Category.parent_id,
+            Category.sort_order, Category.color, Category.icon, Category.is_active,
+        )
+    ).all()
+    direct_counts = dict(
+        session.execute(
+            select(Post.category_id, func.count(Post.id))
+            .where(Post.is_published == True)
+            .where(Post.category_id.is_not(None))
+            .group_by(Post.category_id)
+        ).all()
+    )
+
+    by_id = {row.id: row for row in rows}
+    children: Dict[Optional[int], List] = {}
+    for row in rows:
+        # 父分类缺失时视为根分类
+        parent_id = row.parent_id if row.parent_id in by_id else None
+        children.setdefault(parent_id, []).append(row)
+    for siblings in children.values():
+        siblings.sort(key=lambda row: (row.sort_order, row.id))
+
+    # 子树文章数覆盖全部后代（与 Category.post_count 一致）
+    subtree_counts: Dict[int, int] = {}
+
+    def count_subtree(category_id: int, seen: frozenset) -> int:
+        total = direct_counts.get(category_id, 0)
+        for child in children.get(category_id, []):
+            if child.id not in seen:
+                total += count_subtree(child.id, seen | {child.id})
+        subtree_counts[category_id] = total
+        return total
+
+    for root in children.get(None, []):
+        count_subtree(root.id, frozenset({root.id}))
+
+    nodes: Dict[int, CategoryNode] = {}
+
+    def add_active(row, depth: int, breadcrumb: Tuple[str, ...]) -> None:
+        crumbs = breadcrumb + (row.name,)
+        active_children = [child for child in children.get(row.id, []) if child.is_active]
+        nodes[row.id] = CategoryNode(
+            id=row.id,
+            name=row.name,
+            slug=row.slug,
+            parent_id=row.parent_id,
+            sort_order=row.sort_order,
+            color=row.color,
+            icon=row.icon,
+            depth=depth,
+            children=tuple(child.id for child in active_children),
+            breadcrumb=crumbs,
+            direct_post_count=direct_counts.get(row.id, 0),
+            post_count=subtree_counts.get(row.id, 0),
+        )
+        for child in active_children:
+            if child.id not in nodes:
+                add_active(child, depth + 1, crumbs)
+
+    roots = [row for row in children.get(None, []) if row.is_active]
+    for root in roots:
+        add_active(root, 0, ())
+
+    return CategoryTree(nodes, tuple(root.id for root in roots))
+
+
+class CategoryTreeCache:
+    """
+    线程安全的分类树快照缓存
+
+    Args:
+        max_age: 快照最长存活秒数（跨进程写入的兜底失效）
+    """
+
+    def __init__(self, max_age: float = 300.0) -> None:
+        self._max_age = max_age
+        self._snapshot: Optional[CategoryTree] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> CategoryTree:
+        """获取当前快照，必要时重建"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.built_at < self._max_age:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - snapshot.built_at < self._max_age:
+                return snapshot
+            generation = self._generation
+            with ReadSessionLocal() as db:
+                snapshot = build_category_tree(db)
+            # 构建期间发生失效时不缓存这个可能过期的快照
+            if generation == self._generation:
+                self._snapshot = snapshot
+            return snapshot
+
+    async def get_async(self) -> CategoryTree:
+        """在事件循环中获取快照；需要重建时放到线程中执行"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.built_at < self._max_age:
+            return snapshot
+        return await asyncio.to_thread(self.get)
+
+    def invalidate(self) -> None:
+        """使当前快照失效"""
+        self._generation += 1
+        self._snapshot = None
+
+
+# 全局分类树缓存实例
+category_tree_cache = CategoryTreeCache()
+
+
+# --- 会话事件：提交涉及分类/文章的写入后使缓存失效 ---
+
+_TREE_MODELS = (Category, Post)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_category_tree_dirty(session, flush_context):
+    """记录本事务是否写入了分类或文章"""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _TREE_MODELS):
+            session.info["category_tree_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_category_tree(session):
+    """事务提交后使分类树快照失效"""
+    if session.info.pop("category_tree_dirty", False):
+        category_tree_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_category_tree_flag(session):
+    """事务回滚时丢弃标记"""
+    session.info.pop("category_tree_dirty", None)
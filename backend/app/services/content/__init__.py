@@ -0,0 +1,21 @@
+"""
+文章内容处理：TipTap JSON / Markdown 渲染与派生内容流水线
+"""
+
+from .markdown_renderer import markdown_hash, render_markdown
+from .pipeline import derive_post_content, render_source, render_stale_posts, source_hash
+from .renderer import RENDERER_VERSION, content_hash, render_cache, render_html, safe_url
+
+__all__ = [
+    "RENDERER_VERSION",
+    "content_hash",
+    "derive_post_content",
+    "markdown_hash",
+    "render_cache",
+    "render_html",
+    "render_markdown",
+    "render_source",
+    "render_stale_posts",
+    "safe_url",
+    "source_hash",
+]
@@ -0,0 +1,194 @@
+"""
+单次遍历的正文分析器：阅读时间与自动摘要
+
+- 中文（CJK）按字符计数，拉丁文字按单词计数，分别按各自的阅读速度估算阅读时间
+- 摘要在扫描过程中顺带生成，达到长度上限后不再收集（计数继续）
+- Markdown 中的代码块只计入阅读量，不进入摘要；链接/图片地址直接跳过
+
+输入可以是 Markdown 文本（analyze_markdown）或 TipTap JSON（analyze_document）。
+"""
+
+import math
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# 阅读速度
+LATIN_WORDS_PER_MINUTE = 200
+CJK_CHARS_PER_MINUTE = 400
+
+DEFAULT_EXCERPT_LENGTH = 160
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+
+# 正文扫描：CJK 连续文本 | 拉丁单词 | 空白 | 其它单个字符
+_TEXT_TOKEN = re.compile(rf"([{_CJK}]+)|([^\W{_CJK}]+)|(\s+)|(.)", re.S)
+
+# Markdown 中需要单独处理的片段：代码块 | 图片 | 链接地址
+_MARKDOWN_SPECIAL = re.compile(
+    r"(^ {0,3}(?:```|~~~).*?(?:^ {0,3}(?:```|~~~)[^\n]*$|\Z))"
+    r"|(!\[[^\]]*\]\([^)]*\))"
+    r"|(\]\([^)]*\))",
+    re.S | re.M,
+)
+
+# 不进入摘要的 Markdown 标记字符
+_MARKUP_CHARS = frozenset("#*_`[]()>~|")
+
+# TipTap 中的块级节点（前后视为空白）
+_BLOCK_NODES = frozenset({
+    "paragraph", "heading", "blockquote", "listItem", "taskItem",
+    "tableCell", "tableHeader", "hardBreak", "horizontalRule",
+})
+
+
+class ContentAnalysis(NamedTuple):
+    """正文分析结果"""
+
+    cjk_characters: int
+    latin_words: int
+    reading_time_minutes: int
+    excerpt: str
+
+
+class ContentAnalyzer:
+    """
+    流式分析器：多次 feed() 文本片段，最后调用 result()
+
+    Args:
+        excerpt_length: 摘要最大长度（字符）
+    """
+
+    def __init__(self, excerpt_length: int = DEFAULT_EXCERPT_LENGTH) -> None:
+        self._excerpt_length = excerpt_length
+        self._excerpt: List[str] = []
+        self._excerpt_size = 0
+        self._excerpt_truncated = False
+        self._pending_space = False
+        self.cjk_characters = 0
+        self.latin_words = 0
+
+    def _append(self, text: str) -> None:
+        """向摘要追加文本，超出上限时截断并停止收集"""
+        if self._pending_space and self._excerpt:
+            self._excerpt.append(" ")
+            self._excerpt_size += 1
+        self._pending_space = False
+
+        remaining = self._excerpt_length - self._excerpt_size
+        if len(text) <= remaining:
+            self._excerpt.append(text)
+            self._excerpt_size += len(text)
+            return
+        self._excerpt.append(text[:max(remaining, 0)])
+        self._excerpt_size = self._excerpt_length
+        self._excerpt_truncated = True
+
+    def feed(self, text: Optional[str], excerpt: bool = True) -> None:
+        """
+        扫描一段文本
+
+        Args:
+            text: 文本片段
+            excerpt: 是否计入摘要（代码块等传 False）
+        """
+        if not text:
+            return
+        collect = excerpt and not self._excerpt_truncated
+        for match in _TEXT_TOKEN.finditer(text):
+            cjk, word, space, other = match.groups()
+            if cjk:
+                self.cjk_characters += len(cjk)
+            elif word:
+                self.latin_words += 1
+            if not collect:
+                continue
+
+            if space:
+                self._pending_space = True
+            elif other and other in _MARKUP_CHARS:
+                continue
+            else:
+                self._append(match.group(0))
+                collect = not self._excerpt_truncated
+
+    def separate(self) -> None:
+        """标记一个块边界（摘要中以空格分隔）"""
+        self._pending_space = True
+
+    def result(self) -> ContentAnalysis:
+        """汇总分析结果"""
+        minutes = (
+            self.latin_words / LATIN_WORDS_PER_MINUTE
+            + self.cjk_characters / CJK_CHARS_PER_MINUTE
+        )
+        reading_time = max(1, math.ceil(minutes)) if minutes else 0
+
+        excerpt = "".join(self._excerpt).strip()
+        if self._excerpt_truncated:
+            # 尽量在单词边界处截断
+            last_space = excerpt.rfind(" ")
+            if last_space > self._excerpt_length * 0.8:
+                excerpt = excerpt[:last_space]
+            excerpt = excerpt.rstrip() + "..."
+        return ContentAnalysis(self.cjk_characters, self.latin_words, reading_time, excerpt)
+
+
+def analyze_markdown(markdown: Optional[str], excerpt_length: int = DEFAULT_EXCERPT_LENGTH) -> ContentAnalysis:
+    """
+    单次扫描 Markdown 正文
+
+    Args:
+        markdown: Markdown 文本
+        excerpt_length: 摘要最大长度
+
+    Returns:
+        ContentAnalysis
+    """
+    analyzer = ContentAnalyzer(excerpt_length)
+    if not markdown:
+        return analyzer.result()
+
+    position = 0
+    for match in _MARKDOWN_SPECIAL.finditer(markdown):
+        analyzer.feed(markdown[position:match.start()])
+        code, image, _ = match.groups()
+        if code:
+            analyzer.feed(code, excerpt=False)
+            analyzer.separate()
+        elif image:
+            analyzer.separate()
+        position = match.end()
+    analyzer.feed(markdown[position:])
+    return analyzer.result()
+
+
+def analyze_document(doc: Optional[Dict[str, Any]], excerpt_length: int = DEFAULT_EXCERPT_LENGTH) -> ContentAnalysis:
+    """
+    单次遍历 TipTap JSON 文档
+
+    Args:
+        doc: ProseMirror JSON
+        excerpt_length: 摘要最大长度
+
+    Returns:
+        ContentAnalysis
+    """
+    analyzer = ContentAnalyzer(excerpt_length)
+    stack: List[Any] = [(doc, False)]
+    while stack:
+        node, in_code = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        node_type = node.get("type")
+        if node_type == "text":
+            text = node.get("text")
+            analyzer.feed(text if isinstance(text, str) else None, excerpt=not in_code)
+            continue
+        if node_type in _BLOCK_NODES or node_type == "codeBlock":
+            analyzer.separate()
+
+        children = node.get("content")
+        if isinstance(children, list):
+            in_code = in_code or node_type == "codeBlock"
+            stack.extend((child, in_code) for child in reversed(children))
+    return analyzer.result()
@@ -0,0 +1,205 @@
+"""
+Markdown -> 安全 HTML 渲染器（没有 content_json 的文章，例如批量导入的 Markdown）
+
+- 先用 markdown 库转换为 HTML，再用白名单清洗器单次扫描输出：
+  只保留 TipTap 渲染器（renderer.py）同样会输出的标签与属性，文本与属性值一律转义，
+  链接/图片地址复用 safe_url 校验；script/style 等标签连同内容一起丢弃，其它未知标签只保留文本
+- 标题带有与目录一致的锚点 id（同一个 AnchorGenerator）
+- 扫描时顺带生成目录与结构统计，结果与 extract_outline 的格式一致
+"""
+
+import hashlib
+import html
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import markdown
+
+from .outline import AnchorGenerator, DocumentOutline
+from .renderer import CODE_LANGUAGE, IMAGE_SCHEMES, RENDERER_VERSION, URL_SCHEME, html_attr, int_attr, safe_url
+
+MARKDOWN_EXTENSIONS = ("fenced_code", "tables", "sane_lists")
+
+# 原样保留（不带属性）的标签；b/i/del 统一为 TipTap 渲染器使用的标签
+_PLAIN_TAGS = {
+    "p": "p", "blockquote": "blockquote", "ul": "ul", "li": "li", "pre": "pre",
+    "table": "table", "thead": "thead", "tbody": "tbody", "tr": "tr",
+    "strong": "strong", "b": "strong", "em": "em", "i": "em", "s": "s", "del": "s",
+    "u": "u", "mark": "mark", "sub": "sub", "sup": "sup",
+}
+
+# 连同内容一起丢弃的标签
+_DROPPED_TAGS = frozenset({
+    "script", "style", "template", "iframe", "object", "embed",
+    "noscript", "textarea", "title", "svg", "math",
+})
+
+_HEADINGS = {f"h{level}": level for level in range(1, 7)}
+_CODE_CLASS = re.compile(r"^language-(\S+)$")
+
+
+def markdown_hash(source: str) -> str:
+    """计算 Markdown 正文的内容哈希（原文 + 渲染器版本）"""
+    return hashlib.sha256(f"v{RENDERER_VERSION}:markdown:{source}".encode("utf-8")).hexdigest()
+
+
+class MarkdownRendering(NamedTuple):
+    """Markdown 渲染结果"""
+
+    html: str
+    outline: DocumentOutline
+
+
+class _Sanitizer(HTMLParser):
+    """白名单 HTML 清洗器，同时收集目录与统计"""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.output: List[str] = []
+        self.toc: List[Dict[str, Any]] = []
+        self.stats = {"characters": 0, "headings": 0, "images": 0, "code_blocks": 0, "tables": 0, "links": 0}
+        self._anchors = AnchorGenerator()
+        # 已输出、尚未关闭的标签：(源标签, 结束标签)
+        self._open: List[Tuple[str, str]] = []
+        self._dropping: Optional[str] = None
+        self._drop_depth = 0
+        self._in_pre = 0
+        # 当前标题：(输出位置, 级别, 文本片段)
+        self._heading: Optional[Tuple[int, int, List[str]]] = None
+
+    def _push(self, tag: str, open_tag: str, close_tag: str) -> None:
+        self.output.append(open_tag)
+        self._open.append((tag, close_tag))
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._dropping is not None:
+            if tag == self._dropping:
+                self._drop_depth += 1
+            return
+        if tag in _DROPPED_TAGS:
+            self._dropping, self._drop_depth = tag, 1
+            return
+
+        values = {name: value for name, value in attrs if value is not None}
+        if tag in _PLAIN_TAGS:
+            mapped = _PLAIN_TAGS[tag]
+            if tag == "pre":
+                self._in_pre += 1
+                self.stats["code_blocks"] += 1
+            elif tag == "table":
+                self.stats["tables"] += 1
+            self._push(tag, f"<{mapped}>", f"</{mapped}>")
+        elif tag == "ol":
+            start = int_attr(values, "start", 1, -(2 ** 31), 2 ** 31 - 1)
+            self._push(tag, "<ol>" if start == 1 else f'<ol start="{start}">', "</ol>")
+        elif tag in ("th", "td"):
+            extra = ""
+            for key in ("colspan", "rowspan"):
+                span = int_attr(values, key, 1, 1, 1000)
+                if span > 1:
+                    extra += f' {key}="{span}"'
+            self._push(tag, f"<{tag}{extra}>", f"</{tag}>")
+        elif tag == "code":
+            match = _CODE_CLASS.match(values.get("class", ""))
+            if self._in_pre and match and CODE_LANGUAGE.match(match.group(1)):
+                self._push(tag, f'<code class="language-{match.group(1)}">', "</code>")
+            else:
+                self._push(tag, "<code>", "</code>")
+        elif tag == "a":
+            href = safe_url(values.get("href"))
+            if href is None:
+                return
+            open_tag = "<a" + html_attr("href", href)
+            if URL_SCHEME.match(href):
+                open_tag += ' rel="noopener noreferrer nofollow"'
+            self.stats["links"] += 1
+            self._push(tag, open_tag + ">", "</a>")
+        elif tag in _HEADINGS and self._heading is None:
+            level = _HEADINGS[tag]
+            self.stats["headings"] += 1
+            self._heading = (len(self.output), level, [])
+            self._push(tag, "", f"</h{level}>")
+        else:
+            self._void(tag, values)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._dropping is None and tag not in _DROPPED_TAGS:
+            self._void(tag, {name: value for name, value in attrs if value is not None})
+
+    def _void(self, tag: str, values: Dict[str, str]) -> None:
+        if tag == "br":
+            self.output.append("<br>")
+            if self._heading is not None:
+                self._heading[2].append(" ")
+        elif tag == "hr":
+            self.output.append("<hr>")
+        elif tag == "img":
+            src = safe_url(values.get("src"), IMAGE_SCHEMES)
+            if src is None:
+                return
+            self.stats["images"] += 1
+            output = "<img" + html_attr("src", src) + html_attr("alt", values.get("alt") or "")
+            if values.get("title"):
+                output += html_attr("title", values["title"])
+            self.output.append(output + ' loading="lazy">')
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._dropping is not None:
+            if tag == self._dropping:
+                self._drop_depth -= 1
+                if not self._drop_depth:
+                    self._dropping = None
+            return
+        # 忽略没有对应开始标签的结束标签；否则关闭到匹配的标签为止
+        if not any(open_tag == tag for open_tag, _ in self._open):
+            return
+        while self._open:
+            open_tag, close_tag = self._open.pop()
+            self._close(open_tag, close_tag)
+            if open_tag == tag:
+                break
+
+    def _close(self, tag: str, close_tag: str) -> None:
+        if tag == "pre":
+            self._in_pre -= 1
+        elif tag in _HEADINGS and self._heading is not None:
+            position, level, parts = self._heading
+            self._heading = None
+            text = " ".join("".join(parts).split())
+            anchor = self._anchors(text)
+            self.output[position] = f"<h{level}" + html_attr("id", anchor) + ">"
+            self.toc.append({"level": level, "text": text, "anchor": anchor})
+        self.output.append(close_tag)
+
+    def handle_data(self, data: str) -> None:
+        if self._dropping is not None:
+            return
+        # 块级标签之间的换行不计入字符数
+        if self._in_pre or data.strip():
+            self.stats["characters"] += len(data)
+        if self._heading is not None:
+            self._heading[2].append(data)
+        self.output.append(html.escape(data, quote=False))
+
+    def finish(self) -> MarkdownRendering:
+        self.close()
+        while self._open:
+            self._close(*self._open.pop())
+        return MarkdownRendering("".join(self.output), DocumentOutline(self.toc, self.stats))
+
+
+def render_markdown(source: Optional[str]) -> MarkdownRendering:
+    """
+    把 Markdown 正文渲染为安全 HTML，并提取目录与结构统计
+
+    Args:
+        source: Markdown 文本
+
+    Returns:
+        MarkdownRendering
+    """
+    sanitizer = _Sanitizer()
+    if source:
+        sanitizer.feed(markdown.markdown(source, extensions=list(MARKDOWN_EXTENSIONS)))
+    return sanitizer.finish()
@@ -0,0 +1,143 @@
+"""
+文章大纲提取：目录（TOC）、标题锚点与结构统计
+
+对 content_json 做一次迭代遍历，得到：
+- toc: [{"level": 2, "text": "标题", "anchor": "标题"}, ...]
+- stats: 字符数、标题/图片/代码块/表格/链接数量
+
+锚点由标题文本生成，重复时追加 -2、-3…；渲染器为 <h*> 生成 id 时使用同一规则，
+因此目录中的 anchor 与 HTML 中的 id 一一对应。
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+_ANCHOR_STRIP = re.compile(r"[^\w\s-]")
+_ANCHOR_SPACES = re.compile(r"[\s_-]+")
+
+# 锚点最大长度（字符）
+MAX_ANCHOR_LENGTH = 64
+
+Node = Dict[str, Any]
+
+
+class AnchorGenerator:
+    """为同一文档中的标题生成唯一、稳定的锚点"""
+
+    def __init__(self) -> None:
+        self._used: Dict[str, int] = {}
+
+    def __call__(self, text: str) -> str:
+        anchor = _ANCHOR_SPACES.sub("-", _ANCHOR_STRIP.sub("", text.lower())).strip("-")
+        anchor = anchor[:MAX_ANCHOR_LENGTH].rstrip("-") or "section"
+
+        count = self._used.get(anchor, 0) + 1
+        self._used[anchor] = count
+        if count == 1:
+            return anchor
+        # 避免 "a-2" 与生成的第二个 "a" 冲突
+        candidate = f"{anchor}-{count}"
+        while candidate in self._used:
+            count += 1
+            candidate = f"{anchor}-{count}"
+        self._used[anchor] = count
+        self._used[candidate] = 1
+        return candidate
+
+
+def node_text(node: Node) -> str:
+    """拼接节点下所有文本（换行节点视为空格）"""
+    parts: List[str] = []
+    stack: List[Any] = [node]
+    while stack:
+        item = stack.pop()
+        if not isinstance(item, dict):
+            continue
+        if item.get("type") == "text":
+            text = item.get("text")
+            if isinstance(text, str):
+                parts.append(text)
+        elif item.get("type") == "hardBreak":
+            parts.append(" ")
+        children = item.get("content")
+        if isinstance(children, list):
+            stack.extend(reversed(children))
+    return " ".join("".join(parts).split())
+
+
+def heading_level(attrs: Any) -> int:
+    """标题级别（限制在 1-6）"""
+    try:
+        level = int(attrs.get("level", 2)) if isinstance(attrs, dict) else 2
+    except (TypeError, ValueError):
+        return 2
+    return min(max(level, 1), 6)
+
+
+class DocumentOutline(NamedTuple):
+    """文档大纲"""
+
+    toc: List[Dict[str, Any]]
+    stats: Dict[str, int]
+
+
+# 需要统计数量的节点类型 -> 统计字段
+_COUNTED_NODES = {
+    "heading": "headings",
+    "image": "images",
+    "codeBlock": "code_blocks",
+    "table": "tables",
+}
+
+
+def extract_outline(doc: Optional[Node]) -> DocumentOutline:
+    """
+    单次遍历文档，提取目录与结构统计
+
+    Args:
+        doc: ProseMirror JSON
+
+    Returns:
+        DocumentOutline
+    """
+    stats = {"characters": 0, "headings": 0, "images": 0, "code_blocks": 0, "tables": 0, "links": 0}
+    toc: List[Dict[str, Any]] = []
+    if not isinstance(doc, dict):
+        return DocumentOutline(toc, stats)
+
+    anchors = AnchorGenerator()
+    stack: List[Any] = [doc]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        node_type = node.get("type")
+
+        if node_type == "text":
+            text = node.get("text")
+            if isinstance(text, str):
+                stats["characters"] += len(text)
+            marks = node.get("marks")
+            if isinstance(marks, list) and any(
+                isinstance(mark, dict) and mark.get("type") == "link" for mark in marks
+            ):
+                stats["links"] += 1
+            continue
+
+        counter = _COUNTED_NODES.get(node_type)
+        if counter is not None:
+            stats[counter] += 1
+
+        if node_type == "heading":
+            text = node_text(node)
+            toc.append({
+                "level": heading_level(node.get("attrs")),
+                "text": text,
+                "anchor": anchors(text),
+            })
+
+        children = node.get("content")
+        if isinstance(children, list):
+            stack.extend(reversed(children))
+
+    return DocumentOutline(toc, stats)
@@ -0,0 +1,176 @@
+"""
+文章内容派生流水线
+
+在会话 flush 之前，为新建或内容有变化的文章遍历 content_json，
+把结果写入 PostDerivedContent，读取时不再解析文档树：
+
+- 目录与结构统计：每次保存（包括草稿）都会更新
+- 阅读时间与自动摘要：正文变化时单次扫描得到，写回 Post.reading_time_minutes / excerpt；
+  手动填写的摘要不会被覆盖（content_stats["auto_excerpt"] 记录摘要来源）
+- HTML：只在发布时（或已发布文章的内容被修改时）渲染，草稿不渲染
+- 以内容哈希判断是否需要重新生成；哈希中包含渲染器版本
+- 没有 content_json 的文章（例如批量导入的 Markdown）以 content_markdown 为来源：
+  经 markdown 库与白名单清洗器渲染，哈希按 Markdown 原文计算
+- 绕过 ORM 的批量写入不会触发事件，之后应运行 render-posts 命令补齐
+"""
+
+from typing import Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, selectinload, undefer_group
+
+from ...models.post import CONTENT_GROUP, Post
+from ...models.post_derived import PostDerivedContent
+from .analyzer import analyze_document, analyze_markdown
+from .markdown_renderer import markdown_hash, render_markdown
+from .outline import extract_outline
+from .renderer import content_hash, render_cache
+
+
+# 变化时需要重新派生的文章字段
+_SOURCE_FIELDS = ("content_json", "content_markdown", "excerpt", "is_published")
+
+
+def _needs_derive(session, post: Post) -> bool:
+    """文章是否需要（重新）生成派生内容"""
+    if post in session.new:
+        return True
+    state = inspect(post)
+    return any(state.attrs[key].history.has_changes() for key in _SOURCE_FIELDS)
+
+
+def _apply_text_analysis(post: Post, derived: PostDerivedContent) -> None:
+    """扫描正文，写回阅读时间与自动摘要"""
+    if post.content_markdown:
+        analysis = analyze_markdown(post.content_markdown)
+    else:
+        analysis = analyze_document(post.content_json)
+
+    stats = dict(derived.content_stats or {})
+    excerpt_history = inspect(post).attrs.excerpt.history
+    if excerpt_history.has_changes() and post.excerpt:
+        # 本次保存中手动填写了摘要
+        auto_excerpt = False
+    elif not post.excerpt or stats.get("auto_excerpt"):
+        post.excerpt = analysis.excerpt or None
+        auto_excerpt = True
+    else:
+        auto_excerpt = False
+
+    post.reading_time_minutes = analysis.reading_time_minutes
+    stats.update(
+        cjk_characters=analysis.cjk_characters,
+        latin_words=analysis.latin_words,
+        auto_excerpt=auto_excerpt,
+    )
+    derived.content_stats = stats
+
+
+def _markdown_source(post: Post) -> Optional[str]:
+    """没有 content_json 时以 Markdown 正文为渲染来源"""
+    return post.content_markdown if post.content_json is None else None
+
+
+def source_hash(content_json, content_markdown: Optional[str]) -> str:
+    """文章正文的内容哈希（TipTap JSON 优先，否则为 Markdown 原文）"""
+    if content_json is None and content_markdown is not None:
+        return markdown_hash(content_markdown)
+    return content_hash(content_json)
+
+
+def render_source(content_json, content_markdown: Optional[str], digest: Optional[str] = None) -> str:
+    """渲染文章正文为安全 HTML（与 source_hash 使用同一来源）"""
+    if content_json is None and content_markdown is not None:
+        return render_markdown(content_markdown).html
+    return render_cache.render(content_json, digest)[1]
+
+
+def derive_post_content(post: Post) -> PostDerivedContent:
+    """
+    为文章生成（或刷新）派生内容
+
+    Args:
+        post: 文章对象（需在会话中）
+
+    Returns:
+        文章的 PostDerivedContent
+    """
+    derived: Optional[PostDerivedContent] = post.derived
+    if derived is None:
+        derived = post.derived = PostDerivedContent()
+
+    markdown_source = _markdown_source(post)
+    digest = source_hash(post.content_json, post.content_markdown)
+    if derived.content_hash != digest:
+        rendered: Optional[str] = None
+        if markdown_source is not None:
+            # Markdown 的目录与统计在渲染时顺带得到
+            rendered, outline = render_markdown(markdown_source)
+        else:
+            outline = extract_outline(post.content_json)
+        derived.toc = outline.toc
+        derived.content_stats = {**(derived.content_stats or {}), **outline.stats}
+        # 旧的 HTML 已经过期；草稿不保留，发布时再渲染
+        derived.content_html = rendered if post.is_published else None
+        derived.content_hash = digest
+
+    if post.is_published and derived.content_html is None:
+        derived.content_html = render_source(post.content_json, post.content_markdown, digest)
+
+    _apply_text_analysis(post, derived)
+    return derived
+
+
+def _is_stale(post: Post) -> bool:
+    derived = post.derived
+    return (
+        derived is None
+        or derived.content_hash != source_hash(post.content_json, post.content_markdown)
+        or (post.is_published and derived.content_html is None)
+        or post.reading_time_minutes is None
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _derive_changed_posts(session, flush_context, instances):
+    """flush 前为新建/修改/发布的文章生成派生内容"""
+    posts = [
+        obj for obj in (*session.new, *session.dirty)
+        if isinstance(obj, Post) and _needs_derive(session, obj)
+    ]
+    if not posts:
+        return
+    with session.no_autoflush:
+        for post in posts:
+            derive_post_content(post)
+
+
+def render_stale_posts(session, batch_size: int = 100) -> int:
+    """
+    为派生内容缺失或过期的文章重新生成（已发布文章同时渲染 HTML）
+
+    Args:
+        session: 数据库会话（由调用方提交）
+        batch_size: 每批加载的文章数
+
+    Returns:
+        更新的文章数
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        posts = session.scalars(
+            select(Post)
+            .options(undefer_group(CONTENT_GROUP), selectinload(Post.derived))
+            .where(Post.id > last_id)
+            .order_by(Post.id)
+            .limit(batch_size)
+        ).all()
+        if not posts:
+            return updated
+        for post in posts:
+            if _is_stale(post):
+                derive_post_content(post)
+                updated += 1
+        last_id = posts[-1].id
+        session.flush()
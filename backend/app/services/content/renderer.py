@@ -0,0 +1,294 @@
+"""
+TipTap (ProseMirror) JSON -> 安全 HTML 渲染器
+
+- 使用显式栈单次遍历文档树，不递归，深层嵌套的文档也不会触发递归上限
+- 只输出白名单内的标签与属性：文本与属性值一律转义，链接/图片地址只允许安全协议
+- 标题带有与目录一致的锚点 id（见 outline.py）
+- 渲染结果按内容哈希缓存在进程内（LRU），同一份 JSON 重复渲染不再遍历
+"""
+
+import hashlib
+import html
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .outline import AnchorGenerator, heading_level, node_text
+
+# 渲染规则变化时递增，使已存储的渲染结果失效
+RENDERER_VERSION = 2
+
+URL_SCHEME = re.compile(r"^\s*([a-zA-Z][a-zA-Z0-9+.\-]*):")
+_CONTROL_CHARS = re.compile(r"[\x00-\x20\x7f]")
+CODE_LANGUAGE = re.compile(r"^[\w+#.\-]{1,32}$")
+
+LINK_SCHEMES = frozenset({"http", "https", "mailto", "tel"})
+IMAGE_SCHEMES = frozenset({"http", "https"})
+
+Node = Dict[str, Any]
+
+
+def content_hash(doc: Optional[Node]) -> str:
+    """计算文档内容哈希（规范化 JSON + 渲染器版本）"""
+    canonical = json.dumps(doc, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"v{RENDERER_VERSION}:{canonical}".encode("utf-8")).hexdigest()
+
+
+def safe_url(url: Any, schemes: frozenset = LINK_SCHEMES) -> Optional[str]:
+    """
+    校验链接地址
+
+    Returns:
+        允许的地址（相对路径、锚点或白名单协议），否则 None
+    """
+    if not isinstance(url, str):
+        return None
+    url = url.strip()
+    if not url:
+        return None
+    # 浏览器会忽略协议中的空白与控制字符（如 "java\\tscript:"），先去掉再判断
+    match = URL_SCHEME.match(_CONTROL_CHARS.sub("", url))
+    if match and match.group(1).lower() not in schemes:
+        return None
+    return url
+
+
+def html_attr(name: str, value: Any) -> str:
+    """输出转义后的属性（带前导空格）"""
+    return f' {name}="{html.escape(str(value), quote=True)}"'
+
+
+def int_attr(attrs: Dict[str, Any], key: str, default: int, low: int, high: int) -> int:
+    """读取整数属性并限制在 [low, high]，无效时返回默认值"""
+    try:
+        value = int(attrs.get(key, default))
+    except (TypeError, ValueError):
+        return default
+    return min(max(value, low), high)
+
+
+# --- 节点 ---
+
+def _simple(tag: str) -> Callable[[Dict[str, Any]], Tuple[str, str]]:
+    return lambda attrs: (f"<{tag}>", f"</{tag}>")
+
+
+def _ordered_list(attrs: Dict[str, Any]) -> Tuple[str, str]:
+    start = int_attr(attrs, "start", 1, -(2 ** 31), 2 ** 31 - 1)
+    return ("<ol>" if start == 1 else f'<ol start="{start}">'), "</ol>"
+
+
+def _code_block(attrs: Dict[str, Any]) -> Tuple[str, str]:
+    language = attrs.get("language")
+    if isinstance(language, str) and CODE_LANGUAGE.match(language):
+        return f'<pre><code class="language-{language}">', "</code></pre>"
+    return "<pre><code>", "</code></pre>"
+
+
+def _task_item(attrs: Dict[str, Any]) -> Tuple[str, str]:
+    checked = " checked" if attrs.get("checked") is True else ""
+    return (
+        f'<li data-type="taskItem"><input type="checkbox" disabled{checked}><div>',
+        "</div></li>",
+    )
+
+
+def _table_cell(tag: str) -> Callable[[Dict[str, Any]], Tuple[str, str]]:
+    def render(attrs: Dict[str, Any]) -> Tuple[str, str]:
+        extra = ""
+        for key in ("colspan", "rowspan"):
+            span = int_attr(attrs, key, 1, 1, 1000)
+            if span > 1:
+                extra += f' {key}="{span}"'
+        return f"<{tag}{extra}>", f"</{tag}>"
+
+    return render
+
+
+def _image(attrs: Dict[str, Any]) -> str:
+    src = safe_url(attrs.get("src"), IMAGE_SCHEMES)
+    if src is None:
+        return ""
+    output = "<img" + html_attr("src", src) + html_attr("alt", attrs.get("alt") or "")
+    if attrs.get("title"):
+        output += html_attr("title", attrs["title"])
+    return output + ' loading="lazy">'
+
+
+# 容器节点：返回（开始标签，结束标签）
+BLOCK_RENDERERS: Dict[str, Callable[[Dict[str, Any]], Tuple[str, str]]] = {
+    "paragraph": _simple("p"),
+    "blockquote": _simple("blockquote"),
+    "bulletList": _simple("ul"),
+    "orderedList": _ordered_list,
+    "listItem": _simple("li"),
+    "taskList": lambda attrs: ('<ul data-type="taskList">', "</ul>"),
+    "taskItem": _task_item,
+    "codeBlock": _code_block,
+    "table": lambda attrs: ("<table><tbody>", "</tbody></table>"),
+    "tableRow": _simple("tr"),
+    "tableHeader": _table_cell("th"),
+    "tableCell": _table_cell("td"),
+}
+
+# 叶子节点：直接输出
+LEAF_RENDERERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "hardBreak": lambda attrs: "<br>",
+    "horizontalRule": lambda attrs: "<hr>",
+    "image": _image,
+}
+
+
+# --- 文本标记 ---
+
+def _link(attrs: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    href = safe_url(attrs.get("href"))
+    if href is None:
+        return None
+    output = "<a" + html_attr("href", href)
+    if attrs.get("target") == "_blank":
+        output += ' target="_blank"'
+    if URL_SCHEME.match(href):
+        output += ' rel="noopener noreferrer nofollow"'
+    return output + ">", "</a>"
+
+
+MARK_RENDERERS: Dict[str, Callable[[Dict[str, Any]], Optional[Tuple[str, str]]]] = {
+    "bold": _simple("strong"),
+    "italic": _simple("em"),
+    "strike": _simple("s"),
+    "underline": _simple("u"),
+    "code": _simple("code"),
+    "highlight": _simple("mark"),
+    "subscript": _simple("sub"),
+    "superscript": _simple("sup"),
+    "link": _link,
+}
+
+
+def _render_text(node: Node) -> str:
+    text = node.get("text")
+    if not isinstance(text, str):
+        return ""
+    output = html.escape(text, quote=False)
+    marks = node.get("marks")
+    if not isinstance(marks, list):
+        return output
+    # 第一个标记在最外层
+    for mark in reversed(marks):
+        if not isinstance(mark, dict):
+            continue
+        renderer = MARK_RENDERERS.get(mark.get("type"))
+        tags = renderer(mark.get("attrs") or {}) if renderer else None
+        if tags:
+            output = tags[0] + output + tags[1]
+    return output
+
+
+def render_html(doc: Optional[Node]) -> str:
+    """
+    把 TipTap JSON 文档渲染为安全 HTML（单次迭代遍历）
+
+    未知节点只渲染其子节点，未知标记被忽略。
+
+    Args:
+        doc: ProseMirror JSON（通常以 {"type": "doc"} 为根）
+
+    Returns:
+        HTML 字符串
+    """
+    if not isinstance(doc, dict):
+        return ""
+
+    output: List[str] = []
+    anchors = AnchorGenerator()
+    # 栈中为待处理节点或待输出的结束标签
+    stack: List[Union[Node, str]] = [doc]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            output.append(item)
+            continue
+        if not isinstance(item, dict):
+            continue
+
+        node_type = item.get("type")
+        if node_type == "text":
+            output.append(_render_text(item))
+            continue
+
+        attrs = item.get("attrs")
+        if not isinstance(attrs, dict):
+            attrs = {}
+
+        leaf = LEAF_RENDERERS.get(node_type)
+        if leaf is not None:
+            output.append(leaf(attrs))
+            continue
+
+        if node_type == "heading":
+            level = heading_level(attrs)
+            output.append(f"<h{level}" + html_attr("id", anchors(node_text(item))) + ">")
+            stack.append(f"</h{level}>")
+        else:
+            block = BLOCK_RENDERERS.get(node_type)
+            if block is not None:
+                open_tag, close_tag = block(attrs)
+                output.append(open_tag)
+                stack.append(close_tag)
+
+        children = item.get("content")
+        if isinstance(children, list):
+            stack.extend(reversed(children))
+
+    return "".join(output)
+
+
+class RenderCache:
+    """
+    按内容哈希缓存渲染结果的 LRU
+
+    Args:
+        maxsize: 最多缓存的文档数
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, doc: Optional[Node], digest: Optional[str] = None) -> Tuple[str, str]:
+        """
+        渲染文档（命中缓存时不遍历）
+
+        Args:
+            doc: ProseMirror JSON
+            digest: 已知的内容哈希（省去重复计算）
+
+        Returns:
+            (内容哈希, HTML)
+        """
+        digest = digest or content_hash(doc)
+        with self._lock:
+            cached = self._entries.get(digest)
+            if cached is not None:
+                self._entries.move_to_end(digest)
+                return digest, cached
+
+        rendered = render_html(doc)
+        with self._lock:
+            self._entries[digest] = rendered
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return digest, rendered
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+
+# 全局渲染缓存实例
+render_cache = RenderCache()
@@ -0,0 +1,249 @@
+"""
+反范式计数维护
+
+Tag.usage_count（使用该标签的已发布文章数）与 BackendUser.post_count（作者的已发布文章数）
+由会话 flush 事件自动维护，不再依赖调用方记得调用 increment_usage / update_post_count：
+
+- after_flush 中根据属性历史计算本次 flush 的增量：文章发布/撤回、标签变更、作者变更、删除
+- 增量以原子 SQL（usage_count = usage_count + :delta）在同一事务内执行
+- 会话中已加载的 Tag / BackendUser 对应属性随后过期，下次访问时重新读取
+
+绕过 ORM 的批量写入（Core insert/update）不会触发事件，之后应调用 reconcile_counters
+用每张表一条聚合 UPDATE 重新校准全部计数。
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import bindparam, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from ..models.post import Post, post_tag_association
+from ..models.tag import Tag
+from ..models.user import BackendUser
+
+tag_table = Tag.__table__
+user_table = BackendUser.__table__
+post_table = Post.__table__
+
+_increment_tag_usage = (
+    update(tag_table)
+    .where(tag_table.c.id == bindparam("target_id"))
+    .values(usage_count=tag_table.c.usage_count + bindparam("delta"))
+)
+
+_increment_author_posts = (
+    update(user_table)
+    .where(user_table.c.id == bindparam("target_id"))
+    .values(post_count=user_table.c.post_count + bindparam("delta"))
+)
+
+
+def old_value(state, key: str):
+    """
+    获取标量属性在本次 flush 之前的值（供其它 flush 事件复用）
+
+    提交后已过期的属性需要开启 active_history 或在 before_flush 中先加载，否则取到的是新值。
+    """
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return state.dict.get(key)
+
+
+def _tag_ids(tags: Iterable[Tag]) -> Set[int]:
+    return {tag.id for tag in tags if tag is not None and tag.id is not None}
+
+
+def _stored_tag_ids(connection, post_id: int) -> Set[int]:
+    """标签集合未加载时直接从关联表读取（未修改时即为 flush 前后的值）"""
+    return set(
+        connection.scalars(
+            select(post_tag_association.c.tag_id)
+            .where(post_tag_association.c.post_id == post_id)
+        )
+    )
+
+
+def post_tag_ids(session, state, post: Post, old: bool) -> Set[int]:
+    """获取文章 flush 前（old=True）或 flush 后的标签ID集合（供其它 flush 事件复用）"""
+    if "tags" not in state.dict:
+        if post.id is None:
+            return set()
+        return _stored_tag_ids(session.connection(), post.id)
+
+    history = state.attrs.tags.history
+    if old:
+        return _tag_ids(history.unchanged) | _tag_ids(history.deleted)
+    return _tag_ids(history.unchanged) | _tag_ids(history.added)
+
+
+def _collect_deltas(session):
+    """根据本次 flush 中文章的变化计算计数增量"""
+    tag_deltas: Counter = Counter()
+    author_deltas: Counter = Counter()
+
+    def apply(author_id: Optional[int], tag_ids: Set[int], delta: int) -> None:
+        if author_id is not None:
+            author_deltas[author_id] += delta
+        for tag_id in tag_ids:
+            tag_deltas[tag_id] += delta
+
+    for post in session.new:
+        if isinstance(post, Post) and post.is_published:
+            state = inspect(post)
+            apply(post.author_id, post_tag_ids(session, state, post, old=False), 1)
+
+    for post in session.deleted:
+        if isinstance(post, Post):
+            state = inspect(post)
+            if old_value(state, "is_published"):
+                apply(
+                    old_value(state, "author_id"),
+                    post_tag_ids(session, state, post, old=True),
+                    -1,
+                )
+
+    for post in session.dirty:
+        if not isinstance(post, Post):
+            continue
+        state = inspect(post)
+        published_changed = state.attrs.is_published.history.has_changes()
+        author_changed = state.attrs.author_id.history.has_changes()
+        tags_changed = "tags" in state.dict and state.attrs.tags.history.has_changes()
+        if not (published_changed or author_changed or tags_changed):
+            continue
+
+        was_published = old_value(state, "is_published")
+        if was_published:
+            apply(
+                old_value(state, "author_id"),
+                post_tag_ids(session, state, post, old=True),
+                -1,
+            )
+        if post.is_published:
+            apply(post.author_id, post_tag_ids(session, state, post, old=False), 1)
+
+    return (
+        {key: value for key, value in tag_deltas.items() if value},
+        {key: value for key, value in author_deltas.items() if value},
+    )
+
+
+def _as_params(deltas: Dict[int, int]) -> List[dict]:
+    # 按主键排序，保证并发事务的加锁顺序一致
+    return [
+        {"target_id": target_id, "delta": delta}
+        for target_id, delta in sorted(deltas.items())
+    ]
+
+
+@event.listens_for(Post.is_published, "set", active_history=True)
+@event.listens_for(Post.author_id, "set", active_history=True)
+def _track_previous_value(target, value, oldvalue, initiator):
+    """
+    为计数相关的属性开启 active_history
+
+    提交后对象属性已过期，此时直接赋值不会加载旧值，属性历史里只有新值，
+    发布/撤回草稿的增量会被算错；开启后赋值前先从数据库读回旧值。
+    """
+
+
+@event.listens_for(Session, "before_flush")
+def _load_previous_post_state(session, flush_context, instances):
+    """
+    flush 前确保计数相关的旧值已加载
+
+    提交后对象属性会过期；此时直接给 post.author 赋值（只设置关系，author_id 不经过 set 事件），
+    author_id 的旧值不会进入属性历史。这里先从数据库读回未加载的属性（不会覆盖未提交的修改）。
+    """
+    for post in (*session.dirty, *session.deleted):
+        if not isinstance(post, Post):
+            continue
+        unloaded = inspect(post).unloaded
+        for key in ("is_published", "author_id"):
+            if key in unloaded:
+                getattr(post, key)
+        if post in session.deleted and "tags" in unloaded:
+            # 关联行会随文章一起删除，之后无法再查到旧标签
+            post.tags
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_counter_deltas(session, flush_context):
+    """在同一事务内以原子增量更新反范式计数"""
+    tag_deltas, author_deltas = _collect_deltas(session)
+    if not tag_deltas and not author_deltas:
+        return
+
+    connection = session.connection()
+    if tag_deltas:
+        connection.execute(_increment_tag_usage, _as_params(tag_deltas))
+    if author_deltas:
+        connection.execute(_increment_author_posts, _as_params(author_deltas))
+
+    refresh = session.info.setdefault("counter_refresh", [])
+    refresh.extend((Tag, tag_id) for tag_id in tag_deltas)
+    refresh.extend((BackendUser, user_id) for user_id in author_deltas)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _expire_updated_counters(session, flush_context):
+    """使会话中已加载对象的计数属性过期，下次访问时读取数据库中的新值"""
+    for model, target_id in session.info.pop("counter_refresh", ()):
+        obj = session.identity_map.get(session.identity_key(model, target_id))
+        if obj is None:
+            continue
+        if model is Tag:
+            session.expire(obj, ["usage_count", "updated_at"])
+        else:
+            session.expire(obj, ["post_count", "updated_at"])
+
+
+def reconcile_counters(session) -> Dict[str, int]:
+    """
+    用聚合查询重新计算全部反范式计数（每张表一条 UPDATE）
+
+    Args:
+        session: 数据库会话（由调用方提交）
+
+    Returns:
+        各表被修正的行数
+    """
+    tag_usage = (
+        select(func.count())
+        .select_from(post_tag_association)
+        .join(post_table, post_table.c.id == post_tag_association.c.post_id)
+        .where(post_tag_association.c.tag_id == tag_table.c.id)
+        .where(post_table.c.is_published == True)
+        .scalar_subquery()
+    )
+    tags_fixed = session.execute(
+        update(tag_table)
+        .where(tag_table.c.usage_count != tag_usage)
+        .values(usage_count=tag_usage)
+    ).rowcount
+
+    author_posts = (
+        select(func.count())
+        .select_from(post_table)
+        .where(post_table.c.author_id == user_table.c.id)
+        .where(post_table.c.is_published == True)
+        .scalar_subquery()
+    )
+    authors_fixed = session.execute(
+        update(user_table)
+        .where(user_table.c.post_count != author_posts)
+        .values(post_count=author_posts)
+    ).rowcount
+
+    # 会话中已加载的对象需要重新读取
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Tag):
+            session.expire(obj, ["usage_count", "updated_at"])
+        elif isinstance(obj, BackendUser):
+            session.expire(obj, ["post_count", "updated_at"])
+
+    return {"tag": tags_fixed, "backend_user": authors_fixed}
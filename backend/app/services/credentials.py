@@ -0,0 +1,202 @@
+"""
+凭据校验服务
+
+bcrypt 校验在默认成本下单次需要 100~300ms CPU，直接在 async 路由中调用会冻结整个事件循环。
+CredentialService 把哈希与校验放到有界线程池中执行（bcrypt 计算期间释放 GIL，线程即可并行）：
+- 同时在执行与排队的任务数有上限，超出时抛出 CredentialsBusy（接口返回 429），
+  而不是无限排队拖垮所有请求
+- 登录成功且哈希的成本因子与 BCRYPT_ROUNDS 不一致时透明重新哈希
+- 用户不存在时仍然校验一次占位哈希，响应时间不泄露用户名是否存在
+  （占位哈希在启动时预先生成，首个不存在用户的登录不会多一次哈希运算）
+
+LoginThrottle 按（客户端 IP, 用户名）统计失败次数，超限后在哈希之前直接拒绝，
+暴力破解不会消耗哈希线程池。
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Deque, Optional, TypeVar
+
+from sqlalchemy import select, update
+
+from ..core import security
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal, AsyncWriteSessionLocal
+from ..models.user import BackendUser
+
+T = TypeVar("T")
+
+user_table = BackendUser.__table__
+
+
+class CredentialsBusy(Exception):
+    """凭据校验任务已满，请稍后重试"""
+
+
+class CredentialService:
+    """
+    在有界线程池中执行 bcrypt 运算
+
+    Args:
+        max_workers: 线程数（同时进行的哈希运算数）
+        max_pending: 允许排队等待的任务数，超出后立即拒绝
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8) -> None:
+        self._max_workers = max(1, max_workers)
+        self._capacity = self._max_workers + max(0, max_pending)
+        self._inflight = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dummy_hash: Optional[str] = None
+
+    @property
+    def inflight(self) -> int:
+        """正在执行或排队的任务数"""
+        return self._inflight
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="credentials"
+            )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._inflight >= self._capacity:
+                raise CredentialsBusy()
+            self._inflight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    async def hash_password(self, password: str) -> str:
+        """生成密码哈希"""
+        return await self._run(security.hash_password, password)
+
+    async def verify_password(self, password: str, password_hash: Optional[str]) -> bool:
+        """校验密码"""
+        return await self._run(security.verify_password, password, password_hash)
+
+    async def warm_up(self) -> None:
+        """预先生成占位哈希（应用启动时调用）"""
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash_password("dummy-password")
+
+    async def _verify_dummy(self, password: str) -> None:
+        """用户不存在时校验占位哈希，使耗时与正常校验一致"""
+        await self.warm_up()
+        await self.verify_password(password, self._dummy_hash)
+
+    async def authenticate(self, username: str, password: str) -> Optional[BackendUser]:
+        """
+        校验用户名与密码
+
+        查询用户后立即归还连接，哈希期间不占用数据库连接（否则并发登录会先耗尽连接池）；
+        成功后用短事务记录 last_login，必要时按当前成本重新哈希。
+        这两项直接用 UPDATE 写入并保留 updated_at，登录不会改变作者资料的 ETag 与响应缓存。
+
+        Returns:
+            校验通过的活跃用户；失败时返回 None
+
+        Raises:
+            CredentialsBusy: 哈希线程池已满
+        """
+        async with AsyncSessionLocal() as db:
+            user = await db.scalar(
+                select(BackendUser)
+                .where(BackendUser.username == username)
+                .where(BackendUser.is_active == True)
+            )
+        if user is None:
+            await self._verify_dummy(password)
+            return None
+        if not await self.verify_password(password, user.password_hash):
+            return None
+
+        values = {"last_login": datetime.now(timezone.utc), "updated_at": user_table.c.updated_at}
+        if security.password_needs_update(user.password_hash):
+            values["password_hash"] = await self.hash_password(password)
+        async with AsyncWriteSessionLocal() as write_db:
+            await write_db.execute(update(user_table).where(user_table.c.id == user.id).values(**values))
+            await write_db.commit()
+        return user
+
+    def shutdown(self) -> None:
+        """关闭线程池（应用关闭时调用）"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class LoginThrottle:
+    """
+    登录失败次数限制（进程内，滑动窗口）
+
+    Args:
+        max_failures: 窗口内允许的失败次数
+        window: 窗口长度（秒）
+        max_keys: 最多跟踪的键数量，超出时淘汰最久未更新的键
+    """
+
+    def __init__(self, max_failures: int = 5, window: int = 300, max_keys: int = 10000) -> None:
+        self._max_failures = max_failures
+        self._window = window
+        self._max_keys = max_keys
+        self._failures: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prune(self, key: str, now: float) -> Optional[Deque[float]]:
+        failures = self._failures.get(key)
+        if failures is None:
+            return None
+        while failures and failures[0] <= now - self._window:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+            return None
+        return failures
+
+    def retry_after(self, key: str) -> Optional[int]:
+        """已被限制时返回需要等待的秒数，否则返回 None"""
+        now = time.monotonic()
+        with self._lock:
+            failures = self._prune(key, now)
+            if failures is None or len(failures) < self._max_failures:
+                return None
+            return max(1, int(failures[0] + self._window - now) + 1)
+
+    def record_failure(self, key: str) -> None:
+        """记录一次失败"""
+        now = time.monotonic()
+        with self._lock:
+            failures = self._prune(key, now)
+            if failures is None:
+                failures = self._failures[key] = deque()
+            failures.append(now)
+            self._failures.move_to_end(key)
+            while len(self._failures) > self._max_keys:
+                self._failures.popitem(last=False)
+
+    def reset(self, key: str) -> None:
+        """登录成功后清除失败记录"""
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+# 全局实例
+credential_service = CredentialService(
+    max_workers=settings.credential_workers,
+    max_pending=settings.credential_max_pending,
+)
+login_throttle = LoginThrottle(
+    max_failures=settings.login_max_failures,
+    window=settings.login_failure_window,
+)
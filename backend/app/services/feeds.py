@@ -0,0 +1,686 @@
+"""
+RSS / Atom 订阅源与站点地图
+
+订阅源（全站、按分类、按标签）与 sitemap.xml 预先生成为可以直接发送的字节串，缓存在进程内：
+- 生成时只查询需要的列（标题、slug、摘要、时间、作者名、分类名），逐行写出 XML
+- 缓存的文档同时保存 ETag / Last-Modified 与 gzip / br 压缩版本，命中时不查询数据库、不再压缩
+- 每个文档声明自己依赖的失效键（posts、category:<id>、tag:<id>、taxonomy）或文章ID区间；
+  会话提交后只丢弃受本次写入影响的文档，其它文档保持不变，下次请求时懒生成：
+  - 已发布（或刚撤回）的文章新建、修改、删除：posts、文章新旧分类、新旧标签，以及包含该文章的 sitemap 分片
+  - 草稿的修改不影响任何文档
+  - Category / Tag / BackendUser 写入：taxonomy（条目中的分类名、标签名、作者名）
+- sitemap 每个文件最多 SITEMAP_MAX_URLS（协议上限 50000）个 URL；超出时 /sitemap.xml 为 sitemap 索引，
+  分片按文章 ID 区间划分，修改一篇文章只重新生成它所在的分片与索引
+- 其它工作进程的写入无法通知到本进程，文档另有最长存活时间兜底（FEED_CACHE_MAX_AGE）
+
+链接指向前端页面（SITE_URL），订阅源与站点地图应通过反向代理在站点同一域名下提供。
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from functools import partial
+from typing import (
+    Callable, Dict, FrozenSet, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple,
+)
+from xml.sax.saxutils import escape, quoteattr
+
+from sqlalchemy import event, exists, func, inspect, select
+from sqlalchemy.orm import Session
+
+from ..core.compression import AVAILABLE_ENCODINGS, compress
+from ..core.config import settings
+from ..core.database import ReadSessionLocal
+from ..models.category import Category
+from ..models.post import Post, post_tag_association
+from ..models.tag import Tag
+from ..models.user import BackendUser
+from .category_tree import category_tree_cache
+from .counters import old_value, post_tag_ids
+
+RSS_MEDIA_TYPE = "application/rss+xml"
+ATOM_MEDIA_TYPE = "application/atom+xml"
+SITEMAP_MEDIA_TYPE = "application/xml"
+
+FEED_FORMATS = ("rss", "atom")
+
+# 失效键
+POSTS_KEY = "posts"
+TAXONOMY_KEY = "taxonomy"
+
+# sitemap 中文章之前的固定页面（相对 SITE_URL）
+SITEMAP_STATIC_PATHS = ("/", "/blog")
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+class FeedDocument(NamedTuple):
+    """一份生成好的 XML 文档"""
+
+    body: bytes
+    media_type: str
+    etag: str
+    last_modified: Optional[datetime]
+    depends_on: FrozenSet[str] = frozenset()
+    id_range: Optional[Tuple[Optional[int], Optional[int]]] = None  # sitemap 分片的文章ID区间 [lo, hi)
+    pages: Tuple[Tuple[Optional[int], Optional[int]], ...] = ()  # sitemap 索引的分片区间
+    encoded: Tuple[Tuple[str, bytes], ...] = ()  # (编码, 压缩后的文档)
+    built_at: float = 0.0
+
+    def variant(self, encoding: Optional[str]) -> Optional[bytes]:
+        """获取预压缩的文档"""
+        for name, body in self.encoded:
+            if name == encoding:
+                return body
+        return None
+
+    def covers(self, keys: Set[str], post_ids: Set[int]) -> bool:
+        """本次写入是否影响该文档"""
+        if not self.depends_on.isdisjoint(keys):
+            return True
+        if self.id_range is not None:
+            lo, hi = self.id_range
+            return any((lo is None or post_id >= lo) and (hi is None or post_id < hi) for post_id in post_ids)
+        return False
+
+
+class FeedRow(NamedTuple):
+    """订阅源中的一篇文章"""
+
+    id: int
+    title: str
+    slug: str
+    summary: Optional[str]
+    published_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    author: Optional[str]
+    category: Optional[str]
+    tags: Tuple[str, ...]
+
+
+# --- 链接与时间格式 ---
+
+def site_url(path: str = "/") -> str:
+    """站点页面的绝对地址"""
+    return settings.site_url.rstrip("/") + path
+
+
+def post_url(slug: str) -> str:
+    """文章详情页地址"""
+    return site_url(f"/blog/{slug}")
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite 返回的时间不带时区（CURRENT_TIMESTAMP 为 UTC）
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _rfc822(value: datetime) -> str:
+    return format_datetime(value, usegmt=True)
+
+
+def _rfc3339(value: datetime) -> str:
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def _latest(values: Iterable[Optional[datetime]]) -> Optional[datetime]:
+    timestamps = [_as_utc(value) for value in values if value is not None]
+    return max(timestamps) if timestamps else None
+
+
+def make_document(
+    chunks: Iterable[str],
+    media_type: str,
+    last_modified: Optional[datetime],
+    **options,
+) -> FeedDocument:
+    """把 XML 片段编码为文档，计算 ETag 并预压缩"""
+    body = "".join(chunks).encode("utf-8")
+    encoded = ()
+    if settings.compression_enabled and len(body) >= settings.compression_minimum_size:
+        encoded = tuple((encoding, compress(body, encoding)) for encoding in AVAILABLE_ENCODINGS)
+    return FeedDocument(
+        body=body,
+        media_type=media_type,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        last_modified=last_modified,
+        encoded=encoded,
+        built_at=time.monotonic(),
+        **options,
+    )
+
+
+# --- 订阅源 ---
+
+def _feed_statement():
+    """订阅源的列投影：已发布文章 + 作者名 + 分类名（按发布时间倒序）"""
+    return (
+        select(
+            Post.id, Post.title, Post.slug, Post.excerpt, Post.meta_description,
+            Post.published_at, Post.updated_at,
+            func.coalesce(BackendUser.display_name, BackendUser.username).label("author"),
+            Category.name.label("category"),
+        )
+        .select_from(Post)
+        .outerjoin(BackendUser, BackendUser.id == Post.author_id)
+        .outerjoin(Category, Category.id == Post.category_id)
+        .where(Post.is_published == True)
+        .where(Post.published_at.is_not(None))
+        .order_by(Post.published_at.desc(), Post.id.desc())
+    )
+
+
+def fetch_feed_rows(session, statement, limit: int) -> List[FeedRow]:
+    """取最新的若干篇文章及其标签名（两条查询）"""
+    rows = session.execute(statement.limit(limit)).all()
+    tags: Dict[int, List[str]] = {}
+    if rows:
+        for post_id, name in session.execute(
+            select(post_tag_association.c.post_id, Tag.name)
+            .join(Tag, Tag.id == post_tag_association.c.tag_id)
+            .where(post_tag_association.c.post_id.in_([row.id for row in rows]))
+            .order_by(Tag.name)
+        ):
+            tags.setdefault(post_id, []).append(name)
+    return [
+        FeedRow(
+            id=row.id,
+            title=row.title,
+            slug=row.slug,
+            summary=row.excerpt or row.meta_description,
+            published_at=_as_utc(row.published_at),
+            updated_at=_as_utc(row.updated_at or row.published_at),
+            author=row.author,
+            category=row.category,
+            tags=tuple(tags.get(row.id, ())),
+        )
+        for row in rows
+    ]
+
+
+def _rss_chunks(title: str, link: str, self_url: str, rows: List[FeedRow], updated: datetime) -> Iterator[str]:
+    yield _XML_DECLARATION
+    yield '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+    yield "<channel>\n"
+    yield f"<title>{escape(title)}</title>\n"
+    yield f"<link>{escape(link)}</link>\n"
+    yield f"<description>{escape(settings.site_description)}</description>\n"
+    yield f"<language>{escape(settings.site_language)}</language>\n"
+    yield f"<lastBuildDate>{_rfc822(updated)}</lastBuildDate>\n"
+    yield f'<atom:link href={quoteattr(self_url)} rel="self" type="{RSS_MEDIA_TYPE}"/>\n'
+    for row in rows:
+        url = escape(post_url(row.slug))
+        yield "<item>\n"
+        yield f"<title>{escape(row.title)}</title>\n"
+        yield f"<link>{url}</link>\n"
+        yield f'<guid isPermaLink="true">{url}</guid>\n'
+        yield f"<pubDate>{_rfc822(row.published_at)}</pubDate>\n"
+        if row.author:
+            yield f"<dc:creator>{escape(row.author)}</dc:creator>\n"
+        if row.category:
+            yield f"<category>{escape(row.category)}</category>\n"
+        for tag in row.tags:
+            yield f"<category>{escape(tag)}</category>\n"
+        if row.summary:
+            yield f"<description>{escape(row.summary)}</description>\n"
+        yield "</item>\n"
+    yield "</channel>\n</rss>\n"
+
+
+def _atom_chunks(title: str, link: str, self_url: str, rows: List[FeedRow], updated: datetime) -> Iterator[str]:
+    yield _XML_DECLARATION
+    yield f'<feed xmlns="http://www.w3.org/2005/Atom" xml:lang={quoteattr(settings.site_language)}>\n'
+    yield f"<title>{escape(title)}</title>\n"
+    yield f"<subtitle>{escape(settings.site_description)}</subtitle>\n"
+    yield f"<id>{escape(self_url)}</id>\n"
+    yield f'<link rel="self" type="{ATOM_MEDIA_TYPE}" href={quoteattr(self_url)}/>\n'
+    yield f'<link rel="alternate" type="text/html" href={quoteattr(link)}/>\n'
+    yield f"<updated>{_rfc3339(updated)}</updated>\n"
+    for row in rows:
+        url = post_url(row.slug)
+        yield "<entry>\n"
+        yield f"<title>{escape(row.title)}</title>\n"
+        yield f"<id>{escape(url)}</id>\n"
+        yield f'<link rel="alternate" type="text/html" href={quoteattr(url)}/>\n'
+        yield f"<published>{_rfc3339(row.published_at)}</published>\n"
+        yield f"<updated>{_rfc3339(row.updated_at)}</updated>\n"
+        if row.author:
+            yield f"<author><name>{escape(row.author)}</name></author>\n"
+        if row.category:
+            yield f"<category term={quoteattr(row.category)}/>\n"
+        for tag in row.tags:
+            yield f"<category term={quoteattr(tag)}/>\n"
+        if row.summary:
+            yield f"<summary>{escape(row.summary)}</summary>\n"
+        yield "</entry>\n"
+    yield "</feed>\n"
+
+
+def build_feed(
+    session,
+    feed_format: str,
+    statement,
+    title: str,
+    link: str,
+    self_path: str,
+    depends_on: FrozenSet[str],
+) -> FeedDocument:
+    """生成一份 RSS 2.0 / Atom 1.0 订阅源"""
+    rows = fetch_feed_rows(session, statement, settings.feed_max_items)
+    updated = _latest(row.updated_at for row in rows)
+    render = _rss_chunks if feed_format == "rss" else _atom_chunks
+    return make_document(
+        render(title, link, site_url(self_path), rows, updated or datetime.now(timezone.utc).replace(microsecond=0)),
+        RSS_MEDIA_TYPE if feed_format == "rss" else ATOM_MEDIA_TYPE,
+        updated,
+        depends_on=depends_on | {TAXONOMY_KEY},
+    )
+
+
+def feed_path(feed_format: str, scope: str = "site", slug: Optional[str] = None) -> str:
+    """订阅源地址（相对 SITE_URL），与 app/api/endpoints/feeds.py 的路由一致"""
+    name = "feed.xml" if feed_format == "rss" else "atom.xml"
+    if scope == "category":
+        return f"/categories/{slug}/{name}"
+    if scope == "tag":
+        return f"/tags/{slug}/{name}"
+    return f"/{name}"
+
+
+def build_site_feed(session, feed_format: str) -> FeedDocument:
+    """全站订阅源"""
+    return build_feed(
+        session,
+        feed_format,
+        _feed_statement(),
+        settings.site_title,
+        site_url("/blog"),
+        feed_path(feed_format),
+        frozenset({POSTS_KEY}),
+    )
+
+
+def build_category_feed(session, feed_format: str, slug: str) -> Optional[FeedDocument]:
+    """分类订阅源（含所有启用的子分类）；分类不存在或已停用时返回 None"""
+    tree = category_tree_cache.get()
+    node = tree.get_by_slug(slug)
+    if node is None:
+        return None
+    subtree = [node.id, *tree.descendant_ids(node.id)]
+    return build_feed(
+        session,
+        feed_format,
+        _feed_statement().where(Post.category_id.in_(subtree)),
+        f"{settings.site_title} - {' / '.join(node.breadcrumb)}",
+        site_url(f"/blog?category={node.slug}"),
+        feed_path(feed_format, "category", node.slug),
+        frozenset(f"category:{descendant_id}" for descendant_id in subtree),
+    )
+
+
+def build_tag_feed(session, feed_format: str, slug: str) -> Optional[FeedDocument]:
+    """标签订阅源；标签不存在或已停用时返回 None"""
+    tag = session.execute(
+        select(Tag.id, Tag.name, Tag.slug).where(Tag.slug == slug).where(Tag.is_active == True)
+    ).first()
+    if tag is None:
+        return None
+    return build_feed(
+        session,
+        feed_format,
+        _feed_statement().where(
+            exists()
+            .where(post_tag_association.c.post_id == Post.id)
+            .where(post_tag_association.c.tag_id == tag.id)
+        ),
+        f"{settings.site_title} - #{tag.name}",
+        site_url(f"/blog?tag={tag.slug}"),
+        feed_path(feed_format, "tag", tag.slug),
+        frozenset({f"tag:{tag.id}"}),
+    )
+
+
+# --- 站点地图 ---
+
+def _sitemap_post_filter(statement, lo: Optional[int], hi: Optional[int]):
+    statement = statement.where(Post.is_published == True)
+    if lo is not None:
+        statement = statement.where(Post.id >= lo)
+    if hi is not None:
+        statement = statement.where(Post.id < hi)
+    return statement
+
+
+def sitemap_pages(session) -> Tuple[Tuple[Optional[int], Optional[int]], ...]:
+    """
+    按文章ID把 sitemap 划分为分片，每片最多 SITEMAP_MAX_URLS 个 URL
+
+    第一片先放固定页面，其余为文章；分片起点用 OFFSET 在主键上探测（每片一条查询）。
+
+    Returns:
+        每片的文章ID区间 [lo, hi)，None 表示不限
+    """
+    limit = settings.sitemap_max_urls
+    starts: List[Optional[int]] = [None]
+    offset = limit - len(SITEMAP_STATIC_PATHS)
+    while True:
+        start = session.scalar(
+            _sitemap_post_filter(select(Post.id), None, None)
+            .order_by(Post.id)
+            .offset(offset)
+            .limit(1)
+        )
+        if start is None:
+            break
+        starts.append(start)
+        offset += limit
+    return tuple(zip(starts, [*starts[1:], None]))
+
+
+def _urlset_chunks(session, lo: Optional[int], hi: Optional[int], latest: List[datetime]) -> Iterator[str]:
+    yield _XML_DECLARATION
+    yield '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    if lo is None:
+        for path in SITEMAP_STATIC_PATHS:
+            yield f"<url><loc>{escape(site_url(path))}</loc></url>\n"
+    rows = session.execute(
+        _sitemap_post_filter(
+            select(Post.slug, func.coalesce(Post.updated_at, Post.published_at).label("modified_at")),
+            lo,
+            hi,
+        )
+        .order_by(Post.id)
+        .execution_options(yield_per=1000)
+    )
+    for slug, modified_at in rows:
+        modified_at = _as_utc(modified_at)
+        if modified_at is None:
+            yield f"<url><loc>{escape(post_url(slug))}</loc></url>\n"
+            continue
+        if not latest or modified_at > latest[0]:
+            latest[:] = [modified_at]
+        yield f"<url><loc>{escape(post_url(slug))}</loc><lastmod>{_rfc3339(modified_at)}</lastmod></url>\n"
+    yield "</urlset>\n"
+
+
+def build_sitemap_page(session, lo: Optional[int], hi: Optional[int]) -> FeedDocument:
+    """一个 sitemap 分片（urlset），边读取边写出"""
+    latest: List[datetime] = []
+    chunks = list(_urlset_chunks(session, lo, hi, latest))
+    return make_document(
+        chunks,
+        SITEMAP_MEDIA_TYPE,
+        latest[0] if latest else None,
+        id_range=(lo, hi),
+    )
+
+
+def sitemap_page_path(page: int) -> str:
+    """sitemap 分片地址（相对 SITE_URL，从 1 开始）"""
+    return f"/sitemaps/{page}.xml"
+
+
+def build_sitemap(session) -> FeedDocument:
+    """
+    /sitemap.xml：只有一个分片时直接是 urlset，否则为 sitemap 索引
+
+    索引依赖 posts（分片边界与各分片的 lastmod），分片本身只在其ID区间内的文章变化时重新生成。
+    """
+    pages = sitemap_pages(session)
+    if len(pages) == 1:
+        document = build_sitemap_page(session, None, None)
+        return document._replace(depends_on=frozenset({POSTS_KEY}), id_range=None, pages=pages)
+
+    def chunks(modified: List[Optional[datetime]]) -> Iterator[str]:
+        yield _XML_DECLARATION
+        yield '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        for number, (lo, hi) in enumerate(pages, start=1):
+            modified_at = _as_utc(
+                session.scalar(
+                    _sitemap_post_filter(
+                        select(func.max(func.coalesce(Post.updated_at, Post.published_at))), lo, hi
+                    )
+                )
+            )
+            modified.append(modified_at)
+            yield f"<sitemap><loc>{escape(site_url(sitemap_page_path(number)))}</loc>"
+            if modified_at is not None:
+                yield f"<lastmod>{_rfc3339(modified_at)}</lastmod>"
+            yield "</sitemap>\n"
+        yield "</sitemapindex>\n"
+
+    modified: List[Optional[datetime]] = []
+    body = list(chunks(modified))
+    return make_document(
+        body,
+        SITEMAP_MEDIA_TYPE,
+        _latest(modified),
+        depends_on=frozenset({POSTS_KEY}),
+        pages=pages,
+    )
+
+
+# --- 缓存 ---
+
+class FeedCache:
+    """
+    线程安全的 XML 文档缓存
+
+    Args:
+        max_age: 文档最长存活秒数（跨进程写入的兜底失效）
+    """
+
+    def __init__(self, max_age: float = 3600.0) -> None:
+        self._max_age = max_age
+        self._documents: Dict[Hashable, FeedDocument] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        # 正在生成的键 -> [生成锁, 等待数]；不同文档的生成互不阻塞，同一文档只生成一次
+        self._build_locks: Dict[Hashable, List] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def peek(self, key: Hashable) -> Optional[FeedDocument]:
+        """获取仍然有效的缓存文档（不生成）"""
+        document = self._documents.get(key)
+        if document is not None and time.monotonic() - document.built_at < self._max_age:
+            return document
+        return None
+
+    def _acquire_build_lock(self, key: Hashable) -> List:
+        with self._lock:
+            entry = self._build_locks.get(key)
+            if entry is None:
+                entry = self._build_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        return entry
+
+    def _release_build_lock(self, key: Hashable, entry: List) -> None:
+        # 没有等待者时移除，不存在的 slug 不会让锁表无限增长
+        with self._lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._build_locks[key]
+
+    def get(
+        self,
+        key: Hashable,
+        build: Callable[[Session], Optional[FeedDocument]],
+        valid: Callable[[FeedDocument], bool] = lambda document: True,
+    ) -> Optional[FeedDocument]:
+        """
+        获取文档，缺失或过期时调用 build 生成
+
+        只持有该键的生成锁查询数据库，其它文档的读取与生成不受影响。
+
+        Args:
+            key: 缓存键
+            build: 生成函数（参数为只读会话），返回 None 表示资源不存在
+            valid: 额外的有效性检查（例如 sitemap 分片区间是否与当前索引一致）
+        """
+        document = self.peek(key)
+        if document is not None and valid(document):
+            return document
+
+        entry = self._acquire_build_lock(key)
+        try:
+            with entry[0]:
+                document = self.peek(key)
+                if document is not None and valid(document):
+                    return document
+                generation = self._generation
+                with ReadSessionLocal() as db:
+                    document = build(db)
+                with self._lock:
+                    # 生成期间发生失效时不缓存这个可能过期的文档
+                    if document is not None and generation == self._generation:
+                        self._documents[key] = document
+                return document
+        finally:
+            self._release_build_lock(key, entry)
+
+    async def get_async(self, key: Hashable, build, valid=lambda document: True) -> Optional[FeedDocument]:
+        """在事件循环中获取文档；需要生成时放到线程中执行"""
+        document = self.peek(key)
+        if document is not None and valid(document):
+            return document
+        return await asyncio.to_thread(self.get, key, build, valid)
+
+    def invalidate(self, keys: Set[str], post_ids: Set[int] = frozenset()) -> int:
+        """丢弃受影响的文档，返回丢弃数量"""
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, document in self._documents.items() if document.covers(keys, post_ids)]
+            for key in stale:
+                del self._documents[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._generation += 1
+            self._documents.clear()
+
+
+# 全局文档缓存实例
+feed_cache = FeedCache(max_age=settings.feed_cache_max_age)
+
+
+async def get_feed(feed_format: str, scope: str = "site", slug: Optional[str] = None) -> Optional[FeedDocument]:
+    """
+    获取订阅源文档
+
+    分类与标签订阅源按 slug 缓存，命中时不查询数据库。
+
+    Args:
+        feed_format: rss 或 atom
+        scope: site、category 或 tag
+        slug: 分类或标签 slug（scope 为 site 时忽略）
+
+    Returns:
+        文档；分类或标签不存在时返回 None
+    """
+    if scope == "category":
+        build = partial(build_category_feed, feed_format=feed_format, slug=slug)
+    elif scope == "tag":
+        build = partial(build_tag_feed, feed_format=feed_format, slug=slug)
+    else:
+        scope, slug = "site", None
+        build = partial(build_site_feed, feed_format=feed_format)
+    return await feed_cache.get_async((feed_format, scope, slug), build)
+
+
+async def get_sitemap(page: Optional[int] = None) -> Optional[FeedDocument]:
+    """
+    获取站点地图
+
+    Args:
+        page: None 表示 /sitemap.xml；否则为分片序号（从 1 开始）
+
+    Returns:
+        文档；分片不存在时返回 None
+    """
+    index = await feed_cache.get_async(("sitemap",), build_sitemap)
+    if page is None:
+        return index
+    if len(index.pages) < 2 or not 1 <= page <= len(index.pages):
+        return None
+    lo, hi = index.pages[page - 1]
+    return await feed_cache.get_async(
+        ("sitemap", page),
+        lambda db: build_sitemap_page(db, lo, hi),
+        valid=lambda document: document.id_range == (lo, hi),
+    )
+
+
+# --- 会话事件：提交涉及已发布文章或分类/标签/作者的写入后丢弃受影响的文档 ---
+
+def _post_keys(session, post: Post, old: bool) -> Set[str]:
+    state = inspect(post)
+    category_id = old_value(state, "category_id") if old else post.category_id
+    keys = {POSTS_KEY}
+    if category_id is not None:
+        keys.add(f"category:{category_id}")
+    keys.update(f"tag:{tag_id}" for tag_id in post_tag_ids(session, state, post, old=old))
+    return keys
+
+
+@event.listens_for(Session, "before_flush")
+def _load_previous_category(session, flush_context, instances):
+    """flush 前加载文章原来的分类（提交后属性已过期时，旧值不会进入属性历史）"""
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, Post) and "category_id" in inspect(obj).unloaded:
+            obj.category_id
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_feed_changes(session, flush_context):
+    """记录本事务影响的失效键与文章ID"""
+    keys: Set[str] = set()
+    post_ids: Set[int] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Category, Tag, BackendUser)):
+            keys.add(TAXONOMY_KEY)
+            continue
+        if not isinstance(obj, Post):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        was_published = obj not in session.new and old_value(state, "is_published")
+        is_published = obj not in session.deleted and obj.is_published
+        if not (was_published or is_published):
+            continue  # 草稿
+        if was_published:
+            keys |= _post_keys(session, obj, old=True)
+        if is_published:
+            keys |= _post_keys(session, obj, old=False)
+        if obj.id is not None:
+            post_ids.add(obj.id)
+
+    if keys or post_ids:
+        changes = session.info.setdefault("feed_changes", (set(), set()))
+        changes[0].update(keys)
+        changes[1].update(post_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_feeds(session):
+    """事务提交后丢弃受影响的订阅源与站点地图"""
+    changes = session.info.pop("feed_changes", None)
+    if changes:
+        feed_cache.invalidate(*changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_feed_changes(session):
+    """事务回滚时丢弃记录"""
+    session.info.pop("feed_changes", None)
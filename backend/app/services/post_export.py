@@ -0,0 +1,276 @@
+"""
+全站文章流式导出
+
+把全部文章写入 zip 或 tar.gz 归档，边查询边输出，内存占用与归档大小无关：
+- 文章按 ID 顺序用 yield_per 分批读取（服务端游标），每批再用一条查询取回标签
+- markdown 格式：每篇文章一个 posts/<slug>.md，front matter 包含标题、日期、发布状态、
+  分类路径、标签、作者等（与 import-posts 的字段一致，可直接重新导入）；
+  没有 content_markdown 的文章输出发布时渲染的 HTML
+- jsonl 格式：每批文章一个 posts/part-00001.jsonl（每行一篇，包含 content_json 与 content_markdown）
+- 归档写入一个只追加的内存缓冲区，每写完一个成员就把缓冲区内容交给调用方，
+  既可以写文件，也可以作为分块 HTTP 响应发送
+"""
+
+import io
+import tarfile
+import time
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.database import ReadSessionLocal
+from ..core.responses import json_dumps
+from ..models.category import Category
+from ..models.post import Post, post_tag_association
+from ..models.post_derived import PostDerivedContent
+from ..models.tag import Tag
+from ..models.user import BackendUser
+
+EXPORT_FORMATS = ("markdown", "jsonl")
+ARCHIVE_TYPES = ("zip", "tar.gz")
+
+ARCHIVE_MEDIA_TYPES = {
+    "zip": "application/zip",
+    "tar.gz": "application/gzip",
+}
+
+
+class ExportMember(NamedTuple):
+    """归档中的一个文件"""
+
+    name: str
+    data: bytes
+    modified_at: Optional[datetime] = None
+
+
+class _ChunkSink(io.RawIOBase):
+    """只追加、不可回退的输出缓冲区（zipfile / tarfile 的流式写入目标）"""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _category_paths(session: Session) -> Dict[int, Tuple[Tuple[str, ...], str]]:
+    """分类ID -> (从根开始的名称路径, slug)；分类表很小，一次读完"""
+    rows = {
+        row.id: row
+        for row in session.execute(select(Category.id, Category.parent_id, Category.name, Category.slug))
+    }
+    paths: Dict[int, Tuple[Tuple[str, ...], str]] = {}
+    for category_id, row in rows.items():
+        names: List[str] = []
+        seen = set()
+        current = row
+        while current is not None and current.id not in seen:
+            seen.add(current.id)
+            names.append(current.name)
+            current = rows.get(current.parent_id)
+        paths[category_id] = (tuple(reversed(names)), row.slug)
+    return paths
+
+
+def _post_columns(include_html: bool):
+    columns = [
+        Post.id, Post.title, Post.slug, Post.excerpt, Post.meta_description, Post.featured_image,
+        Post.is_published, Post.published_at, Post.created_at, Post.updated_at, Post.view_count,
+        Post.category_id, Post.content_markdown, Post.content_json,
+        BackendUser.username.label("author"),
+    ]
+    if include_html:
+        columns.append(PostDerivedContent.content_html)
+    return columns
+
+
+def iter_post_batches(
+    session: Session,
+    batch_size: int = 200,
+    include_drafts: bool = True,
+    include_html: bool = False,
+) -> Iterator[List[Tuple[object, List[Tuple[str, str]]]]]:
+    """
+    按批产生文章行及其标签 [(行, [(标签名, 标签slug), ...]), ...]
+
+    使用 yield_per 流式读取，任何时刻内存中只有一批文章。
+    """
+    statement = (
+        select(*_post_columns(include_html))
+        .outerjoin(BackendUser, BackendUser.id == Post.author_id)
+        .order_by(Post.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if include_html:
+        statement = statement.outerjoin(PostDerivedContent, PostDerivedContent.post_id == Post.id)
+    if not include_drafts:
+        statement = statement.where(Post.is_published == True)
+
+    for rows in session.execute(statement).partitions():
+        tags: Dict[int, List[Tuple[str, str]]] = {}
+        for post_id, name, slug in session.execute(
+            select(post_tag_association.c.post_id, Tag.name, Tag.slug)
+            .join(Tag, Tag.id == post_tag_association.c.tag_id)
+            .where(post_tag_association.c.post_id.in_([row.id for row in rows]))
+            .order_by(post_tag_association.c.post_id, Tag.name)
+        ):
+            tags.setdefault(post_id, []).append((name, slug))
+        yield [(row, tags.get(row.id, [])) for row in rows]
+
+
+def _markdown_member(row, tags, categories) -> ExportMember:
+    import frontmatter
+
+    metadata = {"title": row.title, "slug": row.slug}
+    if row.published_at or row.created_at:
+        metadata["date"] = row.published_at or row.created_at
+    if row.updated_at:
+        metadata["updated"] = row.updated_at
+    metadata["published"] = bool(row.is_published)
+    if row.category_id in categories:
+        metadata["category"] = "/".join(categories[row.category_id][0])
+    if tags:
+        metadata["tags"] = [name for name, _ in tags]
+    if row.author:
+        metadata["author"] = row.author
+    for key, value in (
+        ("excerpt", row.excerpt),
+        ("description", row.meta_description),
+        ("cover", row.featured_image),
+    ):
+        if value:
+            metadata[key] = value
+
+    body = row.content_markdown if row.content_markdown is not None else (row.content_html or "")
+    text = frontmatter.dumps(frontmatter.Post(body, **metadata), sort_keys=False)
+    return ExportMember(f"posts/{row.slug}.md", (text + "\n").encode("utf-8"), row.updated_at)
+
+
+def _json_record(row, tags, categories) -> dict:
+    category = categories.get(row.category_id)
+    return {
+        "id": row.id,
+        "title": row.title,
+        "slug": row.slug,
+        "excerpt": row.excerpt,
+        "meta_description": row.meta_description,
+        "featured_image": row.featured_image,
+        "is_published": bool(row.is_published),
+        "published_at": row.published_at,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "view_count": row.view_count,
+        "author": row.author,
+        "category": {"path": list(category[0]), "slug": category[1]} if category else None,
+        "tags": [{"name": name, "slug": slug} for name, slug in tags],
+        "content_markdown": row.content_markdown,
+        "content_json": row.content_json,
+    }
+
+
+def iter_export_members(
+    session: Session,
+    export_format: str = "markdown",
+    batch_size: int = 200,
+    include_drafts: bool = True,
+) -> Iterator[ExportMember]:
+    """按导出格式产生归档成员"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式: {export_format}")
+    categories = _category_paths(session)
+    batches = iter_post_batches(
+        session,
+        batch_size=batch_size,
+        include_drafts=include_drafts,
+        include_html=export_format == "markdown",
+    )
+    for number, batch in enumerate(batches, start=1):
+        if export_format == "markdown":
+            for row, tags in batch:
+                yield _markdown_member(row, tags, categories)
+        else:
+            data = b"".join(json_dumps(_json_record(row, tags, categories)) + b"\n" for row, tags in batch)
+            yield ExportMember(f"posts/part-{number:05d}.jsonl", data, None)
+
+
+def stream_archive(members: Iterator[ExportMember], archive: str = "zip") -> Iterator[bytes]:
+    """
+    把成员依次写入归档并产生归档字节块（每个成员之后产生一次）
+
+    Args:
+        members: 归档成员
+        archive: zip 或 tar.gz
+    """
+    if archive not in ARCHIVE_TYPES:
+        raise ValueError(f"不支持的归档类型: {archive}")
+    sink = _ChunkSink()
+    now = time.time()
+
+    if archive == "zip":
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for member in members:
+                modified = member.modified_at.timetuple()[:6] if member.modified_at else time.localtime(now)[:6]
+                info = zipfile.ZipInfo(member.name, date_time=max(modified, (1980, 1, 1, 0, 0, 0)))
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(info, member.data)
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+    else:
+        with tarfile.open(fileobj=sink, mode="w|gz") as tf:
+            for member in members:
+                info = tarfile.TarInfo(member.name)
+                info.size = len(member.data)
+                info.mtime = member.modified_at.timestamp() if member.modified_at else now
+                info.mode = 0o644
+                tf.addfile(info, io.BytesIO(member.data))
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+def iter_export_archive(
+    export_format: str = "markdown",
+    archive: str = "zip",
+    include_drafts: bool = True,
+    batch_size: int = 200,
+) -> Iterator[bytes]:
+    """
+    打开只读会话导出全部文章，产生归档字节块
+
+    整个导出在同一个读事务中完成（一致的快照），生成器关闭时释放连接。
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式: {export_format}")
+    if archive not in ARCHIVE_TYPES:
+        raise ValueError(f"不支持的归档类型: {archive}")
+
+    with ReadSessionLocal() as session:
+        members = iter_export_members(
+            session,
+            export_format=export_format,
+            batch_size=batch_size,
+            include_drafts=include_drafts,
+        )
+        yield from stream_archive(members, archive=archive)
+
+
+def export_filename(export_format: str, archive: str) -> str:
+    """下载文件名，例如 blog-export-markdown-20240101.zip"""
+    return f"blog-export-{export_format}-{time.strftime('%Y%m%d')}.{archive}"
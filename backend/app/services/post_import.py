@@ -0,0 +1,457 @@
+"""
+Markdown 文章批量导入
+
+把一个目录（递归）下的 .md 文件导入为文章，front matter 支持的字段：
+    title, slug, date, updated, published / draft, category, tags,
+    excerpt / summary, description, cover / image, author
+- category 可以是 "技术/前端" 或 ["技术", "前端"]，按层级解析或创建
+- tags 可以是列表或逗号分隔的字符串
+- 没有 title 时取正文第一个一级标题，再没有则取文件名；没有 slug 时由文件名生成
+- 已存在的 slug（数据库中或本次导入中重复）跳过，不覆盖已有文章
+
+流程：
+- 文件路径以生成器逐个产生，按批提交给进程池解析 front matter 并计算派生内容
+  （阅读时间、自动摘要、目录与统计、已发布文章的 HTML，与保存时的内容流水线一致），
+  解析下一批与写入当前批并行
+- 分类与标签通过内存中的 名称/slug -> ID 映射解析，只有新建时才写数据库
+  （分类经 ORM 创建以维护层级索引）
+- 文章、标签关联、派生内容用 executemany 批量插入，每批一个事务
+- 批量插入绕过 ORM 事件，结束后统一校准标签与作者计数
+"""
+
+import os
+import re
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from ..models.category import Category
+from ..models.post import Post, post_tag_association
+from ..models.post_derived import PostDerivedContent
+from ..models.tag import Tag
+from ..models.user import BackendUser
+from .counters import reconcile_counters
+
+post_table = Post.__table__
+derived_table = PostDerivedContent.__table__
+
+# 每个解析任务处理的文件数（减少进程间通信次数）
+PARSE_CHUNK_SIZE = 50
+
+_SLUG_INVALID = re.compile(r"[^\w]+")
+_FIRST_HEADING = re.compile(r"^#\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+
+class ParsedPost(NamedTuple):
+    """解析后的一篇文章（可跨进程传递）"""
+
+    source: str
+    title: str
+    slug: str
+    content_markdown: str
+    excerpt: Optional[str]
+    meta_description: Optional[str]
+    featured_image: Optional[str]
+    is_published: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    category_path: Tuple[str, ...]
+    tags: Tuple[str, ...]
+    author: Optional[str]
+    reading_time_minutes: int
+    derived: Dict[str, Any]
+
+
+class ImportReport(NamedTuple):
+    """导入结果"""
+
+    files: int
+    imported: int
+    skipped: List[str]  # slug 已存在的文件
+    failed: List[Tuple[str, str]]  # (文件, 错误信息)
+    categories_created: int
+    tags_created: int
+    seconds: float
+
+    @property
+    def posts_per_second(self) -> float:
+        return self.imported / self.seconds if self.seconds > 0 else 0.0
+
+
+def slugify(text: str, max_length: int = 100) -> str:
+    """生成 slug：小写，非文字字符替换为 "-"（保留中文等 Unicode 文字）"""
+    slug = _SLUG_INVALID.sub("-", text.strip().lower()).strip("-_")
+    return slug[:max_length].strip("-_")
+
+
+def iter_markdown_files(directory: str) -> Iterator[str]:
+    """递归产生目录下的 .md 文件路径（按名称排序，不预先收集整个目录树）"""
+    with os.scandir(directory) as entries:
+        for entry in sorted(entries, key=lambda item: item.name):
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_markdown_files(entry.path)
+            elif entry.is_file() and entry.name.lower().endswith(".md"):
+                yield entry.path
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    """front matter 日期（datetime / date / ISO 字符串）转换为带时区的 datetime"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        result = value
+    elif isinstance(value, date):
+        result = datetime(value.year, value.month, value.day)
+    else:
+        result = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    return result if result.tzinfo is not None else result.replace(tzinfo=timezone.utc)
+
+
+def _to_names(value: Any, separator: str) -> Tuple[str, ...]:
+    """列表或分隔字符串 -> 去重后的名称元组（保持顺序）"""
+    if value is None:
+        return ()
+    items = value if isinstance(value, (list, tuple)) else str(value).split(separator)
+    names: List[str] = []
+    for item in items:
+        name = str(item).strip()
+        if name and name not in names:
+            names.append(name)
+    return tuple(names)
+
+
+def _optional_text(metadata: Dict[str, Any], *keys: str) -> Optional[str]:
+    for key in keys:
+        value = metadata.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def parse_markdown_file(path: str) -> ParsedPost:
+    """
+    解析单个 Markdown 文件并计算派生内容（在工作进程中执行）
+
+    Raises:
+        ValueError: front matter 无法解析或字段格式错误
+    """
+    import frontmatter
+
+    from .content.pipeline import derive_post_content
+
+    with open(path, encoding="utf-8") as file:
+        document = frontmatter.load(file)
+    metadata = document.metadata
+    content = document.content
+    stem = os.path.splitext(os.path.basename(path))[0]
+
+    title = _optional_text(metadata, "title")
+    if title is None:
+        heading = _FIRST_HEADING.search(content)
+        title = heading.group(1) if heading else stem
+    slug = slugify(str(metadata.get("slug") or stem), max_length=255)
+    if not slug:
+        raise ValueError("无法生成 slug")
+
+    if "published" in metadata:
+        is_published = bool(metadata["published"])
+    else:
+        is_published = not bool(metadata.get("draft", False))
+    created_at = _to_datetime(metadata.get("date"))
+    updated_at = _to_datetime(metadata.get("updated") or metadata.get("lastmod")) or created_at
+
+    category = metadata.get("category") or metadata.get("categories")
+    category_path = _to_names(category, "/")
+
+    # 与保存时的内容流水线使用同一套计算（文章对象只在内存中构造，不进入会话）
+    post = Post(
+        content_markdown=content,
+        excerpt=_optional_text(metadata, "excerpt", "summary"),
+        is_published=is_published,
+    )
+    derived = derive_post_content(post)
+
+    return ParsedPost(
+        source=path,
+        title=title[:255],
+        slug=slug,
+        content_markdown=content,
+        excerpt=post.excerpt,
+        meta_description=_optional_text(metadata, "description"),
+        featured_image=_optional_text(metadata, "cover", "image", "featured_image"),
+        is_published=is_published,
+        created_at=created_at,
+        updated_at=updated_at,
+        category_path=category_path,
+        tags=_to_names(metadata.get("tags"), ","),
+        author=_optional_text(metadata, "author"),
+        reading_time_minutes=post.reading_time_minutes,
+        derived={
+            "content_hash": derived.content_hash,
+            "content_html": derived.content_html,
+            "toc": derived.toc,
+            "content_stats": derived.content_stats,
+        },
+    )
+
+
+def _parse_chunk(paths: Sequence[str]) -> List[Tuple[str, Optional[ParsedPost], Optional[str]]]:
+    """解析一组文件；单个文件失败不影响其它文件"""
+    results = []
+    for path in paths:
+        try:
+            results.append((path, parse_markdown_file(path), None))
+        except Exception as exc:  # noqa: BLE001  记录到报告中继续导入
+            results.append((path, None, f"{type(exc).__name__}: {exc}"))
+    return results
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _InlineExecutor(Executor):
+    """单进程模式：在当前进程中同步执行"""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:  # noqa: BLE001
+            future.set_exception(exc)
+        return future
+
+
+class SlugMap:
+    """
+    分类与标签的内存映射（名称 / slug -> ID）
+
+    创建时预加载全部已有分类与标签，之后只在遇到新名称时写数据库。
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+        self.categories_created = 0
+        self.tags_created = 0
+        self._tags: Dict[str, int] = {}
+        self._tag_slugs: Set[str] = set()
+        for tag_id, name, slug in session.execute(select(Tag.id, Tag.name, Tag.slug)):
+            self._tags[name.lower()] = self._tags[slug] = tag_id
+            self._tag_slugs.add(slug)
+        # (父分类ID, 名称) -> 分类ID
+        self._categories: Dict[Tuple[Optional[int], str], int] = {}
+        self._category_slugs: Set[str] = set()
+        for category_id, parent_id, name, slug in session.execute(
+            select(Category.id, Category.parent_id, Category.name, Category.slug)
+        ):
+            self._categories[(parent_id, name.lower())] = category_id
+            self._category_slugs.add(slug)
+
+    @staticmethod
+    def _unique_slug(base: str, taken: Set[str], max_length: int) -> str:
+        base = base[:max_length] or "item"
+        slug, suffix = base, 2
+        while slug in taken:
+            tail = f"-{suffix}"
+            slug = base[:max_length - len(tail)] + tail
+            suffix += 1
+        taken.add(slug)
+        return slug
+
+    def tag_ids(self, names: Iterable[str]) -> List[int]:
+        """按名称（或 slug）解析标签，不存在时创建"""
+        ids: List[int] = []
+        for name in names:
+            tag_id = self._tags.get(name.lower()) or self._tags.get(slugify(name, 50))
+            if tag_id is None:
+                tag = Tag(name=name[:50], slug=self._unique_slug(slugify(name, 50), self._tag_slugs, 50))
+                self._session.add(tag)
+                self._session.flush()
+                tag_id = self._tags[name.lower()] = self._tags[tag.slug] = tag.id
+                self.tags_created += 1
+            if tag_id not in ids:
+                ids.append(tag_id)
+        return ids
+
+    def category_id(self, path: Sequence[str]) -> Optional[int]:
+        """按层级路径解析分类，不存在的层级逐级创建"""
+        parent_id: Optional[int] = None
+        for name in path:
+            key = (parent_id, name.lower())
+            category_id = self._categories.get(key)
+            if category_id is None:
+                category = Category(
+                    name=name[:100],
+                    slug=self._unique_slug(slugify(name), self._category_slugs, 100),
+                    parent_id=parent_id,
+                )
+                self._session.add(category)
+                self._session.flush()
+                category_id = self._categories[key] = category.id
+                self.categories_created += 1
+            parent_id = category_id
+        return parent_id
+
+
+def _insert_batch(
+    session: Session,
+    parsed: List[ParsedPost],
+    slug_map: SlugMap,
+    author_ids: Dict[str, int],
+    default_author_id: int,
+) -> None:
+    """批量写入一批文章及其标签关联与派生内容"""
+    now = datetime.now(timezone.utc)
+    rows = []
+    for item in parsed:
+        created_at = item.created_at or now
+        rows.append({
+            "title": item.title,
+            "slug": item.slug,
+            "content_markdown": item.content_markdown,
+            "excerpt": item.excerpt,
+            "meta_description": item.meta_description,
+            "featured_image": item.featured_image,
+            "is_published": item.is_published,
+            "published_at": created_at if item.is_published else None,
+            "view_count": 0,
+            "reading_time_minutes": item.reading_time_minutes,
+            "author_id": author_ids.get((item.author or "").lower(), default_author_id),
+            "category_id": slug_map.category_id(item.category_path),
+            "created_at": created_at,
+            "updated_at": item.updated_at or created_at,
+        })
+
+    # 按 slug 对应 ID：要求 RETURNING 保持参数顺序会让 SQLite 退化为逐行插入
+    ids_by_slug = dict(
+        session.execute(insert(post_table).returning(post_table.c.slug, post_table.c.id), rows).all()
+    )
+    post_ids = [ids_by_slug[item.slug] for item in parsed]
+
+    tag_rows = [
+        {"post_id": post_id, "tag_id": tag_id}
+        for post_id, item in zip(post_ids, parsed)
+        for tag_id in slug_map.tag_ids(item.tags)
+    ]
+    if tag_rows:
+        session.execute(insert(post_tag_association), tag_rows)
+    session.execute(
+        insert(derived_table),
+        [{"post_id": post_id, **item.derived} for post_id, item in zip(post_ids, parsed)],
+    )
+
+
+def import_posts(
+    session: Session,
+    directory: str,
+    author: Optional[str] = None,
+    workers: Optional[int] = None,
+    batch_size: int = 1000,
+    on_batch: Optional[Callable[[int, float], None]] = None,
+) -> ImportReport:
+    """
+    导入目录下的 Markdown 文章
+
+    Args:
+        session: 数据库会话（每批提交一次）
+        directory: 文章目录
+        author: 默认作者用户名（front matter 未指定作者时使用），默认为主管理员
+        workers: 解析进程数，默认 CPU 数；0 或 1 表示在当前进程中解析
+        batch_size: 每个事务写入的文章数
+        on_batch: 每批提交后的回调 (累计导入数, 已用秒数)
+
+    Raises:
+        ValueError: 目录不存在或找不到默认作者
+    """
+    if not os.path.isdir(directory):
+        raise ValueError(f"目录不存在: {directory}")
+
+    start = time.perf_counter()
+    author_ids = {
+        username.lower(): user_id
+        for user_id, username in session.execute(select(BackendUser.id, BackendUser.username))
+    }
+    if author is not None:
+        default_author_id = author_ids.get(author.lower())
+    else:
+        primary = BackendUser.get_primary_author(session)
+        default_author_id = primary.id if primary is not None else None
+    if default_author_id is None:
+        raise ValueError(f"找不到默认作者: {author or '（主管理员）'}")
+
+    existing_slugs = set(session.scalars(select(Post.slug)))
+    slug_map = SlugMap(session)
+    files = imported = 0
+    skipped: List[str] = []
+    failed: List[Tuple[str, str]] = []
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    executor: Executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else _InlineExecutor()
+
+    def submit(paths: List[str]) -> List[Future]:
+        return [
+            executor.submit(_parse_chunk, paths[offset:offset + PARSE_CHUNK_SIZE])
+            for offset in range(0, len(paths), PARSE_CHUNK_SIZE)
+        ]
+
+    def write(futures: List[Future]) -> None:
+        nonlocal files, imported
+        batch: List[ParsedPost] = []
+        for future in futures:
+            for path, parsed, error in future.result():
+                files += 1
+                if parsed is None:
+                    failed.append((path, error))
+                elif parsed.slug in existing_slugs:
+                    skipped.append(path)
+                else:
+                    existing_slugs.add(parsed.slug)
+                    batch.append(parsed)
+        if batch:
+            _insert_batch(session, batch, slug_map, author_ids, default_author_id)
+            session.commit()
+            imported += len(batch)
+        if on_batch is not None:
+            on_batch(imported, time.perf_counter() - start)
+
+    try:
+        # 写入当前批的同时，下一批已在进程池中解析
+        pending: Optional[List[Future]] = None
+        for paths in _chunks(iter_markdown_files(directory), batch_size):
+            upcoming = submit(paths)
+            if pending is not None:
+                write(pending)
+            pending = upcoming
+        if pending is not None:
+            write(pending)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    if imported:
+        # 批量插入绕过了计数维护事件
+        reconcile_counters(session)
+        session.commit()
+
+    return ImportReport(
+        files=files,
+        imported=imported,
+        skipped=skipped,
+        failed=failed,
+        categories_created=slug_map.categories_created,
+        tags_created=slug_map.tags_created,
+        seconds=time.perf_counter() - start,
+    )
@@ -0,0 +1,280 @@
+"""
+文章列表查询与轻量投影
+
+列表、归档、标签页、分类页只需要标题、摘要等少量字段：
+- 只加载 LIST_COLUMNS（正文列在模型上已 deferred，这里连其它大字段也不取）
+- tags / category / author 通过 selectinload 各用一条 IN 查询批量加载，且只取展示字段，
+  避免逐行懒加载（N+1）
+- 结果转换为带 __slots__ 的 PostSummary，不再持有 ORM 对象
+- 分页使用 (published_at, id) 游标，深页与首页代价相同
+"""
+
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import exists, select
+from sqlalchemy.orm import load_only, selectinload
+
+from ..core.pagination import KeysetPage, paginate_keyset
+from ..models.category import Category, category_closure
+from ..models.post import Post, post_tag_association
+from ..models.tag import Tag
+from ..models.user import BackendUser
+
+# 列表排序键（倒序），与 ix_post_*_published 系列部分索引的列顺序一致
+LIST_ORDER = (Post.published_at, Post.id)
+
+# 列表页需要的文章字段
+LIST_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.slug,
+    Post.excerpt,
+    Post.featured_image,
+    Post.is_published,
+    Post.published_at,
+    Post.updated_at,
+    Post.reading_time_minutes,
+    Post.view_count,
+    Post.category_id,
+    Post.author_id,
+)
+
+
+def post_list_options() -> tuple:
+    """列表查询的加载选项：投影字段 + 关联对象批量预加载"""
+    return (
+        load_only(*LIST_COLUMNS),
+        selectinload(Post.tags).load_only(Tag.id, Tag.name, Tag.slug, Tag.color),
+        selectinload(Post.category).load_only(
+            Category.id, Category.name, Category.slug, Category.color
+        ),
+        selectinload(Post.author).load_only(
+            BackendUser.id, BackendUser.username, BackendUser.display_name, BackendUser.avatar_url
+        ),
+    )
+
+
+class TagRef(NamedTuple):
+    """列表中展示的标签"""
+
+    id: int
+    name: str
+    slug: str
+    color: Optional[str]
+
+
+class CategoryRef(NamedTuple):
+    """列表中展示的分类"""
+
+    id: int
+    name: str
+    slug: str
+    color: Optional[str]
+
+
+class AuthorRef(NamedTuple):
+    """列表中展示的作者"""
+
+    id: int
+    username: str
+    display_name: str
+    avatar_url: Optional[str]
+
+
+class PostSummary:
+    """文章摘要行（列表/归档/标签页/分类页使用）"""
+
+    __slots__ = (
+        "id", "title", "slug", "excerpt", "featured_image", "published_at",
+        "updated_at", "reading_time_minutes", "view_count", "category", "author", "tags",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        title: str,
+        slug: str,
+        excerpt: Optional[str],
+        featured_image: Optional[str],
+        published_at: Optional[datetime],
+        updated_at: Optional[datetime],
+        reading_time_minutes: Optional[int],
+        view_count: int,
+        category: Optional[CategoryRef],
+        author: Optional[AuthorRef],
+        tags: Sequence[TagRef],
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.slug = slug
+        self.excerpt = excerpt
+        self.featured_image = featured_image
+        self.published_at = published_at
+        self.updated_at = updated_at
+        self.reading_time_minutes = reading_time_minutes
+        self.view_count = view_count
+        self.category = category
+        self.author = author
+        self.tags = tuple(tags)
+
+    @classmethod
+    def from_post(cls, post: Post) -> "PostSummary":
+        """从以 post_list_options() 加载的 Post 构建"""
+        category = post.category
+        author = post.author
+        return cls(
+            id=post.id,
+            title=post.title,
+            slug=post.slug,
+            excerpt=post.excerpt,
+            featured_image=post.featured_image,
+            published_at=post.published_at,
+            updated_at=post.updated_at,
+            reading_time_minutes=post.reading_time_minutes,
+            view_count=post.view_count,
+            category=(
+                CategoryRef(category.id, category.name, category.slug, category.color)
+                if category is not None else None
+            ),
+            author=(
+                AuthorRef(author.id, author.username, author.display_name, author.avatar_url)
+                if author is not None else None
+            ),
+            tags=sorted(
+                (TagRef(tag.id, tag.name, tag.slug, tag.color) for tag in post.tags),
+                key=lambda tag: tag.name,
+            ),
+        )
+
+    def to_dict(self) -> dict:
+        """转换为可序列化的字典"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "slug": self.slug,
+            "excerpt": self.excerpt,
+            "featured_image": self.featured_image,
+            "published_at": self.published_at,
+            "updated_at": self.updated_at,
+            "reading_time_minutes": self.reading_time_minutes,
+            "view_count": self.view_count,
+            "category": self.category._asdict() if self.category else None,
+            "author": self.author._asdict() if self.author else None,
+            "tags": [tag._asdict() for tag in self.tags],
+        }
+
+    def __repr__(self) -> str:
+        return f"<PostSummary(id={self.id}, slug='{self.slug}')>"
+
+
+# --- 列表查询构造 ---
+
+def published_posts_query():
+    """已发布文章（排序键 published_at 不能为空）"""
+    return (
+        select(Post)
+        .where(Post.is_published == True)
+        .where(Post.published_at.is_not(None))
+    )
+
+
+def posts_by_tag_query(tag_id: int):
+    """某标签下的已发布文章"""
+    return published_posts_query().where(
+        exists()
+        .where(post_tag_association.c.post_id == Post.id)
+        .where(post_tag_association.c.tag_id == tag_id)
+    )
+
+
+def posts_by_category_query(category_id: int, include_descendants: bool = True):
+    """某分类（默认含所有子分类）下的已发布文章"""
+    if not include_descendants:
+        return published_posts_query().where(Post.category_id == category_id)
+    return published_posts_query().where(
+        Post.category_id.in_(
+            select(category_closure.c.descendant_id)
+            .where(category_closure.c.ancestor_id == category_id)
+        )
+    )
+
+
+def posts_by_author_query(author_id: int):
+    """某作者的已发布文章"""
+    return published_posts_query().where(Post.author_id == author_id)
+
+
+def archive_query(year: int, month: Optional[int] = None):
+    """按发布年份（及月份）归档"""
+    if month is None:
+        start = datetime(year, 1, 1, tzinfo=timezone.utc)
+        end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    else:
+        start = datetime(year, month, 1, tzinfo=timezone.utc)
+        end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return (
+        published_posts_query()
+        .where(Post.published_at >= start)
+        .where(Post.published_at < end)
+    )
+
+
+def _list_key(post: Post) -> Tuple:
+    return post.published_at, post.id
+
+
+def fetch_post_summaries(session, statement, limit: int = 20) -> List[PostSummary]:
+    """
+    取最新的若干篇文章（按发布时间倒序，不分页）
+
+    Args:
+        session: 同步数据库会话（异步路由中通过 AsyncSession.run_sync 调用）
+        statement: 上面构造的 select(Post) 查询
+        limit: 返回数量
+
+    Returns:
+        PostSummary 列表
+    """
+    posts = session.scalars(
+        statement
+        .options(*post_list_options())
+        .order_by(*(key.desc() for key in LIST_ORDER))
+        .limit(limit)
+    ).all()
+    return [PostSummary.from_post(post) for post in posts]
+
+
+def paginate_post_summaries(
+    session,
+    statement,
+    limit: int = 20,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> KeysetPage:
+    """
+    按 (published_at, id) 游标分页取文章摘要
+
+    Args:
+        session: 同步数据库会话（异步路由中通过 AsyncSession.run_sync 调用）
+        statement: 上面构造的 select(Post) 查询
+        limit: 每页数量
+        after: 下一页游标
+        before: 上一页游标
+
+    Returns:
+        items 为 PostSummary 的 KeysetPage
+
+    Raises:
+        InvalidCursor: 游标格式错误
+    """
+    page = paginate_keyset(
+        session,
+        statement.options(*post_list_options()),
+        LIST_ORDER,
+        _list_key,
+        limit=limit,
+        after=after,
+        before=before,
+    )
+    return page._replace(items=[PostSummary.from_post(post) for post in page.items])
@@ -0,0 +1,143 @@
+"""
+已认证用户信息（Principal）缓存
+
+JWT 校验只做本地计算；令牌中的用户ID 再解析为 Principal（id、用户名、is_admin、is_author、is_active），
+按用户ID 存放在进程内的短 TTL LRU 中，已认证请求通常不需要查询 backend_user 表：
+- 未命中时只查询这几列，不加载 BackendUser 对象
+- 通过 ORM 修改或删除用户时，事务提交后立即失效对应条目
+- 其它进程或绕过 ORM 的修改依赖 PRINCIPAL_CACHE_TTL 过期
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..core.security import Principal
+from ..models.user import BackendUser
+
+_PRINCIPAL_COLUMNS = (
+    BackendUser.id,
+    BackendUser.username,
+    BackendUser.is_admin,
+    BackendUser.is_author,
+    BackendUser.is_active,
+)
+
+
+class PrincipalCache:
+    """
+    按用户ID 缓存 Principal 的 LRU（带 TTL）
+
+    Args:
+        ttl: 条目有效期（秒）
+        max_entries: 最多条目数
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 1024) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[Principal, float]]" = OrderedDict()
+        # 每次失效递增；查询期间发生失效时不写入查询结果，避免缓存旧数据
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def set(self, principal: Principal, generation: Optional[int] = None) -> None:
+        """写入条目；generation 与当前不一致（查询期间发生过失效）时忽略"""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[principal.id] = (principal, time.monotonic() + self._ttl)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.principal_cache_ttl,
+    max_entries=settings.principal_cache_max_entries,
+)
+
+
+async def get_principal(user_id: int) -> Optional[Principal]:
+    """
+    获取用户的 Principal（优先读缓存）
+
+    Returns:
+        用户不存在时返回 None（不缓存）；是否停用由调用方判断
+    """
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    generation = principal_cache.generation
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(
+            select(*_PRINCIPAL_COLUMNS).where(BackendUser.id == user_id)
+        )).first()
+    if row is None:
+        return None
+    principal = Principal(*row)
+    principal_cache.set(principal, generation)
+    return principal
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_ids(session, flush_context):
+    """记录本事务修改或删除的用户"""
+    user_ids = {
+        obj.id
+        for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, BackendUser) and obj.id is not None
+    }
+    if user_ids:
+        session.info.setdefault("principal_ids", set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session):
+    """事务提交后使缓存的 Principal 失效"""
+    user_ids = session.info.pop("principal_ids", None)
+    if user_ids:
+        principal_cache.invalidate(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_principal_ids(session):
+    """事务回滚时丢弃记录"""
+    session.info.pop("principal_ids", None)
@@ -0,0 +1,144 @@
+"""
+常用查询的执行计划检查
+
+对列表、归档、标签云等高频查询执行 EXPLAIN QUERY PLAN（SQLite），
+以下情况视为索引缺失或失效：
+- 整表扫描：计划中出现不带索引的 SCAN
+- 列表查询需要额外排序（USE TEMP B-TREE FOR ORDER BY），即没有按 (published_at, id) 顺序的索引可用
+
+用于添加/调整索引后的回归检查：python -m app.cli check-query-plans
+"""
+
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple
+
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection
+
+from ..models.post import Post, post_tag_association
+from ..models.tag import Tag
+from .post_queries import (
+    LIST_ORDER,
+    archive_query,
+    posts_by_author_query,
+    posts_by_category_query,
+    posts_by_tag_query,
+    published_posts_query,
+)
+
+# 以 :name 形式编译参数，便于直接交给 DBAPI 执行 EXPLAIN
+_dialect = sqlite.dialect(paramstyle="named")
+
+_SAMPLE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _listing(statement):
+    """列表页：按 (published_at, id) 倒序取一页"""
+    return statement.order_by(*(key.desc() for key in LIST_ORDER)).limit(21)
+
+
+def _keyset_page(statement):
+    """列表的后续页：带游标条件"""
+    bound = tuple_(
+        literal(_SAMPLE_TIME, type_=Post.published_at.type),
+        literal(1, type_=Post.id.type),
+    )
+    return _listing(statement.where(tuple_(*LIST_ORDER) < bound))
+
+
+def _tag_cloud(*conditions):
+    statement = select(Tag).where(Tag.is_active == True)
+    for condition in conditions:
+        statement = statement.where(condition)
+    return statement.order_by(Tag.usage_count.desc()).limit(10)
+
+
+# 名称 -> 查询构造函数（与实际业务查询保持同一来源）
+CANONICAL_QUERIES: Dict[str, Callable] = {
+    "文章列表": lambda: _listing(published_posts_query()),
+    "文章列表（翻页）": lambda: _keyset_page(published_posts_query()),
+    "分类归档": lambda: _listing(posts_by_category_query(1)),
+    "分类归档（仅本分类）": lambda: _listing(posts_by_category_query(1, include_descendants=False)),
+    "标签归档": lambda: _listing(posts_by_tag_query(1)),
+    "作者文章": lambda: _listing(posts_by_author_query(1)),
+    "按月归档": lambda: _listing(archive_query(2024, 1)),
+    "热门标签": lambda: _tag_cloud(),
+    "趋势标签": lambda: _tag_cloud(Tag.usage_count >= 3),
+    "推荐标签": lambda: _tag_cloud(Tag.is_featured == True),
+    "标签文章数": lambda: (
+        select(post_tag_association.c.tag_id, func.count(Post.id))
+        .join(Post, Post.id == post_tag_association.c.post_id)
+        .where(post_tag_association.c.tag_id.in_([1, 2, 3]))
+        .where(Post.is_published == True)
+        .group_by(post_tag_association.c.tag_id)
+    ),
+}
+
+
+# 允许额外排序的查询：多个分类的结果需要合并排序（排序量只是该子树下的文章数）
+SORT_ALLOWED = frozenset({"分类归档"})
+
+
+class PlanReport(NamedTuple):
+    """单个查询的执行计划"""
+
+    name: str
+    plan: List[str]
+    problems: List[str]
+
+
+def _find_problems(name: str, plan: List[str]) -> List[str]:
+    problems = []
+    for line in plan:
+        detail = line.strip()
+        # "SCAN post" 为整表扫描；"SCAN post USING INDEX ..." 是按索引顺序读取，
+        # 配合 LIMIT 只读取一页，不算整表扫描
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            problems.append(detail)
+        elif detail == "USE TEMP B-TREE FOR ORDER BY" and name not in SORT_ALLOWED:
+            problems.append(detail)
+    return problems
+
+
+def explain(connection: Connection, statement) -> List[str]:
+    """
+    获取查询的 EXPLAIN QUERY PLAN 结果
+
+    Args:
+        connection: SQLite 数据库连接
+        statement: select 语句
+
+    Returns:
+        每个计划步骤的描述（子步骤按层级缩进）
+    """
+    compiled = statement.compile(dialect=_dialect, compile_kwargs={"render_postcompile": True})
+    params = {
+        key: value.isoformat(" ") if isinstance(value, datetime) else value
+        for key, value in compiled.params.items()
+    }
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+
+    depth = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def check_query_plans(connection: Connection) -> List[PlanReport]:
+    """
+    检查所有常用查询的执行计划
+
+    Args:
+        connection: SQLite 数据库连接（需已建表）
+
+    Returns:
+        每个查询的 PlanReport；problems 非空表示该查询没有用上合适的索引
+    """
+    reports = []
+    for name, build in CANONICAL_QUERIES.items():
+        plan = explain(connection, build())
+        reports.append(PlanReport(name, plan, _find_problems(name, plan)))
+    return reports
@@ -0,0 +1,139 @@
+"""
+文章搜索子系统
+
+后端由 SEARCH_BACKEND 配置选择，auto 时：SQLite 且支持 FTS5 使用 Fts5SearchBackend，
+否则使用进程内倒排索引 InvertedIndexBackend。LikeSearchBackend 仅作对照与兜底。
+"""
+
+from typing import Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+from ...core.database import ReadSessionLocal, write_engine
+from ...models.base import Base
+from ...models.post import Post
+from .base import SearchBackend, SearchFilters, SearchHit
+from .fts5 import Fts5SearchBackend, fts5_available, install_fts5_schema
+from .inverted import InvertedIndexBackend
+from .like import LikeSearchBackend
+
+__all__ = [
+    "SearchBackend",
+    "SearchFilters",
+    "SearchHit",
+    "Fts5SearchBackend",
+    "InvertedIndexBackend",
+    "LikeSearchBackend",
+    "get_search_backend",
+    "save_search_index",
+    "warm_up_search_index",
+]
+
+_backend: Optional[SearchBackend] = None
+
+# 影响进程内索引内容的文章字段
+_INDEXED_FIELDS = ("title", "content_markdown")
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_schema(target, connection, **kw):
+    """create_all 之后创建 FTS5 索引表与触发器"""
+    install_fts5_schema(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_schema(target, connection, **kw):
+    """drop_all 之前删除 FTS5 索引表"""
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS post_fts")
+
+
+def _create_backend() -> SearchBackend:
+    """根据配置与数据库能力创建搜索后端"""
+    choice = settings.search_backend
+    if choice == "like":
+        return LikeSearchBackend()
+    if choice == "inverted":
+        return InvertedIndexBackend(settings.search_snapshot_path)
+
+    with write_engine.connect() as connection:
+        use_fts5 = fts5_available(connection)
+    if use_fts5:
+        return Fts5SearchBackend()
+    if choice == "fts5":
+        raise RuntimeError("当前数据库不支持 FTS5，无法使用 SEARCH_BACKEND=fts5")
+    return InvertedIndexBackend(settings.search_snapshot_path)
+
+
+def get_search_backend() -> SearchBackend:
+    """获取当前数据库可用的搜索后端（进程内单例）"""
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+
+def warm_up_search_index() -> SearchBackend:
+    """创建搜索后端并预先加载索引（应用启动时在线程池中调用）"""
+    backend = get_search_backend()
+    with ReadSessionLocal() as db:
+        backend.warm_up(db)
+    return backend
+
+
+def save_search_index() -> None:
+    """持久化进程内索引（应用关闭时调用，未创建后端时不做任何事）"""
+    if _backend is not None:
+        _backend.save()
+
+
+# --- 会话事件：提交后增量更新进程内索引 ---
+
+@event.listens_for(Session, "after_flush")
+def _collect_search_changes(session, flush_context):
+    """记录本次 flush 中需要重新索引或移除的文章"""
+    if _backend is None or not _backend.maintains_index:
+        return
+
+    changes = session.info.setdefault("search_changes", {})
+    for post in session.deleted:
+        if isinstance(post, Post):
+            changes[post.id] = None
+
+    for post in (*session.new, *session.dirty):
+        if not isinstance(post, Post):
+            continue
+        state = inspect(post)
+        if post not in session.new and not any(
+            state.attrs[key].history.has_changes() for key in _INDEXED_FIELDS
+        ):
+            continue
+        if any(key in state.unloaded for key in _INDEXED_FIELDS):
+            row = session.connection().execute(
+                select(Post.title, Post.content_markdown).where(Post.id == post.id)
+            ).one()
+            changes[post.id] = (row.title, row.content_markdown)
+        else:
+            changes[post.id] = (post.title, post.content_markdown)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_search_changes(session):
+    """事务提交后把变化应用到进程内索引"""
+    changes = session.info.pop("search_changes", None)
+    if not changes or _backend is None:
+        return
+    for post_id, document in changes.items():
+        if document is None:
+            _backend.remove_post(post_id)
+        else:
+            # 版本留空：下次启动同步时以数据库中的 updated_at 为准
+            _backend.index_post(post_id, *document)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_search_changes(session):
+    """事务回滚时丢弃未提交的变化"""
+    session.info.pop("search_changes", None)
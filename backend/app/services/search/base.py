@@ -0,0 +1,148 @@
+"""
+搜索后端接口与公共工具
+"""
+
+import html
+import re
+from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import exists, select
+
+from ...models.category import category_closure
+from ...models.post import Post, post_tag_association
+from ...models.tag import Tag
+
+# 高亮标记：先用私有区字符占位，转义 HTML 后再替换为 <mark>
+HIGHLIGHT_OPEN = "\ue000"
+HIGHLIGHT_CLOSE = "\ue001"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class SearchFilters(NamedTuple):
+    """搜索过滤条件"""
+
+    category_id: Optional[int] = None  # 包含所有子分类
+    tag_slug: Optional[str] = None
+    published: Optional[bool] = True  # None 表示不过滤发布状态
+
+
+class SearchHit(NamedTuple):
+    """单条搜索结果"""
+
+    post_id: int
+    title: str
+    slug: str
+    snippet: str  # 已转义的 HTML，命中词用 <mark> 包裹
+    score: float  # 越大越相关
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+class SearchBackend(ABC):
+    """
+    搜索后端接口
+
+    由数据库触发器维护索引的后端（FTS5）无需实现 index_post / remove_post；
+    进程内索引（maintains_index = True）在文章写入提交后由会话事件增量更新。
+    """
+
+    name = "base"
+    maintains_index = False
+
+    @abstractmethod
+    def search(
+        self,
+        session,
+        query: str,
+        filters: SearchFilters = SearchFilters(),
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[SearchHit]:
+        """执行搜索，结果按相关度降序"""
+
+    @abstractmethod
+    def rebuild(self, session) -> int:
+        """全量重建索引，返回索引的文章数"""
+
+    def index_post(self, post_id: int, title: Optional[str], content: Optional[str], version=None) -> None:
+        """新增或更新单篇文章的索引"""
+
+    def remove_post(self, post_id: int) -> None:
+        """从索引中移除单篇文章"""
+
+    def save(self) -> None:
+        """持久化索引（应用关闭时调用）"""
+
+    def warm_up(self, session) -> None:
+        """预先加载索引（应用启动时调用，避免第一个搜索请求承担加载开销）"""
+
+
+def split_terms(query: str) -> List[str]:
+    """按空白拆分查询词（去掉 FTS 语法中的双引号）"""
+    return [term for term in _WHITESPACE.split(query.replace('"', " ").strip()) if term]
+
+
+def apply_post_filters(statement, filters: SearchFilters):
+    """为针对 Post 的查询附加过滤条件"""
+    if filters.published is not None:
+        statement = statement.where(Post.is_published == filters.published)
+    if filters.category_id is not None:
+        statement = statement.where(
+            Post.category_id.in_(
+                select(category_closure.c.descendant_id)
+                .where(category_closure.c.ancestor_id == filters.category_id)
+            )
+        )
+    if filters.tag_slug is not None:
+        statement = statement.where(
+            exists()
+            .where(post_tag_association.c.post_id == Post.id)
+            .where(post_tag_association.c.tag_id == Tag.id)
+            .where(Tag.slug == filters.tag_slug)
+        )
+    return statement
+
+
+def render_highlight(marked_text: str) -> str:
+    """把带占位标记的纯文本转成安全的高亮 HTML"""
+    return (
+        html.escape(marked_text)
+        .replace(HIGHLIGHT_OPEN, "<mark>")
+        .replace(HIGHLIGHT_CLOSE, "</mark>")
+    )
+
+
+def make_snippet(text: Optional[str], terms: Sequence[str], width: int = 80) -> str:
+    """
+    在纯文本中截取包含第一个命中词的片段并高亮所有命中词
+
+    Args:
+        text: 原文
+        terms: 查询词
+        width: 片段大致长度（字符）
+    """
+    if not text:
+        return ""
+    lowered = text.lower()
+    positions = [lowered.find(term.lower()) for term in terms if term]
+    positions = [position for position in positions if position >= 0]
+    first = min(positions) if positions else 0
+
+    start = max(0, first - width // 3)
+    end = min(len(text), start + width)
+    fragment = text[start:end]
+
+    pattern = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True) if term)
+    if pattern:
+        fragment = re.sub(
+            pattern,
+            lambda match: f"{HIGHLIGHT_OPEN}{match.group(0)}{HIGHLIGHT_CLOSE}",
+            fragment,
+            flags=re.IGNORECASE,
+        )
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(text) else ""
+    return render_highlight(prefix + fragment + suffix)
@@ -0,0 +1,201 @@
+"""
+SQLite FTS5 全文搜索后端
+
+- post_fts 为外部内容表（content='post'），只存倒排索引，不重复存正文
+- 使用 trigram 分词器：按 3 字符切分，中文无需分词即可做子串匹配
+- post 表上的触发器在插入/删除/更新标题、摘要、正文时同步索引
+- 相关度使用 bm25()，标题权重最高；片段高亮使用 snippet()
+
+trigram 分词下少于 3 个字符的查询词（例如常见的双字中文词）无法走 MATCH，
+这些词退化为在 post_fts 上做 LIKE 子串过滤。
+"""
+
+from typing import List
+
+from sqlalchemy import column, func, literal_column, or_, select, table, text
+
+from ...models.post import Post
+from .base import (
+    HIGHLIGHT_CLOSE,
+    HIGHLIGHT_OPEN,
+    SearchBackend,
+    SearchFilters,
+    SearchHit,
+    apply_post_filters,
+    make_snippet,
+    render_highlight,
+    split_terms,
+)
+
+# trigram 分词器的最小可匹配长度
+TRIGRAM_LENGTH = 3
+
+# bm25 列权重：title, excerpt, content_markdown
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+FTS5_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS post_fts USING fts5(
+        title, excerpt, content_markdown,
+        content='post', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_fts_after_insert AFTER INSERT ON post BEGIN
+        INSERT INTO post_fts(rowid, title, excerpt, content_markdown)
+        VALUES (new.id, new.title, new.excerpt, new.content_markdown);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_fts_after_delete AFTER DELETE ON post BEGIN
+        INSERT INTO post_fts(post_fts, rowid, title, excerpt, content_markdown)
+        VALUES ('delete', old.id, old.title, old.excerpt, old.content_markdown);
+    END
+    """,
+    # 只在被索引的列变化时触发，浏览量等字段的更新不会重写索引
+    """
+    CREATE TRIGGER IF NOT EXISTS post_fts_after_update
+    AFTER UPDATE OF title, excerpt, content_markdown ON post BEGIN
+        INSERT INTO post_fts(post_fts, rowid, title, excerpt, content_markdown)
+        VALUES ('delete', old.id, old.title, old.excerpt, old.content_markdown);
+        INSERT INTO post_fts(rowid, title, excerpt, content_markdown)
+        VALUES (new.id, new.title, new.excerpt, new.content_markdown);
+    END
+    """,
+)
+
+post_fts = table(
+    "post_fts",
+    column("rowid"),
+    column("title"),
+    column("excerpt"),
+    column("content_markdown"),
+)
+_fts_table = literal_column("post_fts")
+
+
+def fts5_available(connection) -> bool:
+    """当前 SQLite 是否支持 FTS5 trigram 分词器"""
+    if connection.dialect.name != "sqlite":
+        return False
+    try:
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x, tokenize='trigram')"
+        )
+        connection.exec_driver_sql("DROP TABLE temp.fts5_probe")
+    except Exception:
+        return False
+    return True
+
+
+def install_fts5_schema(connection) -> bool:
+    """
+    创建 FTS5 虚拟表与同步触发器（幂等）
+
+    新建索引表时如果 post 表已有数据，会立即全量构建索引。
+
+    Returns:
+        是否安装成功（不支持 FTS5 时返回 False）
+    """
+    if not fts5_available(connection):
+        return False
+
+    existed = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'post_fts'"
+    ).first() is not None
+    for statement in FTS5_SCHEMA:
+        connection.exec_driver_sql(statement)
+    if not existed:
+        connection.exec_driver_sql("INSERT INTO post_fts(post_fts) VALUES ('rebuild')")
+    return True
+
+
+def _quote(term: str) -> str:
+    """把查询词包装为 FTS5 短语，避免用户输入被解析为查询语法"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+class Fts5SearchBackend(SearchBackend):
+    """基于 SQLite FTS5 的搜索后端（索引由触发器维护）"""
+
+    name = "fts5"
+
+    def search(
+        self,
+        session,
+        query: str,
+        filters: SearchFilters = SearchFilters(),
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[SearchHit]:
+        terms = split_terms(query)
+        if not terms:
+            return []
+
+        match_terms = [term for term in terms if len(term) >= TRIGRAM_LENGTH]
+        short_terms = [term for term in terms if len(term) < TRIGRAM_LENGTH]
+
+        if match_terms:
+            score = func.bm25(_fts_table, *BM25_WEIGHTS)
+            snippet = func.snippet(_fts_table, -1, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, "…", 24)
+        else:
+            score = literal_column("0.0")
+            snippet = literal_column("NULL")
+
+        # 只有无法使用 snippet() 时才需要取回正文，在 Python 中生成片段
+        needs_text = bool(short_terms) or not match_terms
+        columns = [
+            Post.id,
+            Post.title,
+            Post.slug,
+            snippet.label("snippet"),
+            score.label("score"),
+        ]
+        if needs_text:
+            columns.append(post_fts.c.content_markdown)
+
+        statement = (
+            select(*columns)
+            .select_from(post_fts)
+            .join(Post, Post.id == post_fts.c.rowid)
+        )
+        if match_terms:
+            statement = statement.where(
+                _fts_table.op("MATCH")(" ".join(_quote(term) for term in match_terms))
+            )
+        for term in short_terms:
+            pattern = f"%{term}%"
+            statement = statement.where(
+                or_(
+                    post_fts.c.title.like(pattern),
+                    post_fts.c.excerpt.like(pattern),
+                    post_fts.c.content_markdown.like(pattern),
+                )
+            )
+
+        statement = apply_post_filters(statement, filters)
+        # bm25() 越小越相关
+        statement = statement.order_by(text("score"), Post.published_at.desc())
+        statement = statement.limit(limit).offset(offset)
+
+        hits = []
+        for row in session.execute(statement):
+            if needs_text:
+                snippet_html = make_snippet(row.content_markdown, terms)
+            else:
+                snippet_html = render_highlight(row.snippet)
+            hits.append(
+                SearchHit(
+                    post_id=row.id,
+                    title=row.title,
+                    slug=row.slug,
+                    snippet=snippet_html,
+                    score=0.0 - float(row.score),
+                )
+            )
+        return hits
+
+    def rebuild(self, session) -> int:
+        session.execute(text("INSERT INTO post_fts(post_fts) VALUES ('rebuild')"))
+        return session.scalar(select(func.count(Post.id)))
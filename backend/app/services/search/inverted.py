@@ -0,0 +1,434 @@
+"""
+进程内倒排索引搜索后端（纯 Python，不依赖 FTS5）
+
+- 拉丁字母/数字按单词切分；中文（CJK）连续文本切成二元组（bigram），单字成词
+- 倒排表按词项存放两个紧凑数组：升序文档ID array('I') 与词频 array('H')
+- 文章写入后由会话事件增量更新（见 search/__init__.py），不需要重建
+- 索引定期保存为快照文件；启动时加载快照，只重新切分 updated_at 变化过的文章
+
+bigram 求交集可能产生“词组不相邻”的误命中，因此候选文章在取回正文后
+还会做一次子串校验，最终结果与 LIKE '%q%' 的语义一致（拉丁单词按整词匹配）。
+索引只感知本进程内的写入，多进程部署时其它进程的修改要到重启同步后才可见。
+"""
+
+import logging
+import math
+import os
+import pickle
+import re
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from ...models.post import Post
+from .base import (
+    SearchBackend,
+    SearchFilters,
+    SearchHit,
+    apply_post_filters,
+    make_snippet,
+    split_terms,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# 标题中的词项按该倍数计入词频
+TITLE_WEIGHT = 5
+
+# 词频上限（array('H') 可表示的最大值）
+MAX_TERM_FREQUENCY = 0xFFFF
+
+# 候选数 * 该比例不小于倒排表长度时改为顺序扫描求交集
+DENSE_RATIO = 8
+
+# 候选文章分批回表校验的批大小
+CANDIDATE_BATCH_SIZE = 200
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_TOKEN_PATTERN = re.compile(rf"[{_CJK}]+|[^\W{_CJK}]+")
+_CJK_RUN = re.compile(rf"[{_CJK}]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    切分文本为词项（保留重复以便统计词频）
+
+    Args:
+        text: 原文
+
+    Returns:
+        词项列表：拉丁单词小写化，CJK 连续文本切成二元组
+    """
+    if not text:
+        return []
+    tokens: List[str] = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group(0)
+        if _CJK_RUN.fullmatch(token):
+            if len(token) == 1:
+                tokens.append(token)
+            else:
+                tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def _term_frequencies(title: Optional[str], content: Optional[str]) -> Dict[str, int]:
+    """统计一篇文章的词频（标题加权）"""
+    frequencies: Dict[str, int] = {}
+    # 驻留词项字符串：文档词项表与倒排表共享同一对象，内存与快照都更小
+    for token in map(sys.intern, tokenize(title)):
+        frequencies[token] = frequencies.get(token, 0) + TITLE_WEIGHT
+    for token in map(sys.intern, tokenize(content)):
+        frequencies[token] = frequencies.get(token, 0) + 1
+    return frequencies
+
+
+class _Postings:
+    """单个词项的倒排表（文档ID升序）"""
+
+    __slots__ = ("doc_ids", "frequencies")
+
+    def __init__(self) -> None:
+        self.doc_ids = array("I")
+        self.frequencies = array("H")
+
+    def add(self, doc_id: int, frequency: int) -> None:
+        frequency = min(frequency, MAX_TERM_FREQUENCY)
+        # 新文章ID通常最大，直接追加
+        if not self.doc_ids or self.doc_ids[-1] < doc_id:
+            self.doc_ids.append(doc_id)
+            self.frequencies.append(frequency)
+            return
+        position = bisect_left(self.doc_ids, doc_id)
+        if position < len(self.doc_ids) and self.doc_ids[position] == doc_id:
+            self.frequencies[position] = frequency
+        else:
+            self.doc_ids.insert(position, doc_id)
+            self.frequencies.insert(position, frequency)
+
+    def remove(self, doc_id: int) -> None:
+        position = bisect_left(self.doc_ids, doc_id)
+        if position < len(self.doc_ids) and self.doc_ids[position] == doc_id:
+            del self.doc_ids[position]
+            del self.frequencies[position]
+
+    def frequency(self, doc_id: int) -> int:
+        position = bisect_left(self.doc_ids, doc_id)
+        if position < len(self.doc_ids) and self.doc_ids[position] == doc_id:
+            return self.frequencies[position]
+        return 0
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def __getstate__(self):
+        return self.doc_ids, self.frequencies
+
+    def __setstate__(self, state) -> None:
+        self.doc_ids, self.frequencies = state
+
+
+class InvertedIndex:
+    """
+    线程安全的倒排索引
+
+    documents 记录每篇文章的版本（updated_at）与词项，删除/更新时据此清理倒排表。
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, _Postings] = {}
+        self._documents: Dict[int, Tuple[object, Tuple[str, ...]]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    @property
+    def versions(self) -> Dict[int, object]:
+        """文章ID -> 建立索引时的版本"""
+        with self._lock:
+            return {doc_id: version for doc_id, (version, _) in self._documents.items()}
+
+    def add(self, doc_id: int, title: Optional[str], content: Optional[str], version=None) -> None:
+        """新增或替换一篇文章的索引"""
+        frequencies = _term_frequencies(title, content)
+        with self._lock:
+            self._discard(doc_id)
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.add(doc_id, frequency)
+            self._documents[doc_id] = (version, tuple(frequencies))
+
+    def remove(self, doc_id: int) -> None:
+        """移除一篇文章"""
+        with self._lock:
+            self._discard(doc_id)
+
+    def _discard(self, doc_id: int) -> None:
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return
+        for term in document[1]:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.remove(doc_id)
+            if not postings:
+                del self._postings[term]
+
+    def _expand(self, token: str) -> List[_Postings]:
+        """
+        查询词项对应的倒排表
+
+        单个 CJK 字在正文中只以二元组出现，需要合并所有包含该字的二元组。
+        """
+        postings = self._postings.get(token)
+        if len(token) == 1 and _CJK_RUN.fullmatch(token):
+            related = [
+                self._postings[term]
+                for term in self._postings
+                if len(term) == 2 and token in term
+            ]
+            return ([postings] if postings is not None else []) + related
+        return [postings] if postings is not None else []
+
+    def rank(self, terms: Sequence[str]) -> List[int]:
+        """
+        返回包含全部查询词项的文章ID，按 tf-idf 得分降序
+
+        Args:
+            terms: 查询词（每个词再切分为词项，全部词项都需要命中）
+        """
+        tokens = list(dict.fromkeys(token for term in terms for token in tokenize(term)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            total = len(self._documents) or 1
+            groups = [self._expand(token) for token in tokens]
+            if any(not group for group in groups):
+                return []
+
+            # 从最短的倒排表开始求交集
+            groups.sort(key=lambda group: sum(len(postings) for postings in group))
+            scores: Dict[int, float] = {}
+            for index, group in enumerate(groups):
+                document_frequency = sum(len(postings) for postings in group)
+                idf = math.log(1 + total / document_frequency)
+                if index == 0:
+                    for postings in group:
+                        for doc_id, frequency in zip(postings.doc_ids, postings.frequencies):
+                            scores[doc_id] = scores.get(doc_id, 0.0) + frequency * idf
+                    continue
+
+                matched: Dict[int, int] = {}
+                for postings in group:
+                    if len(scores) * DENSE_RATIO >= len(postings):
+                        # 候选集合较大：顺序扫描倒排表比逐个二分查找更快
+                        for doc_id, frequency in zip(postings.doc_ids, postings.frequencies):
+                            if doc_id in scores:
+                                matched[doc_id] = matched.get(doc_id, 0) + frequency
+                    else:
+                        for doc_id in scores:
+                            frequency = postings.frequency(doc_id)
+                            if frequency:
+                                matched[doc_id] = matched.get(doc_id, 0) + frequency
+                scores = {
+                    doc_id: scores[doc_id] + frequency * idf
+                    for doc_id, frequency in matched.items()
+                }
+                if not scores:
+                    return []
+
+        return sorted(scores, key=scores.__getitem__, reverse=True)
+
+    def dump(self, path: str) -> None:
+        """原子地写入快照文件"""
+        with self._lock:
+            payload = {
+                "version": SNAPSHOT_VERSION,
+                "postings": self._postings,
+                "documents": self._documents,
+            }
+            data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["InvertedIndex"]:
+        """读取快照文件，文件不存在或格式不兼容时返回 None"""
+        try:
+            with open(path, "rb") as file:
+                payload = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("搜索索引快照无法读取，将重新构建: %s", path, exc_info=True)
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+            return None
+
+        index = cls()
+        index._postings = payload["postings"]
+        index._documents = payload["documents"]
+        return index
+
+
+def _contains_all(terms: Iterable[str], *texts: Optional[str]) -> bool:
+    """校验候选文章确实包含全部查询词（排除二元组不相邻造成的误命中）"""
+    haystack = "\n".join(text for text in texts if text).lower()
+    return all(term.lower() in haystack for term in terms)
+
+
+class InvertedIndexBackend(SearchBackend):
+    """
+    基于进程内倒排索引的搜索后端
+
+    Args:
+        snapshot_path: 快照文件路径，为 None 时不读写快照
+    """
+
+    name = "inverted"
+    maintains_index = True
+
+    def __init__(self, snapshot_path: Optional[str] = None) -> None:
+        self._snapshot_path = snapshot_path
+        self._index: Optional[InvertedIndex] = None
+        self._load_lock = threading.Lock()
+        self._dirty = False
+
+    def _get_index(self, session) -> InvertedIndex:
+        """首次使用时加载快照并与数据库同步"""
+        if self._index is not None:
+            return self._index
+        with self._load_lock:
+            if self._index is None:
+                index = None
+                if self._snapshot_path:
+                    index = InvertedIndex.load(self._snapshot_path)
+                if index is None:
+                    index = InvertedIndex()
+                changed = self._sync(session, index)
+                self._index = index
+                if changed:
+                    self._dirty = True
+                    self.save()
+        return self._index
+
+    def _sync(self, session, index: InvertedIndex) -> int:
+        """
+        根据 updated_at 增量同步索引
+
+        Returns:
+            重新索引或移除的文章数
+        """
+        stored = dict(session.execute(select(Post.id, Post.updated_at)).all())
+        indexed = index.versions
+
+        removed = [doc_id for doc_id in indexed if doc_id not in stored]
+        for doc_id in removed:
+            index.remove(doc_id)
+
+        stale = [
+            doc_id for doc_id, version in stored.items()
+            if doc_id not in indexed or indexed[doc_id] != version
+        ]
+        for start in range(0, len(stale), CANDIDATE_BATCH_SIZE):
+            batch = stale[start:start + CANDIDATE_BATCH_SIZE]
+            rows = session.execute(
+                select(Post.id, Post.title, Post.content_markdown, Post.updated_at)
+                .where(Post.id.in_(batch))
+            )
+            for row in rows:
+                index.add(row.id, row.title, row.content_markdown, version=row.updated_at)
+        return len(removed) + len(stale)
+
+    def search(
+        self,
+        session,
+        query: str,
+        filters: SearchFilters = SearchFilters(),
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[SearchHit]:
+        terms = split_terms(query)
+        if not terms:
+            return []
+
+        index = self._get_index(session)
+        ranked = index.rank(terms)
+        wanted = offset + limit
+        hits: List[SearchHit] = []
+
+        # 按得分顺序分批回表：应用过滤条件、校验子串、取标题与片段
+        for start in range(0, len(ranked), CANDIDATE_BATCH_SIZE):
+            batch = ranked[start:start + CANDIDATE_BATCH_SIZE]
+            statement = apply_post_filters(
+                select(Post.id, Post.title, Post.slug, Post.excerpt, Post.content_markdown)
+                .where(Post.id.in_(batch)),
+                filters,
+            )
+            rows = {row.id: row for row in session.execute(statement)}
+            for position, doc_id in enumerate(batch):
+                row = rows.get(doc_id)
+                if row is None or not _contains_all(terms, row.title, row.excerpt, row.content_markdown):
+                    continue
+                hits.append(
+                    SearchHit(
+                        post_id=row.id,
+                        title=row.title,
+                        slug=row.slug,
+                        snippet=make_snippet(row.content_markdown, terms),
+                        score=float(len(ranked) - start - position),
+                    )
+                )
+            if len(hits) >= wanted:
+                break
+        return hits[offset:wanted]
+
+    def rebuild(self, session) -> int:
+        index = InvertedIndex()
+        self._sync(session, index)
+        with self._load_lock:
+            self._index = index
+            self._dirty = True
+        self.save()
+        return len(index)
+
+    def index_post(self, post_id: int, title: Optional[str], content: Optional[str], version=None) -> None:
+        if self._index is None:
+            # 尚未加载：首次搜索时会按 updated_at 同步
+            return
+        self._index.add(post_id, title, content, version=version)
+        self._dirty = True
+
+    def remove_post(self, post_id: int) -> None:
+        if self._index is None:
+            return
+        self._index.remove(post_id)
+        self._dirty = True
+
+    def warm_up(self, session) -> None:
+        self._get_index(session)
+
+    def save(self) -> None:
+        """索引有变化时写入快照"""
+        if not self._snapshot_path or self._index is None or not self._dirty:
+            return
+        try:
+            self._index.dump(self._snapshot_path)
+            self._dirty = False
+        except OSError:
+            logger.exception("搜索索引快照写入失败: %s", self._snapshot_path)
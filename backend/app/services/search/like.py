@@ -0,0 +1,71 @@
+"""
+LIKE 子串扫描搜索后端
+
+不依赖任何索引，适用于不支持 FTS5 的数据库；复杂度随文章总量线性增长，
+只作为最后的兜底方案。
+"""
+
+from typing import List
+
+from sqlalchemy import case, or_, select
+
+from ...models.post import Post
+from .base import (
+    SearchBackend,
+    SearchFilters,
+    SearchHit,
+    apply_post_filters,
+    make_snippet,
+    split_terms,
+)
+
+
+class LikeSearchBackend(SearchBackend):
+    """逐行 LIKE '%q%' 扫描"""
+
+    name = "like"
+
+    def search(
+        self,
+        session,
+        query: str,
+        filters: SearchFilters = SearchFilters(),
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[SearchHit]:
+        terms = split_terms(query)
+        if not terms:
+            return []
+
+        title_hits = 0
+        statement = select(Post.id, Post.title, Post.slug, Post.content_markdown)
+        for term in terms:
+            pattern = f"%{term}%"
+            statement = statement.where(
+                or_(
+                    Post.title.ilike(pattern),
+                    Post.excerpt.ilike(pattern),
+                    Post.content_markdown.ilike(pattern),
+                )
+            )
+            title_hits = title_hits + case((Post.title.ilike(pattern), 1), else_=0)
+
+        statement = apply_post_filters(statement, filters)
+        statement = statement.add_columns(title_hits.label("score"))
+        statement = statement.order_by(title_hits.desc(), Post.published_at.desc())
+        statement = statement.limit(limit).offset(offset)
+
+        return [
+            SearchHit(
+                post_id=row.id,
+                title=row.title,
+                slug=row.slug,
+                snippet=make_snippet(row.content_markdown, terms),
+                score=float(row.score),
+            )
+            for row in session.execute(statement)
+        ]
+
+    def rebuild(self, session) -> int:
+        # 无索引可重建
+        return 0
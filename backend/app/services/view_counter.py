@@ -0,0 +1,216 @@
+"""
+文章浏览量计数服务（写缓冲 / write-behind）
+
+每次文章访问只在内存中累加，按时间间隔或累计数量阈值批量写回数据库：
+    UPDATE post SET view_count = view_count + :n WHERE id = :post_id
+这样读请求不会变成 post 表上的写事务与行锁。
+
+- 计数按 post_id 分片存放，每个分片一把锁，降低线程池路由之间的争用
+- 刷写失败时把已取出的增量放回缓冲区，按指数退避（最长 FLUSH_RETRY_MAX_DELAY 秒）重试，
+  数据库不可用期间不会反复触发刷写
+- 应用关闭时执行最后一次刷写，保证正常退出不丢计数
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, select, update
+
+from ..core.config import settings
+from ..core.database import async_write_engine
+from ..models.post import Post
+
+logger = logging.getLogger(__name__)
+
+post_table = Post.__table__
+
+# 刷写失败后的最长重试间隔（秒）
+FLUSH_RETRY_MAX_DELAY = 300.0
+
+# 批量累加语句；显式写回 updated_at，避免触发 onupdate 把浏览量当作内容修改
+_increment_statement = (
+    update(post_table)
+    .where(post_table.c.id == bindparam("post_id"))
+    .values(
+        view_count=post_table.c.view_count + bindparam("increment"),
+        updated_at=post_table.c.updated_at,
+    )
+)
+
+
+class _Shard:
+    """单个计数分片"""
+
+    __slots__ = ("lock", "counts")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counts: Dict[int, int] = {}
+
+
+class ViewCounter:
+    """
+    缓冲式浏览量计数器
+
+    Args:
+        shards: 分片数量
+        flush_threshold: 待写入增量达到该值时提前触发刷写
+    """
+
+    def __init__(self, shards: int = 16, flush_threshold: int = 1000) -> None:
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._flush_threshold = flush_threshold
+        # 近似的待写入总量，仅用于判断是否触发提前刷写
+        self._pending_total = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _shard_for(self, post_id: int) -> _Shard:
+        return self._shards[post_id % len(self._shards)]
+
+    def hit(self, post_id: int, count: int = 1) -> None:
+        """记录文章访问（可在事件循环或线程池中调用）"""
+        shard = self._shard_for(post_id)
+        with shard.lock:
+            shard.counts[post_id] = shard.counts.get(post_id, 0) + count
+        self._pending_total += count
+
+        if self._pending_total >= self._flush_threshold and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def pending(self, post_id: int) -> int:
+        """获取某篇文章尚未写回数据库的增量"""
+        shard = self._shard_for(post_id)
+        with shard.lock:
+            return shard.counts.get(post_id, 0)
+
+    def pending_many(self, post_ids: List[int]) -> Dict[int, int]:
+        """批量获取尚未写回数据库的增量"""
+        return {post_id: self.pending(post_id) for post_id in post_ids}
+
+    def _drain(self) -> Dict[int, int]:
+        """取出所有分片中的增量并清空缓冲区"""
+        drained: Dict[int, int] = {}
+        for shard in self._shards:
+            with shard.lock:
+                counts, shard.counts = shard.counts, {}
+            drained.update(counts)
+        self._pending_total = 0
+        return drained
+
+    def _restore(self, drained: Dict[int, int]) -> None:
+        """
+        刷写失败时把增量放回缓冲区
+
+        直接写回分片而不经过 hit()，避免超过阈值时立即唤醒刷写任务。
+        """
+        total = 0
+        for index, shard in enumerate(self._shards):
+            with shard.lock:
+                for post_id, count in drained.items():
+                    if post_id % len(self._shards) == index:
+                        shard.counts[post_id] = shard.counts.get(post_id, 0) + count
+                total += sum(shard.counts.values())
+        self._pending_total = total
+
+    async def flush(self) -> int:
+        """
+        把缓冲的增量批量写回数据库
+
+        Returns:
+            本次写回的文章数量
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            drained = self._drain()
+            if not drained:
+                return 0
+
+            # 按主键排序，保证多进程刷写时加锁顺序一致
+            params = [
+                {"post_id": post_id, "increment": count}
+                for post_id, count in sorted(drained.items())
+            ]
+            try:
+                async with async_write_engine.begin() as connection:
+                    await connection.execute(_increment_statement, params)
+            except Exception:
+                self._restore(drained)
+                raise
+            return len(params)
+
+    async def get_live_count(self, session, post_id: int) -> Optional[int]:
+        """
+        获取实时浏览量（数据库中的值 + 尚未写回的增量）
+
+        Args:
+            session: 异步数据库会话
+            post_id: 文章ID
+
+        Returns:
+            实时浏览量，文章不存在时返回 None
+        """
+        stored = await session.scalar(
+            select(Post.view_count).where(Post.id == post_id)
+        )
+        if stored is None:
+            return None
+        return stored + self.pending(post_id)
+
+    async def _run(self, interval: float) -> None:
+        """后台刷写循环；失败后等待的时间按次数翻倍，成功后恢复"""
+        delay = interval
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("浏览量刷写失败，%.0f 秒后重试", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max(interval, FLUSH_RETRY_MAX_DELAY))
+            else:
+                delay = interval
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """在当前事件循环中启动后台刷写任务"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(
+            self._run(interval or settings.view_counter_flush_interval)
+        )
+
+    async def stop(self) -> None:
+        """停止后台任务并执行最后一次刷写"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+        try:
+            await self.flush()
+        except Exception:
+            # 不影响其它关闭步骤；未写回的增量随进程退出丢失
+            logger.exception("关闭时浏览量刷写失败")
+
+
+# 全局浏览量计数器实例
+view_counter = ViewCounter(
+    shards=settings.view_counter_shards,
+    flush_threshold=settings.view_counter_flush_threshold,
+)
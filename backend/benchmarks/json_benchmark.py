@@ -0,0 +1,179 @@
+"""
+JSON 序列化基准测试：jsonable_encoder + 标准库 json vs FastJSONResponse（orjson）
+
+用合成的真实规模文章数据（较大的 content_json 文档树、渲染后的 HTML、目录、datetime 字段）
+分别测量：
+- 当前路径：jsonable_encoder 转换后由 JSONResponse（标准库 json）序列化
+- 默认响应类：jsonable_encoder 转换后由 FastJSONResponse 序列化（路由返回 dict 时）
+- 直接返回：FastJSONResponse 直接序列化（跳过 jsonable_encoder）
+
+用法（在 backend 目录下）:
+    uv run python benchmarks/json_benchmark.py --paragraphs 200 --repeat 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ADMIN_PASSWORD", "benchmark")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.core import responses  # noqa: E402
+from app.core.responses import FastJSONResponse  # noqa: E402
+from app.services.content.outline import extract_outline  # noqa: E402
+from app.services.content.renderer import render_html  # noqa: E402
+
+WORDS = [
+    "性能", "优化", "数据库", "索引", "缓存", "异步", "并发", "前端", "后端", "架构",
+    "部署", "测试", "监控", "日志", "算法", "网络", "安全", "容器", "服务", "接口",
+    "python", "fastapi", "sqlite", "react", "docker", "redis", "nginx", "benchmark",
+]
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    """生成一段中英混排文本"""
+    return "".join(rng.choice(WORDS) + ("，" if rng.random() < 0.1 else "") for _ in range(words))
+
+
+def make_document(rng: random.Random, paragraphs: int) -> dict:
+    """生成 TipTap 文档：标题、带标记的段落、列表与代码块"""
+    content = []
+    for index in range(paragraphs):
+        if index % 10 == 0:
+            content.append({
+                "type": "heading",
+                "attrs": {"level": 2 if index % 20 == 0 else 3},
+                "content": [{"type": "text", "text": make_text(rng, 5)}],
+            })
+        if index % 15 == 7:
+            content.append({
+                "type": "codeBlock",
+                "attrs": {"language": "python"},
+                "content": [{"type": "text", "text": "def handler(request):\n    return {'ok': True}\n" * 4}],
+            })
+        elif index % 9 == 4:
+            content.append({
+                "type": "bulletList",
+                "content": [
+                    {
+                        "type": "listItem",
+                        "content": [{
+                            "type": "paragraph",
+                            "content": [{"type": "text", "text": make_text(rng, 8)}],
+                        }],
+                    }
+                    for _ in range(3)
+                ],
+            })
+        else:
+            content.append({
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": make_text(rng, 30)},
+                    {"type": "text", "text": make_text(rng, 3), "marks": [{"type": "bold"}]},
+                    {"type": "text", "text": make_text(rng, 20)},
+                ],
+            })
+    return {"type": "doc", "content": content}
+
+
+def make_summary(rng: random.Random, index: int) -> dict:
+    """列表页中的一篇文章摘要"""
+    created_at = BASE_TIME + timedelta(days=index, seconds=rng.randrange(86400))
+    return {
+        "id": index,
+        "title": make_text(rng, 6),
+        "slug": f"post-{index}",
+        "summary": make_text(rng, 40),
+        "cover_image": f"https://example.com/covers/{index}.png",
+        "view_count": rng.randrange(10000),
+        "like_count": rng.randrange(500),
+        "word_count": rng.randrange(500, 8000),
+        "reading_time": rng.randrange(2, 30),
+        "created_at": created_at,
+        "updated_at": created_at + timedelta(hours=3),
+        "published_at": created_at + timedelta(hours=1),
+        "author": {"username": "torpedo", "display_name": "Torpedo"},
+        "category": {"name": "技术", "slug": "tech"},
+        "tags": [{"name": "性能", "slug": "perf", "color": "#3b82f6"}],
+    }
+
+
+def make_payloads(paragraphs: int) -> dict:
+    """生成各类接口的典型响应"""
+    rng = random.Random(42)
+    doc = make_document(rng, paragraphs)
+    detail = {
+        **make_summary(rng, 1),
+        "content_html": render_html(doc),
+        "toc": extract_outline(doc).toc,
+    }
+    editor = {**detail, "content_json": doc}
+    page = {
+        "items": [make_summary(rng, index) for index in range(20)],
+        "limit": 20,
+        "next_cursor": "eyJwIjoiMjAyNC0wMS0yMCIsImkiOjIwfQ",
+        "prev_cursor": None,
+    }
+    return {"文章详情": detail, "编辑器(content_json)": editor, "列表页(20 篇)": page}
+
+
+def current_path(payload) -> bytes:
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def default_class_path(payload) -> bytes:
+    return FastJSONResponse(jsonable_encoder(payload)).body
+
+
+def direct_path(payload) -> bytes:
+    return FastJSONResponse(payload).body
+
+
+def measure(func, payload, repeat: int) -> float:
+    """平均耗时（毫秒）"""
+    func(payload)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(payload)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="JSON 序列化基准测试")
+    parser.add_argument("--paragraphs", type=int, default=200, help="文章段落数")
+    parser.add_argument("--repeat", type=int, default=200, help="每项的重复次数")
+    args = parser.parse_args()
+
+    backend = "orjson" if responses.orjson is not None else "json（未安装 orjson）"
+    print(f"🧪 FastJSONResponse 序列化后端: {backend}")
+
+    paths = {
+        "jsonable+json": current_path,
+        "jsonable+fast": default_class_path,
+        "fast(直接)": direct_path,
+    }
+    payloads = make_payloads(args.paragraphs)
+
+    print()
+    print(f"{'响应':<20}{'大小':>10}" + "".join(f"{name:>16}" for name in paths) + f"{'加速':>10}")
+    for label, payload in payloads.items():
+        size = len(current_path(payload))
+        timings = [measure(func, payload, args.repeat) for func in paths.values()]
+        cells = "".join(f"{elapsed:>14.3f}ms" for elapsed in timings)
+        print(f"{label:<20}{size / 1024:>8.1f}KB{cells}{timings[0] / timings[-1]:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+登录吞吐基准测试：事件循环内直接 bcrypt vs CredentialService 线程池
+
+在临时 SQLite 数据库中创建一个用户，用 N 个并发协程反复登录，分别测量：
+- 吞吐（次/秒）与单次延迟 p50 / p95
+- 事件循环延迟：并发运行一个每 10ms 唤醒一次的探针协程，记录最大唤醒延迟
+  （直接调用 bcrypt 时整个事件循环被阻塞，其他请求都要等待）
+- 线程池排队已满时被拒绝（429）的次数（被拒绝的客户端等待 50ms 后重试）
+最后通过 HTTP 接口（POST /api/auth/login）做一次端到端测量。
+
+成本因子取 BCRYPT_ROUNDS（默认 12），线程数与排队上限取 CREDENTIAL_WORKERS / CREDENTIAL_MAX_PENDING。
+
+用法（在 backend 目录下）:
+    uv run python benchmarks/login_benchmark.py --concurrency 16 --requests 64
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_workdir = tempfile.mkdtemp(prefix="login-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ADMIN_PASSWORD", "benchmark")
+# 基准测试只关心哈希开销，关闭登录失败限制
+os.environ["LOGIN_MAX_FAILURES"] = "1000000"
+
+import httpx  # noqa: E402
+
+from app.core import security  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal, create_tables  # noqa: E402
+from app.models import BackendUser  # noqa: E402
+from app.services.credentials import CredentialsBusy, CredentialService  # noqa: E402
+
+USERNAME = "bench"
+PASSWORD = "benchmark-password"
+
+
+def seed() -> str:
+    """创建基准测试用户，返回其密码哈希"""
+    create_tables()
+    password_hash = security.hash_password(PASSWORD)
+    with SessionLocal() as db:
+        db.add(BackendUser(
+            username=USERNAME, email="bench@example.com", password_hash=password_hash, display_name="Bench"
+        ))
+        db.commit()
+    return password_hash
+
+
+async def probe_loop_lag(stop: asyncio.Event) -> float:
+    """事件循环最大唤醒延迟（毫秒）"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - start - 0.01)
+    return worst * 1000
+
+
+async def run_load(verify, concurrency: int, requests: int) -> dict:
+    """并发完成 requests 次登录"""
+    latencies = []
+    outcomes = Counter()
+    queue = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in queue:
+            start = time.perf_counter()
+            # 被拒绝（429）的登录重试到完成为止，延迟包含重试等待
+            while True:
+                outcome = await verify()
+                outcomes[outcome] += 1
+                if outcome != "429":
+                    break
+            latencies.append(time.perf_counter() - start)
+
+    stop = asyncio.Event()
+    probe = asyncio.ensure_future(probe_loop_lag(stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    latencies.sort()
+    return {
+        "throughput": outcomes["ok"] / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "loop_lag": await probe,
+        "outcomes": outcomes,
+    }
+
+
+async def bench_inline(password_hash: str, concurrency: int, requests: int) -> dict:
+    """旧路径：在协程中直接调用 bcrypt（阻塞事件循环）"""
+    async def verify() -> str:
+        return "ok" if security.verify_password(PASSWORD, password_hash) else "fail"
+    return await run_load(verify, concurrency, requests)
+
+
+async def bench_pooled(password_hash: str, concurrency: int, requests: int) -> dict:
+    """新路径：CredentialService 有界线程池"""
+    service = CredentialService(settings.credential_workers, settings.credential_max_pending)
+
+    async def verify() -> str:
+        try:
+            return "ok" if await service.verify_password(PASSWORD, password_hash) else "fail"
+        except CredentialsBusy:
+            # 客户端收到 429 后稍后重试
+            await asyncio.sleep(0.05)
+            return "429"
+
+    try:
+        return await run_load(verify, concurrency, requests)
+    finally:
+        service.shutdown()
+
+
+async def bench_http(concurrency: int, requests: int) -> dict:
+    """端到端：POST /api/auth/login"""
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def verify() -> str:
+                response = await client.post(
+                    "/api/auth/login", json={"username": USERNAME, "password": PASSWORD}
+                )
+                if response.status_code == 429:
+                    await asyncio.sleep(0.05)
+                return "ok" if response.status_code == 200 else str(response.status_code)
+            return await run_load(verify, concurrency, requests)
+
+
+def report(name: str, result: dict) -> None:
+    outcomes = ", ".join(f"{key}={value}" for key, value in sorted(result["outcomes"].items()))
+    print(f"{name:<14}{result['throughput']:>10.1f}/s{result['p50']:>10.1f}ms{result['p95']:>10.1f}ms"
+          f"{result['loop_lag']:>12.1f}ms   {outcomes}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="登录吞吐基准测试")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发登录的客户端数")
+    parser.add_argument("--requests", type=int, default=64, help="每种方式的总登录次数")
+    args = parser.parse_args()
+
+    print(f"🔐 bcrypt rounds={settings.bcrypt_rounds}, 线程数={settings.credential_workers}, "
+          f"排队上限={settings.credential_max_pending}, CPU={os.cpu_count()}")
+    password_hash = seed()
+
+    print()
+    print(f"{'方式':<14}{'吞吐':>12}{'p50':>12}{'p95':>12}{'循环最大延迟':>12}   结果")
+    report("inline", asyncio.run(bench_inline(password_hash, args.concurrency, args.requests)))
+    report("pooled", asyncio.run(bench_pooled(password_hash, args.concurrency, args.requests)))
+    report("http", asyncio.run(bench_http(args.concurrency, args.requests)))
+    print("\n（429 为线程池已满被拒绝的次数，被拒绝的客户端等待 50ms 后重试）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+搜索后端基准测试：进程内倒排索引 vs LIKE '%q%' 扫描（可用时附带 FTS5）
+
+在临时 SQLite 数据库中生成合成文章（中英文混排），分别测量：
+- 倒排索引全量构建、快照写入与加载耗时
+- 每个查询的平均延迟
+
+用法（在 backend 目录下）:
+    uv run python benchmarks/search_benchmark.py --posts 10000 --repeat 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_workdir = tempfile.mkdtemp(prefix="search-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ADMIN_PASSWORD", "benchmark")
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.database import SessionLocal, create_tables  # noqa: E402
+from app.models import BackendUser, Post  # noqa: E402
+from app.services.search import (  # noqa: E402
+    Fts5SearchBackend,
+    InvertedIndexBackend,
+    LikeSearchBackend,
+)
+from app.services.search.fts5 import fts5_available  # noqa: E402
+
+CHINESE_WORDS = [
+    "性能", "优化", "数据库", "索引", "缓存", "并发", "异步", "前端", "后端", "架构",
+    "部署", "测试", "监控", "日志", "算法", "网络", "安全", "容器", "服务", "接口",
+    "查询", "事务", "分页", "渲染", "组件", "编译", "内存", "线程", "进程", "配置",
+]
+ENGLISH_WORDS = [
+    "python", "fastapi", "sqlite", "react", "vue", "docker", "redis", "nginx",
+    "linux", "rust", "golang", "typescript", "kubernetes", "postgres", "benchmark",
+]
+QUERIES = ["性能优化", "数据库 索引", "异步并发", "fastapi", "rust 内存", "不存在的词语"]
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    """生成一段中英混排文本"""
+    parts = []
+    for _ in range(words):
+        if rng.random() < 0.8:
+            parts.append(rng.choice(CHINESE_WORDS))
+        else:
+            parts.append(f" {rng.choice(ENGLISH_WORDS)} ")
+        if rng.random() < 0.1:
+            parts.append("。\n")
+    return "".join(parts)
+
+
+def seed(posts: int, words: int) -> None:
+    """批量写入合成文章"""
+    rng = random.Random(42)
+    create_tables()
+    with SessionLocal() as db:
+        author = BackendUser(
+            username="bench", email="bench@example.com", password_hash="x", display_name="Bench"
+        )
+        db.add(author)
+        db.flush()
+        rows = [
+            {
+                "title": make_text(rng, 6),
+                "slug": f"post-{index}",
+                "content_markdown": make_text(rng, words),
+                "is_published": True,
+                "author_id": author.id,
+            }
+            for index in range(posts)
+        ]
+        for start in range(0, len(rows), 1000):
+            db.execute(insert(Post), rows[start:start + 1000])
+        db.commit()
+
+
+def measure(backend, queries, repeat: int) -> dict:
+    """每个查询的平均耗时（毫秒）与命中数"""
+    results = {}
+    with SessionLocal() as db:
+        for query in queries:
+            hits = backend.search(db, query, limit=20)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                backend.search(db, query, limit=20)
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            results[query] = (elapsed, len(hits))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="搜索后端基准测试")
+    parser.add_argument("--posts", type=int, default=10000, help="合成文章数量")
+    parser.add_argument("--words", type=int, default=300, help="每篇文章的词数")
+    parser.add_argument("--repeat", type=int, default=20, help="每个查询的重复次数")
+    args = parser.parse_args()
+
+    print(f"📝 生成 {args.posts} 篇合成文章（每篇约 {args.words} 词）...")
+    start = time.perf_counter()
+    seed(args.posts, args.words)
+    print(f"   耗时 {time.perf_counter() - start:.2f}s")
+
+    snapshot_path = os.path.join(_workdir, "search_index.bin")
+    inverted = InvertedIndexBackend(snapshot_path)
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        count = inverted.rebuild(db)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reloaded = InvertedIndexBackend(snapshot_path)
+        reloaded._get_index(db)
+        load_seconds = time.perf_counter() - start
+
+    print(f"🔍 倒排索引: {count} 篇, 构建+快照 {build_seconds:.2f}s, "
+          f"快照 {os.path.getsize(snapshot_path) / 1024 / 1024:.1f} MiB, 启动加载 {load_seconds:.2f}s")
+
+    backends = {"inverted": inverted, "like": LikeSearchBackend()}
+    with SessionLocal() as db:
+        if fts5_available(db.connection()):
+            backends["fts5"] = Fts5SearchBackend()
+
+    measured = {name: measure(backend, QUERIES, args.repeat) for name, backend in backends.items()}
+
+    header = f"{'查询':<14}" + "".join(f"{name:>18}" for name in backends)
+    print()
+    print(header)
+    for query in QUERIES:
+        cells = "".join(
+            f"{measured[name][query][0]:>10.2f}ms ({measured[name][query][1]:>2})"
+            for name in backends
+        )
+        print(f"{query:<14}{cells}")
+    print("\n（括号内为命中数，limit=20）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
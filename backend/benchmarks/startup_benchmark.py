@@ -0,0 +1,123 @@
+"""
+启动耗时基准测试：冷启动导入与 lifespan 启动
+
+在独立子进程中多次执行（不受本进程已导入模块的影响），分别测量：
+- import app.main 的耗时，以及 python -X importtime 统计的各顶层包自身耗时
+- lifespan 启动阶段（建表检查、连接池与搜索索引预热）的耗时
+- 应当延迟导入的模块（jose、uvicorn）是否在导入应用时被加载
+
+用法（在 backend 目录下）:
+    uv run python benchmarks/startup_benchmark.py --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 导入应用后不应出现在 sys.modules 中的模块
+LAZY_MODULES = ["jose", "uvicorn"]
+
+_IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import app.main
+print(f"import {time.perf_counter() - start}")
+print("loaded " + ",".join(name for name in sys.argv[1:] if name in sys.modules))
+"""
+
+_LIFESPAN_SCRIPT = """
+import asyncio, time
+import app.main
+
+async def run():
+    start = time.perf_counter()
+    async with app.main.app.router.lifespan_context(app.main.app):
+        print(f"startup {time.perf_counter() - start}")
+
+asyncio.run(run())
+"""
+
+
+def run_child(args, env) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def parse_values(output: str, key: str) -> str:
+    for line in output.splitlines():
+        if line.startswith(key + " "):
+            return line[len(key) + 1:]
+    return ""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """按顶层包汇总 -X importtime 的自身耗时（微秒）"""
+    totals = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us)
+    return totals
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="启动耗时基准测试")
+    parser.add_argument("--runs", type=int, default=5, help="每项测量的子进程次数")
+    parser.add_argument("--top", type=int, default=12, help="显示自身导入耗时最高的包数量")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "SEARCH_SNAPSHOT_PATH": os.path.join(workdir, "search_index.bin"),
+    }
+    env.setdefault("SECRET_KEY", "benchmark")
+    env.setdefault("ADMIN_PASSWORD", "benchmark")
+
+    # 预热：生成字节码缓存并建表，之后的测量不包含首次编译
+    run_child(["-c", _LIFESPAN_SCRIPT], env)
+
+    import_times = []
+    loaded = ""
+    for _ in range(args.runs):
+        output = run_child(["-c", _IMPORT_SCRIPT, *LAZY_MODULES], env).stdout
+        import_times.append(float(parse_values(output, "import")))
+        loaded = parse_values(output, "loaded")
+
+    startup_times = [
+        float(parse_values(run_child(["-c", _LIFESPAN_SCRIPT], env).stdout, "startup"))
+        for _ in range(args.runs)
+    ]
+
+    totals = parse_importtime(run_child(["-X", "importtime", "-c", "import app.main"], env).stderr)
+
+    print(f"⏱️  import app.main: 中位数 {statistics.median(import_times) * 1000:.1f}ms "
+          f"（{args.runs} 次，最小 {min(import_times) * 1000:.1f}ms）")
+    print(f"⏱️  lifespan 启动:   中位数 {statistics.median(startup_times) * 1000:.1f}ms "
+          f"（最小 {min(startup_times) * 1000:.1f}ms）")
+    print(f"💤 延迟导入检查: {'❌ 已加载 ' + loaded if loaded else '✅ ' + ', '.join(LAZY_MODULES) + ' 均未加载'}")
+
+    print()
+    print(f"{'包':<24}{'自身导入耗时':>12}")
+    for name, micros in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<24}{micros / 1000:>10.1f}ms")
+    print(f"{'合计':<24}{sum(totals.values()) / 1000:>10.1f}ms")
+    return 1 if loaded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@
 提供常用的开发命令快捷方式
 """
 
+import shlex
 import subprocess
 import sys
 import argparse
@@ -105,6 +106,58 @@ def check():
     print("🎉 所有检查完成！")
 
 
+def rebuild_category_tree():
+    """重建分类层级索引"""
+    run_command("uv run python -m app.cli rebuild-category-tree", "重建分类层级索引")
+
+
+def reconcile_counters():
+    """重新计算反范式计数"""
+    run_command("uv run python -m app.cli reconcile-counters", "重新计算标签与作者计数")
+
+
+def rebuild_search_index():
+    """重建文章搜索索引"""
+    run_command("uv run python -m app.cli rebuild-search-index", "重建文章搜索索引")
+
+
+def render_posts():
+    """重新渲染文章 HTML"""
+    run_command("uv run python -m app.cli render-posts", "重新生成文章 HTML 与目录")
+
+
+def db_upgrade():
+    """执行数据库迁移"""
+    run_command("uv run alembic upgrade head", "执行数据库迁移")
+
+
+def check_query_plans():
+    """检查常用查询的执行计划"""
+    run_command("uv run python -m app.cli check-query-plans", "检查常用查询是否走索引")
+
+
+def import_posts():
+    """批量导入 Markdown 文章"""
+    if len(sys.argv) < 3:
+        print("❌ 请指定 Markdown 文件目录")
+        print("用法: python scripts/dev.py import-posts <directory> [--author NAME] [--workers N]")
+        return
+
+    options = " ".join(shlex.quote(arg) for arg in sys.argv[2:])
+    run_command(f"uv run python -m app.cli import-posts {options}", "批量导入 Markdown 文章")
+
+
+def export_posts():
+    """导出全部文章为归档"""
+    if len(sys.argv) < 3:
+        print("❌ 请指定输出文件")
+        print("用法: python scripts/dev.py export-posts <output> [--format markdown|jsonl] [--archive zip|tar.gz]")
+        return
+
+    options = " ".join(shlex.quote(arg) for arg in sys.argv[2:])
+    run_command(f"uv run python -m app.cli export-posts {options}", "导出全部文章")
+
+
 def add_dep():
     """添加依赖"""
     if len(sys.argv) < 3:
@@ -123,7 +176,10 @@ def main():
     parser = argparse.ArgumentParser(description="Torpedo Blog 后端开发工具")
     parser.add_argument("command", choices=[
         "setup", "install", "format", "lint", "test", "test-env", 
-        "serve", "clean", "check", "add"
+        "serve", "clean", "check", "add", "rebuild-category-tree",
+        "reconcile-counters", "rebuild-search-index", "render-posts",
+        "db-upgrade", "check-query-plans", "import-posts",
+        "export-posts"
     ], help="要执行的命令")
     
     if len(sys.argv) < 2:
@@ -143,6 +199,14 @@ def main():
         "clean": clean,
         "check": check,
         "add": add_dep,
+        "rebuild-category-tree": rebuild_category_tree,
+        "reconcile-counters": reconcile_counters,
+        "rebuild-search-index": rebuild_search_index,
+        "render-posts": render_posts,
+        "db-upgrade": db_upgrade,
+        "check-query-plans": check_query_plans,
+        "import-posts": import_posts,
+        "export-posts": export_posts,
     }
     
     if command in commands:
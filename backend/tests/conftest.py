@@ -0,0 +1,29 @@
+"""
+测试公共配置
+
+应用在导入时按环境变量创建数据库引擎，因此在导入 app 之前指向临时 SQLite 数据库。
+"""
+import os
+import tempfile
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="torpedo-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ADMIN_PASSWORD", "test-password")
+os.environ.setdefault("SEARCH_BACKEND", "like")
+
+from app.core.database import SessionLocal, create_tables, drop_tables  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """每个测试使用一套新建的数据表"""
+    create_tables()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        drop_tables()
@@ -0,0 +1,19 @@
+"""
+响应缓存标签失效
+"""
+from app.models import BackendUser, Post
+from app.services import cache_invalidation
+
+
+def test_changing_author_invalidates_both_authors(db, monkeypatch):
+    old = BackendUser(username="old", email="old@example.com", password_hash="x", display_name="Old")
+    new = BackendUser(username="new", email="new@example.com", password_hash="x", display_name="New")
+    post = Post(title="Post", slug="post", author=old, content_json={}, is_published=True)
+    db.add_all([post, new])
+    db.commit()
+
+    invalidated = set()
+    monkeypatch.setattr(cache_invalidation, "invalidate_cache_tags", invalidated.update)
+    post.author = new
+    db.commit()
+    assert {f"author:{old.id}", f"author:{new.id}", f"post:{post.id}"} <= invalidated
@@ -0,0 +1,67 @@
+"""
+分类闭包表维护（插入、移动、删除）
+"""
+import pytest
+from sqlalchemy import select
+
+from app.models import Category
+from app.models.category import category_closure
+
+
+def _closure_rows(db):
+    return {tuple(row) for row in db.execute(select(category_closure))}
+
+
+def _assert_matches_rebuild(db):
+    maintained = _closure_rows(db)
+    Category.rebuild_closure(db)
+    assert _closure_rows(db) == maintained
+
+
+def _category(slug, parent=None):
+    return Category(name=slug, slug=slug, parent=parent)
+
+
+def test_insert_move_and_delete_keep_closure_consistent(db):
+    root = _category("root")
+    branch = _category("branch", root)
+    leaf = _category("leaf", branch)
+    other = _category("other", root)
+    db.add_all([root, branch, leaf, other])
+    db.commit()
+    _assert_matches_rebuild(db)
+    assert (root.id, leaf.id, 2) in _closure_rows(db)
+
+    # 整棵子树移动到 other 下
+    branch.parent = other
+    db.commit()
+    _assert_matches_rebuild(db)
+    assert (other.id, leaf.id, 2) in _closure_rows(db)
+    assert (root.id, leaf.id, 3) in _closure_rows(db)
+
+    # 子树移为根
+    branch.parent = None
+    db.commit()
+    _assert_matches_rebuild(db)
+    assert not any(row[0] == root.id and row[1] == leaf.id for row in _closure_rows(db))
+
+    db.delete(leaf)
+    db.delete(branch)
+    db.commit()
+    _assert_matches_rebuild(db)
+    assert not any({branch.id, leaf.id} & {row[0], row[1]} for row in _closure_rows(db))
+
+
+def test_move_under_own_descendant_is_rejected(db):
+    root = _category("root")
+    child = _category("child", root)
+    grandchild = _category("grandchild", child)
+    db.add_all([root, child, grandchild])
+    db.commit()
+
+    root.parent = grandchild
+    with pytest.raises(ValueError):
+        db.commit()
+    db.rollback()
+    _assert_matches_rebuild(db)
+    assert root.parent_id is None
@@ -0,0 +1,44 @@
+"""
+Markdown 正文的派生内容（没有 content_json 的文章）
+"""
+from app.models import BackendUser, Post
+from app.services.content import markdown_hash, render_markdown, render_stale_posts
+
+SOURCE = """# Title
+
+Text with a [link](https://example.com) and [bad](javascript:alert(1)).
+
+<script>alert(1)</script><span onclick="x">raw</span>
+
+```python
+print("<hi>")
+```
+"""
+
+
+def test_render_markdown_sanitizes_and_outlines():
+    rendered = render_markdown(SOURCE)
+    assert '<h1 id="title">Title</h1>' in rendered.html
+    assert '<a href="https://example.com" rel="noopener noreferrer nofollow">link</a>' in rendered.html
+    assert "javascript" not in rendered.html
+    assert "script" not in rendered.html and "onclick" not in rendered.html
+    assert '<code class="language-python">print("&lt;hi&gt;")' in rendered.html
+    assert rendered.outline.toc == [{"level": 1, "text": "Title", "anchor": "title"}]
+    assert rendered.outline.stats["characters"] > 0
+    assert rendered.outline.stats["code_blocks"] == 1
+    assert rendered.outline.stats["links"] == 1
+
+
+def test_markdown_post_is_rendered_on_publish(db):
+    author = BackendUser(username="author", email="author@example.com", password_hash="x", display_name="Author")
+    post = Post(title="Imported", slug="imported", author=author, content_markdown=SOURCE)
+    db.add(post)
+    db.commit()
+    assert post.derived.content_hash == markdown_hash(SOURCE)
+    assert post.derived.content_html is None
+    assert post.derived.toc[0]["anchor"] == "title"
+
+    post.is_published = True
+    db.commit()
+    assert post.derived.content_html == render_markdown(SOURCE).html
+    assert render_stale_posts(db) == 0
@@ -0,0 +1,43 @@
+"""
+反范式计数维护（Tag.usage_count / BackendUser.post_count）
+"""
+from app.models import BackendUser, Post, Tag
+
+
+def _make_draft(db):
+    author = BackendUser(username="author", email="author@example.com", password_hash="x", display_name="Author")
+    tag = Tag(name="Python", slug="python")
+    post = Post(title="Draft", slug="draft", author=author, tags=[tag], content_json={})
+    db.add(post)
+    db.commit()
+    return author, tag, post
+
+
+def test_publish_after_commit_counts_post(db):
+    """提交后（属性已过期）再发布草稿，计数加一；撤回后回到零"""
+    author, tag, post = _make_draft(db)
+
+    post.is_published = True
+    db.commit()
+    assert tag.usage_count == 1
+    assert author.post_count == 1
+
+    post.is_published = False
+    db.commit()
+    assert tag.usage_count == 0
+    assert author.post_count == 0
+
+
+def test_change_author_after_commit_moves_count(db):
+    """提交后直接修改 author_id，计数从旧作者转到新作者"""
+    author, tag, post = _make_draft(db)
+    post.is_published = True
+    other = BackendUser(username="other", email="other@example.com", password_hash="x", display_name="Other")
+    db.add(other)
+    db.commit()
+
+    post.author_id = other.id
+    db.commit()
+    assert author.post_count == 0
+    assert other.post_count == 1
+    assert tag.usage_count == 1
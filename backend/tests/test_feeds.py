@@ -0,0 +1,33 @@
+"""
+订阅源文档缓存
+"""
+import threading
+import time
+
+from app.services.feeds import FeedCache, FeedDocument
+
+
+def _document(body: bytes) -> FeedDocument:
+    return FeedDocument(body=body, media_type="application/xml", etag='"x"', last_modified=None, built_at=time.monotonic())
+
+
+def test_slow_build_does_not_block_other_keys(db):
+    cache = FeedCache()
+    started, release = threading.Event(), threading.Event()
+
+    def slow_build(session):
+        started.set()
+        release.wait(5)
+        return _document(b"slow")
+
+    worker = threading.Thread(target=cache.get, args=("slow", slow_build))
+    worker.start()
+    assert started.wait(5)
+    try:
+        assert cache.get("fast", lambda session: _document(b"fast")).body == b"fast"
+        assert cache.peek("slow") is None
+    finally:
+        release.set()
+        worker.join(5)
+    assert cache.peek("slow").body == b"slow"
+    assert not cache._build_locks
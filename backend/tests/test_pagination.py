@@ -0,0 +1,58 @@
+"""
+游标（keyset）分页
+"""
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.core.pagination import InvalidCursor, paginate_keyset
+from app.models import BackendUser, Post
+from app.services.post_queries import paginate_post_summaries, published_posts_query
+
+
+def _cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).rstrip(b"=").decode()
+
+
+@pytest.mark.parametrize("values", [
+    ["abc", 1],
+    [{"dt": "2024-01-01"}, {"a": 1}],
+    [{"dt": "2024-01-01T00:00:00"}, True],
+    [{"dt": "2024-01-01T00:00:00"}, None],
+])
+def test_cursor_values_must_match_key_types(db, values):
+    with pytest.raises(InvalidCursor):
+        paginate_keyset(
+            db, select(Post), (Post.published_at, Post.id),
+            key_of=lambda post: (post.published_at, post.id), after=_cursor(values),
+        )
+
+
+def test_forward_then_backward_pages_match(db):
+    author = BackendUser(username="author", email="author@example.com", password_hash="x", display_name="Author")
+    # 每两篇共享同一个发布时间，检验 published_at 相同时按 id 区分
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    db.add_all([
+        Post(
+            title=f"Post {number}", slug=f"post-{number}", author=author, content_json={},
+            is_published=True, published_at=base + timedelta(days=number // 2),
+        )
+        for number in range(7)
+    ])
+    db.commit()
+    statement = published_posts_query()
+
+    forward = [paginate_post_summaries(db, statement, limit=3)]
+    while forward[-1].next_cursor:
+        forward.append(paginate_post_summaries(db, statement, limit=3, after=forward[-1].next_cursor))
+    slugs = [[item.slug for item in page.items] for page in forward]
+    assert [slug for page in slugs for slug in page] == [f"post-{number}" for number in reversed(range(7))]
+    assert forward[0].prev_cursor is None
+
+    backward = [forward[-1]]
+    while backward[-1].prev_cursor:
+        backward.append(paginate_post_summaries(db, statement, limit=3, before=backward[-1].prev_cursor))
+    assert [[item.slug for item in page.items] for page in reversed(backward)] == slugs
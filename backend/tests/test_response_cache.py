@@ -0,0 +1,22 @@
+"""
+响应缓存的失效代数
+"""
+import time
+
+from app.core.response_cache import CachedResponse, MemoryResponseCache
+
+
+def _entry(*tags):
+    now = time.time()
+    return CachedResponse(200, (), b"body", frozenset(tags), now, now + 60, now + 120)
+
+
+def test_set_is_dropped_after_invalidation_during_render():
+    cache = MemoryResponseCache()
+    generation = cache.generation
+    cache.invalidate_tags(["post:1"])
+    cache.set("/api/posts/a", _entry("post:1"), generation)
+    assert cache.get("/api/posts/a") is None
+
+    cache.set("/api/posts/a", _entry("post:1"), cache.generation)
+    assert cache.get("/api/posts/a") is not None
@@ -0,0 +1,41 @@
+"""
+浏览量写缓冲
+"""
+import asyncio
+
+import pytest
+
+from app.services import view_counter as view_counter_module
+from app.services.view_counter import ViewCounter
+
+
+class _FailingEngine:
+    def begin(self):
+        raise ConnectionError("database unavailable")
+
+
+def test_failed_flush_restores_every_count(monkeypatch):
+    monkeypatch.setattr(view_counter_module, "async_write_engine", _FailingEngine())
+
+    async def scenario():
+        counter = ViewCounter(shards=4, flush_threshold=5)
+        counter.start(interval=60)
+        hits = {1: 3, 2: 1, 5: 4, 6: 2}
+        # 直接写入分片：经过 hit() 超过阈值时会先唤醒刷写任务
+        for post_id, count in hits.items():
+            counter._shard_for(post_id).counts[post_id] = count
+        counter._pending_total = sum(hits.values())
+
+        with pytest.raises(ConnectionError):
+            await counter.flush()
+        restored = counter.pending_many(list(hits))
+        total = counter._pending_total
+        woken = counter._wakeup.is_set()
+        counter._task.cancel()
+        return hits, restored, total, woken
+
+    hits, restored, total, woken = asyncio.run(scenario())
+    assert restored == hits
+    assert total == sum(hits.values())
+    # 放回的增量不会立即再次唤醒刷写任务
+    assert not woken